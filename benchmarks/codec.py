@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compares how fast the JSON codecs of ``kong.codec`` decode list responses shaped like the ones returned by the Kong
+admin API.
+
+Usage:
+
+    python benchmarks/codec.py [--size 1000] [--repeat 5]
+"""
+from __future__ import unicode_literals, print_function
+import argparse
+import json
+import random
+import sys
+import timeit
+import uuid
+
+from kong.codec import CODECS, get_codec
+
+CREATED_AT = 1461276890000
+
+
+def make_consumer(i):
+    return {
+        'id': str(uuid.uuid4()),
+        'username': 'consumer-%d' % i,
+        'custom_id': str(uuid.uuid4()),
+        'created_at': CREATED_AT + i,
+    }
+
+
+def make_api(i):
+    return {
+        'id': str(uuid.uuid4()),
+        'name': 'api-%d' % i,
+        'request_host': 'api-%d.example.com' % i,
+        'request_path': '/v1/api-%d' % i,
+        'strip_request_path': bool(i % 2),
+        'preserve_host': False,
+        'upstream_url': 'https://upstream-%d.example.com/' % i,
+        'created_at': CREATED_AT + i,
+    }
+
+
+def make_plugin(i):
+    return {
+        'id': str(uuid.uuid4()),
+        'api_id': str(uuid.uuid4()),
+        'consumer_id': str(uuid.uuid4()),
+        'name': 'rate-limiting',
+        'config': {
+            'second': random.randint(1, 100),
+            'minute': random.randint(100, 1000),
+            'hour': random.randint(1000, 10000),
+            'day': None,
+            'async': False,
+            'continue_on_error': True,
+        },
+        'enabled': True,
+        'created_at': CREATED_AT + i,
+    }
+
+
+def make_page(factory, size):
+    return {
+        'data': [factory(i) for i in range(size)],
+        'total': size * 10,
+        'next': 'http://localhost:8001/consumers/?size=%d&offset=%s' % (size, uuid.uuid4().hex),
+    }
+
+
+def available_codecs():
+    codecs = []
+    for name in sorted(CODECS):
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            print('Skipping %s (not installed)' % name, file=sys.stderr)
+    return codecs
+
+
+def measure(func, repeat):
+    """
+    :return: The best time of a single call, in milliseconds
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange() if hasattr(timer, 'autorange') else (10, None)
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=1000, help='Amount of entities per page')
+    parser.add_argument('--repeat', type=int, default=5, help='Amount of measurements (the best one is reported)')
+    args = parser.parse_args(argv)
+
+    random.seed(0)
+    pages = [
+        ('consumers', make_page(make_consumer, args.size)),
+        ('apis', make_page(make_api, args.size)),
+        ('plugins', make_page(make_plugin, args.size)),
+    ]
+    codecs = available_codecs()
+    baseline = get_codec('json')
+
+    print('%-10s %-8s %10s %12s %10s' % ('payload', 'codec', 'bytes', 'decode (ms)', 'decode x'))
+
+    for payload_name, page in pages:
+        content = json.dumps(page).encode('utf-8')
+        results = []
+        for codec in codecs:
+            assert codec.loads(content) == page, '%s does not round-trip' % codec.name
+            results.append((codec, measure(lambda: codec.loads(content), args.repeat)))
+
+        baseline_decode = [decode for codec, decode in results if codec.name == baseline.name][0]
+        for codec, decode in results:
+            print('%-10s %-8s %10d %12.3f %10.2f' % (
+                payload_name, codec.name, len(content), decode, baseline_decode / decode))
+
+
+if __name__ == '__main__':
+    main()
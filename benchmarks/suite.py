@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmarks the simulator and the client against it, and compares the results with a locally recorded baseline.
+
+Micro-benchmarks time single operations (URL building, filtering, and the operations of ``SimulatorDataStore``). Macro
+scenarios time a complete workload: seeding consumers, scanning them through ``KongAdminClient``, and provisioning
+key-auth credentials. The client runs against a ``SimulatorHTTPAdapter``, so no network is involved.
+
+A benchmark regresses when it takes more than ``1 + threshold`` times its baseline; the script exits with status 1 if
+any benchmark regressed. Baselines depend on the machine, so none is committed: the comparison only runs once a baseline
+has been recorded with ``--save-baseline`` (or passed with ``--baseline``), on the machine that runs the comparison.
+
+Usage:
+
+    python benchmarks/suite.py [--scale 1.0] [--repeat 3] [--output results.json]
+    python benchmarks/suite.py --save-baseline
+    python benchmarks/suite.py --threshold 0.1 --threshold-for scan_consumers=0.5
+"""
+from __future__ import unicode_literals, print_function
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+import uuid
+
+from kong.bench import compare_results, parse_thresholds, REGRESSION
+from kong.client import KongAdminClient
+from kong.server import SimulatorHTTPAdapter
+from kong.simulator import KongAdminSimulator, SimulatorDataStore, filter_api_struct, filter_dict_list
+from kong.utils import add_url_params, timestamp
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+
+# Amount of entities of the micro-benchmarks of the data store
+STORE_SIZE = 1000
+
+# Amount of entities of the macro scenarios, at scale 1
+SCAN_CONSUMERS = 100000
+PROVISION_CREDENTIALS = 10000
+
+ADAPTER_URL = 'http://kong-simulator:8001/'
+
+CONSUMER_FILTER = {'custom_id': None, 'username': None}
+
+BENCHMARKS = []
+
+
+def benchmark(func):
+    BENCHMARKS.append(func)
+    return func
+
+
+def measure(func, repeat):
+    """
+    :return: The best time of a single call, in seconds
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange() if hasattr(timer, 'autorange') else (10, None)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def measure_once(setup, func, repeat):
+    """
+    Times ``func`` on fresh state from ``setup`` every time, for operations that change the state.
+
+    :return: The best time of a single call, in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        state = setup()
+        started_at = timeit.default_timer()
+        func(state)
+        elapsed = timeit.default_timer() - started_at
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def make_consumer(i):
+    return {'username': 'consumer-%d' % i, 'custom_id': 'custom-%d' % i, 'created_at': timestamp()}
+
+
+def make_store(size):
+    store = SimulatorDataStore('http://localhost:8001/consumers/', data_struct_filter=CONSUMER_FILTER,
+                               index_keys=('username', 'custom_id'))
+    for i in range(size):
+        store.create(make_consumer(i), check_conflict_keys=('username', 'custom_id'))
+    return store
+
+
+def result(seconds, unit, size=None):
+    return {'seconds': seconds, 'unit': unit, 'size': size}
+
+
+@benchmark
+def add_url_params_plain(options):
+    return result(measure(lambda: add_url_params('http://localhost:8001/consumers/', {'size': 100}),
+                          options.repeat), 'op')
+
+
+@benchmark
+def add_url_params_query(options):
+    url = 'http://localhost:8001/consumers/?size=100&offset=%s' % uuid.uuid4()
+    return result(measure(lambda: add_url_params(url, {'size': 100, 'username': 'john'}), options.repeat), 'op')
+
+
+@benchmark
+def filter_api_struct_api(options):
+    api = {
+        'id': str(uuid.uuid4()), 'name': 'api', 'request_host': 'api.example.com', 'request_path': None,
+        'strip_request_path': False, 'preserve_host': False, 'upstream_url': 'http://upstream.example.com/',
+        'created_at': timestamp(),
+    }
+    return result(measure(lambda: filter_api_struct(api, {'request_host': None, 'request_path': None}),
+                          options.repeat), 'op')
+
+
+@benchmark
+def filter_dict_list_consumers(options):
+    consumers = [dict(make_consumer(i), id=str(uuid.uuid4())) for i in range(STORE_SIZE)]
+    return result(measure(lambda: filter_dict_list(consumers, username='consumer-500'), options.repeat), 'op',
+                  STORE_SIZE)
+
+
+@benchmark
+def store_create(options):
+    def create(store):
+        for i in range(STORE_SIZE):
+            store.create(make_consumer(i), check_conflict_keys=('username', 'custom_id'))
+    return result(measure_once(lambda: make_store(0), create, options.repeat) / STORE_SIZE, 'op', STORE_SIZE)
+
+
+@benchmark
+def store_retrieve_by_id(options):
+    store = make_store(STORE_SIZE)
+    ids = itertools.cycle(store.list(STORE_SIZE, None)['data'][i]['id'] for i in range(0, STORE_SIZE, 7))
+    return result(measure(lambda: store.retrieve(next(ids), 'username'), options.repeat), 'op', STORE_SIZE)
+
+
+@benchmark
+def store_retrieve_by_username(options):
+    store = make_store(STORE_SIZE)
+    usernames = itertools.cycle('consumer-%d' % i for i in range(0, STORE_SIZE, 7))
+    return result(measure(lambda: store.retrieve(next(usernames), 'username'), options.repeat), 'op', STORE_SIZE)
+
+
+@benchmark
+def store_update_by_username(options):
+    store = make_store(STORE_SIZE)
+    usernames = itertools.cycle('consumer-%d' % i for i in range(0, STORE_SIZE, 7))
+    return result(measure(lambda: store.update(next(usernames), 'username', {'created_at': 0}), options.repeat),
+                  'op', STORE_SIZE)
+
+
+@benchmark
+def store_list_page(options):
+    store = make_store(STORE_SIZE)
+    offset = store.list(STORE_SIZE, None)['data'][STORE_SIZE // 2]['id']
+    return result(measure(lambda: store.list(100, offset), options.repeat), 'op', STORE_SIZE)
+
+
+@benchmark
+def store_delete_by_username(options):
+    # Deleting in insertion order would always find the consumer first
+    usernames = ['consumer-%d' % i for i in range(STORE_SIZE)]
+    random.Random(0).shuffle(usernames)
+
+    def delete(store):
+        for username in usernames:
+            store.delete(username, 'username')
+    return result(measure_once(lambda: make_store(STORE_SIZE), delete, options.repeat) / STORE_SIZE, 'op',
+                  STORE_SIZE)
+
+
+def create_consumers(simulator, amount):
+    for i in range(amount):
+        simulator.consumers.create(username='consumer-%d' % i, custom_id='custom-%d' % i)
+
+
+def create_client(simulator):
+    client = KongAdminClient(ADAPTER_URL)
+    client.session.mount(ADAPTER_URL, SimulatorHTTPAdapter(simulator))
+    return client
+
+
+@benchmark
+def seed_consumers(options):
+    amount = int(SCAN_CONSUMERS * options.scale)
+    return result(measure_once(KongAdminSimulator, lambda simulator: create_consumers(simulator, amount),
+                               options.macro_repeat), 'run', amount)
+
+
+def scan(options, amount, window_size):
+    simulator = KongAdminSimulator()
+    create_consumers(simulator, amount)
+    client = create_client(simulator)
+
+    def _scan(_):
+        scanned = sum(1 for _ in client.consumers.iterate(window_size=window_size))
+        assert scanned == amount, 'scanned %d out of %d consumers' % (scanned, amount)
+
+    try:
+        return result(measure_once(lambda: None, _scan, options.macro_repeat), 'run', amount)
+    finally:
+        client.close()
+
+
+@benchmark
+def scan_consumers(options):
+    return scan(options, int(SCAN_CONSUMERS * options.scale), 1000)
+
+
+@benchmark
+def scan_consumers_small_pages(options):
+    # Ten times as many pages: reveals pages whose cost grows with the size of the collection
+    return scan(options, int(SCAN_CONSUMERS * options.scale), 100)
+
+
+@benchmark
+def provision_credentials(options):
+    amount = int(PROVISION_CREDENTIALS * options.scale)
+
+    def setup():
+        simulator = KongAdminSimulator()
+        consumer = simulator.consumers.create(username='john', custom_id='john')
+        return create_client(simulator), consumer['id']
+
+    def provision(state):
+        client, consumer_id = state
+        results = client.consumers.key_auth(consumer_id).create_many(
+            [{'key': 'key-%d' % i} for i in range(amount)], max_workers=8)
+        client.close()
+        assert all(item.succeeded for item in results), 'provisioning failed'
+
+    return result(measure_once(setup, provision, options.macro_repeat), 'run', amount)
+
+
+def run(options):
+    results = {}
+    for func in BENCHMARKS:
+        name = func.__name__
+        if options.filter and not any(pattern in name for pattern in options.filter):
+            continue
+        results[name] = func(options)
+        print('%-28s %14s' % (name, format_seconds(results[name])), file=sys.stderr)
+    return results
+
+
+def format_seconds(entry):
+    seconds = entry['seconds']
+    if entry['unit'] == 'op':
+        return '%.3f us/op' % (seconds * 1e6) if seconds < 1e-3 else '%.3f ms/op' % (seconds * 1e3)
+    return '%.3f s' % seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Scales the amount of entities of the macro scenarios (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Amount of measurements of micro-benchmarks (the best one is used)')
+    parser.add_argument('--macro-repeat', type=int, default=1, help='Amount of measurements of macro scenarios')
+    parser.add_argument('--filter', action='append', help='Only runs benchmarks whose name contains this text')
+    parser.add_argument('--output', help='Writes the results as JSON to this file')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline file (default: %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Stores the results in the baseline file, instead of comparing with it')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Share by which a benchmark may be slower than its baseline (default: %(default)s)')
+    parser.add_argument('--threshold-for', action='append', metavar='NAME=THRESHOLD',
+                        help='Threshold of a specific benchmark')
+    options = parser.parse_args(argv)
+
+    try:
+        thresholds = parse_thresholds(options.threshold_for)
+    except ValueError as e:
+        parser.error(e)
+    if options.threshold < 0:
+        parser.error('--threshold should be at least 0')
+
+    document = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'scale': options.scale,
+        'results': run(options),
+    }
+
+    if options.output:
+        with io.open(options.output, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(document, indent=2, sort_keys=True))
+
+    if options.save_baseline:
+        baseline = {'results': {}}
+        if os.path.exists(options.baseline):
+            with io.open(options.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        # Benchmarks that did not run (see --filter) keep their baseline
+        baseline.update(dict(document, results=dict(baseline['results'], **document['results'])))
+        with io.open(options.baseline, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+        print('Stored the baseline in %s' % options.baseline)
+        return 0
+
+    if not os.path.exists(options.baseline):
+        print('No baseline at %s; record one with --save-baseline' % options.baseline)
+        return 0
+
+    with io.open(options.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    rows = compare_results(document['results'], baseline['results'], options.threshold, thresholds)
+    print('%-28s %14s %14s %8s  %s' % ('benchmark', 'baseline', 'current', 'change', 'status'))
+    for name, previous, current, ratio, status in rows:
+        unit = document['results'][name]['unit']
+        print('%-28s %14s %14s %8s  %s' % (
+            name, '-' if previous is None else format_seconds({'seconds': previous, 'unit': unit}),
+            format_seconds({'seconds': current, 'unit': unit}),
+            '-' if ratio is None else '%+.0f%%' % ((ratio - 1) * 100), status))
+
+    regressions = [row[0] for row in rows if row[4] == REGRESSION]
+    if regressions:
+        print('%d benchmark(s) regressed: %s' % (len(regressions), ', '.join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -70,5 +70,12 @@ setup(
     ],
     keywords=[],
     install_requires=requirements,
-    extras_require={},
+    extras_require={
+        'async': ['aiohttp'],
+    },
+    entry_points={
+        'console_scripts': [
+            'kong-bench = kong.bench:main',
+        ],
+    },
 )
@@ -0,0 +1,909 @@
+# -*- coding: utf-8 -*-
+"""
+asyncio counterpart of :mod:`kong.client`. Every admin client exposes the same contract as its blocking sibling, but
+all I/O bound methods are coroutines and ``iterate`` is an asynchronous generator:
+
+    async with AsyncKongAdminClient('http://localhost:8001') as client:
+        api = await client.apis.create(upstream_url='http://mockbin.com', name='mockbin', request_host='mockbin.com')
+        async for consumer in client.consumers.iterate(window_size=100):
+            await client.consumers.key_auth(consumer['id']).create()
+
+This module requires Python 3.6+ and aiohttp, which can be installed together with python-kong:
+
+    $ pip install python-kong[async]
+"""
+from __future__ import unicode_literals, print_function
+import asyncio
+import copy
+
+import aiohttp
+
+from .constants import APIS, PLUGINS, CONSUMERS, KEY_AUTH, BASIC_AUTH, OAUTH2, MAX_PAGE_SIZE
+from .contract import KongAdminContract, APIAdminContract, ConsumerAdminContract, PluginAdminContract, \
+    APIPluginConfigurationAdminContract, BasicAuthAdminContract, KeyAuthAdminContract, OAuth2AdminContract
+from .client import KONG_RATE_LIMITER, get_default_kong_headers
+from .utils import add_url_params, parse_query_parameters
+from .compat import OK, CREATED, NO_CONTENT, NOT_FOUND
+from .exceptions import ServerError
+from .concurrency import BulkResult, DEFAULT_MAX_WORKERS
+from .ratelimit import RateLimiter
+from .codec import DEFAULT_CODEC, get_codec
+from .retry import RetryPolicy, RetryBudget
+from .circuitbreaker import is_failure_status
+from .validation import API_UPDATE_FIELDS, API_FILTER_FIELDS, PLUGIN_CONFIGURATION_FILTER_FIELDS, \
+    CONSUMER_UPDATE_FIELDS, CONSUMER_FILTER_FIELDS, BASIC_AUTH_UPDATE_FIELDS, BASIC_AUTH_FILTER_FIELDS, \
+    KEY_AUTH_UPDATE_FIELDS, KEY_AUTH_FILTER_FIELDS, OAUTH2_UPDATE_FIELDS, OAUTH2_FILTER_FIELDS, URLBuilderMixin, \
+    assert_valid_fields, get_error_class
+
+
+def encode_form_data(data):
+    """
+    Encodes a dictionary the way ``requests`` does for its ``data`` argument: ``None`` values are dropped and all other
+      values are converted to strings.
+    """
+    result = []
+    for key, value in data.items():
+        if value is None:
+            continue
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        elif not isinstance(value, str):
+            value = str(value)
+        result.append((key, value))
+    return result
+
+
+# Errors raised by aiohttp that are worth retrying
+ASYNC_RETRYABLE_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+class RetryingRequest(object):
+    """
+    asyncio counterpart of ``kong.retry.RetryPolicy.call``: an asynchronous context manager that sends a request
+      through an ``aiohttp.ClientSession``, retrying it according to the policy. Every attempt passes the circuit
+      breaker, if any. The response is released on exit.
+    """
+    def __init__(self, session, policy, method, url, idempotent=None, circuit_breaker=None, **kwargs):
+        self.session = session
+        self.policy = policy
+        self.method = method
+        self.url = url
+        self.idempotent = policy.is_idempotent(method) if idempotent is None else idempotent
+        self.breaker = circuit_breaker.get_breaker(url) if circuit_breaker is not None else None
+        self.kwargs = kwargs
+        self._response = None
+
+    async def send(self):
+        """
+        asyncio counterpart of ``kong.circuitbreaker.NodeCircuitBreaker.call``.
+        """
+        if self.breaker is None:
+            return await self.session.request(self.method, self.url, **self.kwargs)
+
+        self.breaker.acquire()
+        started_at = self.breaker.clock()
+        try:
+            response = await self.session.request(self.method, self.url, **self.kwargs)
+        except ASYNC_RETRYABLE_ERRORS:
+            self.breaker.release(self.breaker.clock() - started_at, failed=True)
+            raise
+        except Exception:
+            self.breaker.release(self.breaker.clock() - started_at, failed=False)
+            raise
+
+        self.breaker.release(self.breaker.clock() - started_at, failed=is_failure_status(response.status))
+        return response
+
+    async def __aenter__(self):
+        self.policy.start()
+
+        attempt = 1
+        while True:
+            try:
+                response = await self.send()
+            except ASYNC_RETRYABLE_ERRORS as e:
+                delay = self.policy.get_error_delay(
+                    attempt, self.idempotent, e, connect_error=isinstance(e, aiohttp.ClientConnectorError))
+                if delay is None:
+                    raise
+            else:
+                delay = self.policy.get_response_delay(
+                    attempt, self.idempotent, response.status, response.headers.get('Retry-After'))
+                if delay is None:
+                    self._response = response
+                    return response
+                response.release()
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self._response is not None:
+            self._response.release()
+            self._response = None
+
+
+async def raise_response_error(response, exception_class=None):
+    exception_class = exception_class or ValueError
+    assert issubclass(exception_class, BaseException)
+    raise exception_class(await response.read())
+
+
+def check_stream(stream):
+    """
+    Pages are decoded once they have been read completely: streaming them (see ``kong.streaming``) is only supported by
+      the blocking client.
+
+    :raises ValueError: If ``stream`` is set
+    """
+    if stream:
+        raise ValueError('Streaming pages is not supported by the asyncio client')
+
+
+async def check_response(response, expected_status_codes=(OK,), conflict=False):
+    """
+    asyncio counterpart of ``kong.client.check_response``.
+    """
+    error_class = get_error_class(response.status, expected_status_codes, conflict=conflict)
+    if error_class is not None:
+        await raise_response_error(response, error_class)
+
+
+class AsyncCollectionMixin(object):
+    async def iterate(self, window_size=10, **filter_fields):
+        current_offset = None
+        while True:
+            response = await self.list(size=window_size, offset=current_offset, **copy.copy(filter_fields))
+            for item in response['data']:
+                yield item
+            next_url = response.get('next', None)
+            if next_url is None:
+                return
+            current_offset = parse_query_parameters(next_url).get('offset')[0]
+
+    async def count_by_paging(self, estimate=False, **filter_fields):
+        """
+        asyncio counterpart of ``kong.mixins.CollectionMixin.count_by_paging``.
+        """
+        amount = 0
+        current_offset = None
+        while True:
+            response = await self.list(size=MAX_PAGE_SIZE, offset=current_offset, **copy.copy(filter_fields))
+            amount += len(response['data'])
+            next_url = response.get('next', None)
+            if next_url is None or estimate:
+                return amount
+            current_offset = parse_query_parameters(next_url).get('offset')[0]
+
+
+async def gather_concurrently(func, items, max_workers=None, controller=None):
+    """
+    asyncio counterpart of ``kong.concurrency.run_concurrently``: awaits ``func(item)`` for every item, with at most
+      ``max_workers`` coroutines in flight at the same time, or as many as the controller allows.
+    """
+    if max_workers is None and controller is not None:
+        max_workers = controller.max_limit
+    semaphore = asyncio.Semaphore(max_workers or DEFAULT_MAX_WORKERS)
+    released = asyncio.Condition()
+
+    async def _acquire():
+        async with released:
+            while True:
+                token = controller.try_acquire()
+                if token is not None:
+                    return token
+                await released.wait()
+
+    async def _release(token, error):
+        controller.release(token, error)
+        async with released:
+            released.notify_all()
+
+    async def _call(item):
+        async with semaphore:
+            token = await _acquire() if controller is not None else None
+            error = None
+            try:
+                return BulkResult(item, result=await func(item))
+            except Exception as e:
+                error = e
+                return BulkResult(item, error=e)
+            finally:
+                if controller is not None:
+                    await _release(token, error)
+
+    return list(await asyncio.gather(*[_call(item) for item in items]))
+
+
+# Errors that indicate Kong is overloaded. Pass these as ``overload_errors`` when creating an
+#   AdaptiveConcurrencyController for the bulk operations of the asyncio client.
+ASYNC_OVERLOAD_ERRORS = (ServerError, asyncio.TimeoutError, aiohttp.ClientConnectionError)
+
+
+class AsyncBulkMixin(object):
+    async def create_many(self, items, max_workers=None, controller=None):
+        return await gather_concurrently(
+            lambda fields: self.create(**fields), items, max_workers=max_workers, controller=controller)
+
+    async def update_many(self, items, max_workers=None, controller=None):
+        return await gather_concurrently(
+            lambda item: self.update(item[0], **item[1]), items, max_workers=max_workers, controller=controller)
+
+    async def delete_many(self, ids, max_workers=None, controller=None):
+        return await gather_concurrently(self.delete, ids, max_workers=max_workers, controller=controller)
+
+
+class AsyncRestClient(URLBuilderMixin):
+    """
+    :param api_url: Base URL of the Kong admin API
+    :param headers: Headers that are sent along with every request
+    :param owner: When given, the ``aiohttp.ClientSession`` of the owner is used instead of a private one. This lets all
+        sub-clients of an ``AsyncKongAdminClient`` share a single connection pool.
+    """
+    def __init__(self, api_url, headers=None, owner=None):
+        self.api_url = api_url
+        self.headers = headers
+        self._owner = owner
+        self._session = None
+        self._url_builder = None
+
+    async def destroy(self):
+        self.api_url = None
+        self.headers = None
+        self._owner = None
+
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    @property
+    def codec(self):
+        return self._owner.codec if self._owner is not None else DEFAULT_CODEC
+
+    @property
+    def retry_policy(self):
+        return self._owner.retry_policy if self._owner is not None else DEFAULT_RETRY_POLICY
+
+    @property
+    def circuit_breaker(self):
+        return self._owner.circuit_breaker if self._owner is not None else None
+
+    @property
+    def session(self):
+        if self._owner is not None:
+            return self._owner.session
+        if self._session is None:
+            # The session has to be created lazily, as aiohttp requires a running event loop
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def count_collection(self, url, estimate=False):
+        """
+        asyncio counterpart of ``kong.client.RestClient.count_collection``.
+        """
+        async with self.request('GET', add_url_params(url, {'size': 1})) as response:
+            await check_response(response)
+
+            result = self.codec.loads(await response.read())
+
+        if 'total' in result:
+            return result['total']
+        elif result.get('next') is None:
+            return len(result.get('data'))
+        return await self.count_by_paging(estimate=estimate)
+
+    def request(self, method, url, idempotent=None, **kwargs):
+        """
+        asyncio counterpart of ``kong.client.RestClient.request``. Use the result as an asynchronous context manager:
+
+            async with self.request('GET', url) as response:
+                ...
+
+        :rtype: RetryingRequest
+        """
+        headers = self.get_headers(**kwargs.pop('headers', {}))
+        return RetryingRequest(self.session, self.retry_policy, method, url, idempotent=idempotent,
+                               circuit_breaker=self.circuit_breaker, headers=headers, **kwargs)
+
+    def get_headers(self, **headers):
+        result = {}
+        result.update(self.headers)
+        result.update(headers)
+        return result
+
+    def get_url(self, *path, **query_params):
+        return self.build_url(path, query_params)
+
+
+class AsyncAPIPluginConfigurationAdminClient(AsyncCollectionMixin, AsyncBulkMixin, AsyncRestClient,
+                                             APIPluginConfigurationAdminContract):
+    def __init__(self, api_admin, api_name_or_id, api_url, owner=None):
+        super(AsyncAPIPluginConfigurationAdminClient, self).__init__(
+            api_url, headers=get_default_kong_headers(), owner=owner)
+
+        self.api_admin = api_admin
+        self.api_name_or_id = api_name_or_id
+
+    async def destroy(self):
+        await super(AsyncAPIPluginConfigurationAdminClient, self).destroy()
+        self.api_admin = None
+        self.api_name_or_id = None
+
+    async def create(self, plugin_name, enabled=None, consumer_id=None, **fields):
+        values = {}
+        for key in fields:
+            values['config.%s' % key] = fields[key]
+
+        data = dict({
+            'name': plugin_name,
+            'consumer_id': consumer_id,
+        }, **values)
+
+        if enabled is not None and isinstance(enabled, bool):
+            data['enabled'] = enabled
+
+        async with self.request('POST', self.get_url(APIS, self.api_name_or_id, PLUGINS),
+                                data=encode_form_data(data)) as response:
+            await check_response(response, (CREATED,), conflict=True)
+
+            return self.codec.loads(await response.read())
+
+    async def create_or_update(self, plugin_name, plugin_configuration_id=None, enabled=None, consumer_id=None,
+                               **fields):
+        values = {}
+        for key in fields:
+            values['config.%s' % key] = fields[key]
+
+        data = dict({
+            'name': plugin_name,
+            'consumer_id': consumer_id,
+        }, **values)
+
+        if enabled is not None and isinstance(enabled, bool):
+            data['enabled'] = enabled
+
+        if plugin_configuration_id is not None:
+            data['id'] = plugin_configuration_id
+
+        async with self.request('PUT', self.get_url(APIS, self.api_name_or_id, PLUGINS),
+                                data=encode_form_data(data)) as response:
+            await check_response(response, (CREATED, OK), conflict=True)
+
+            return self.codec.loads(await response.read())
+
+    async def update(self, plugin_id, enabled=None, consumer_id=None, **fields):
+        values = {}
+        for key in fields:
+            values['config.%s' % key] = fields[key]
+
+        data_struct_update = copy.copy(values)
+
+        if consumer_id is not None:
+            data_struct_update['consumer_id'] = consumer_id
+
+        if enabled is not None and isinstance(enabled, bool):
+            data_struct_update['enabled'] = enabled
+
+        url = self.get_url(APIS, self.api_name_or_id, PLUGINS, plugin_id)
+
+        async with self.request('PATCH', url, data=encode_form_data(data_struct_update)) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def list(self, size=100, offset=None, stream=False, **filter_fields):
+        check_stream(stream)
+        assert_valid_fields(filter_fields, PLUGIN_CONFIGURATION_FILTER_FIELDS)
+
+        query_params = filter_fields
+        query_params['size'] = size
+
+        if offset is not None:
+            query_params['offset'] = offset
+
+        url = self.get_url(APIS, self.api_name_or_id, PLUGINS, **query_params)
+        async with self.request('GET', url) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def delete(self, plugin_id):
+        async with self.request('DELETE', self.get_url(APIS, self.api_name_or_id, PLUGINS, plugin_id)) as response:
+            if response.status not in (NO_CONTENT, NOT_FOUND):
+                raise ValueError('Could not delete Plugin Configuration (status: %s): %s' % (
+                    response.status, plugin_id))
+
+    async def retrieve(self, plugin_id):
+        async with self.request('GET', self.get_url(APIS, self.api_name_or_id, PLUGINS, plugin_id)) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def count(self, estimate=False):
+        return await self.count_collection(self.get_url(APIS, self.api_name_or_id, PLUGINS), estimate=estimate)
+
+
+class AsyncAPIAdminClient(AsyncCollectionMixin, AsyncBulkMixin, AsyncRestClient, APIAdminContract):
+    def __init__(self, api_url, owner=None):
+        super(AsyncAPIAdminClient, self).__init__(api_url, headers=get_default_kong_headers(), owner=owner)
+
+    async def destroy(self):
+        await super(AsyncAPIAdminClient, self).destroy()
+
+    async def count(self, estimate=False):
+        return await self.count_collection(self.get_url(APIS), estimate=estimate)
+
+    async def create(self, upstream_url, name=None, request_host=None, request_path=None, strip_request_path=False,
+                     preserve_host=False):
+        async with self.request('POST', self.get_url(APIS), data=encode_form_data({
+            'name': name,
+            'request_host': request_host or None,  # Empty strings are not allowed
+            'request_path': request_path or None,  # Empty strings are not allowed
+            'strip_request_path': strip_request_path,
+            'preserve_host': preserve_host,
+            'upstream_url': upstream_url
+        })) as response:
+            await check_response(response, (CREATED,), conflict=True)
+
+            return self.codec.loads(await response.read())
+
+    async def create_or_update(self, upstream_url, api_id=None, name=None, request_host=None, request_path=None,
+                               strip_request_path=False, preserve_host=False):
+        data = {
+            'name': name,
+            'request_host': request_host or None,  # Empty strings are not allowed
+            'request_path': request_path or None,  # Empty strings are not allowed
+            'strip_request_path': strip_request_path,
+            'preserve_host': preserve_host,
+            'upstream_url': upstream_url
+        }
+
+        if api_id is not None:
+            data['id'] = api_id
+
+        async with self.request('PUT', self.get_url(APIS), data=encode_form_data(data)) as response:
+            await check_response(response, (CREATED, OK), conflict=True)
+
+            return self.codec.loads(await response.read())
+
+    async def update(self, name_or_id, upstream_url, **fields):
+        assert_valid_fields(fields, API_UPDATE_FIELDS)
+
+        async with self.request('PATCH', self.get_url(APIS, name_or_id), data=encode_form_data(dict({
+            'upstream_url': upstream_url
+        }, **fields))) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def delete(self, name_or_id):
+        async with self.request('DELETE', self.get_url(APIS, name_or_id)) as response:
+            if response.status not in (NO_CONTENT, NOT_FOUND):
+                raise ValueError('Could not delete API (status: %s): %s' % (response.status, name_or_id))
+
+    async def retrieve(self, name_or_id):
+        async with self.request('GET', self.get_url(APIS, name_or_id)) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def list(self, size=100, offset=None, stream=False, **filter_fields):
+        check_stream(stream)
+        assert_valid_fields(filter_fields, API_FILTER_FIELDS)
+
+        query_params = filter_fields
+        query_params['size'] = size
+
+        if offset:
+            query_params['offset'] = offset
+
+        url = self.get_url(APIS, **query_params)
+        async with self.request('GET', url) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    def plugins(self, name_or_id):
+        return AsyncAPIPluginConfigurationAdminClient(self, name_or_id, self.api_url, owner=self)
+
+
+class AsyncBasicAuthAdminClient(AsyncCollectionMixin, AsyncBulkMixin, AsyncRestClient, BasicAuthAdminContract):
+    def __init__(self, consumer_admin, consumer_id, api_url, owner=None):
+        super(AsyncBasicAuthAdminClient, self).__init__(api_url, headers=get_default_kong_headers(), owner=owner)
+
+        self.consumer_admin = consumer_admin
+        self.consumer_id = consumer_id
+
+    async def destroy(self):
+        await super(AsyncBasicAuthAdminClient, self).destroy()
+        self.consumer_admin = None
+        self.consumer_id = None
+
+    async def create_or_update(self, basic_auth_id=None, username=None, password=None):
+        data = {
+            'username': username,
+            'password': password,
+        }
+
+        if basic_auth_id is not None:
+            data['id'] = basic_auth_id
+
+        async with self.request('PUT', self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH),
+                                data=encode_form_data(data)) as response:
+            await check_response(response, (CREATED, OK), conflict=True)
+
+            return self.codec.loads(await response.read())
+
+    async def create(self, username, password):
+        async with self.request('POST', self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH), data=encode_form_data({
+            'username': username,
+            'password': password,
+        })) as response:
+            await check_response(response, (CREATED,), conflict=True)
+
+            return self.codec.loads(await response.read())
+
+    async def list(self, size=100, offset=None, stream=False, **filter_fields):
+        check_stream(stream)
+        assert_valid_fields(filter_fields, BASIC_AUTH_FILTER_FIELDS)
+
+        query_params = filter_fields
+        query_params['size'] = size
+
+        if offset:
+            query_params['offset'] = offset
+
+        url = self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH, **query_params)
+        async with self.request('GET', url) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def delete(self, basic_auth_id):
+        url = self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH, basic_auth_id)
+        async with self.request('DELETE', url) as response:
+            if response.status not in (NO_CONTENT, NOT_FOUND):
+                raise ValueError('Could not delete Basic Auth (status: %s): %s for Consumer: %s' % (
+                    response.status, basic_auth_id, self.consumer_id))
+
+    async def retrieve(self, basic_auth_id):
+        async with self.request(
+                'GET', self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH, basic_auth_id)) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def count(self, estimate=False):
+        return await self.count_collection(self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH), estimate=estimate)
+
+    async def update(self, basic_auth_id, **fields):
+        assert_valid_fields(fields, BASIC_AUTH_UPDATE_FIELDS)
+        async with self.request('PATCH', self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH, basic_auth_id),
+                                data=encode_form_data(fields)) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+
+class AsyncKeyAuthAdminClient(AsyncCollectionMixin, AsyncBulkMixin, AsyncRestClient, KeyAuthAdminContract):
+    def __init__(self, consumer_admin, consumer_id, api_url, owner=None):
+        super(AsyncKeyAuthAdminClient, self).__init__(api_url, headers=get_default_kong_headers(), owner=owner)
+
+        self.consumer_admin = consumer_admin
+        self.consumer_id = consumer_id
+
+    async def destroy(self):
+        await super(AsyncKeyAuthAdminClient, self).destroy()
+        self.consumer_admin = None
+        self.consumer_id = None
+
+    async def create_or_update(self, key_auth_id=None, key=None):
+        data = {
+            'key': key
+        }
+
+        if key_auth_id is not None:
+            data['id'] = key_auth_id
+
+        async with self.request('PUT', self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH),
+                                data=encode_form_data(data)) as response:
+            await check_response(response, (CREATED, OK), conflict=True)
+
+            return self.codec.loads(await response.read())
+
+    async def create(self, key=None):
+        async with self.request('POST', self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH), data=encode_form_data({
+            'key': key,
+        })) as response:
+            await check_response(response, (CREATED,), conflict=True)
+
+            return self.codec.loads(await response.read())
+
+    async def list(self, size=100, offset=None, stream=False, **filter_fields):
+        check_stream(stream)
+        assert_valid_fields(filter_fields, KEY_AUTH_FILTER_FIELDS)
+
+        query_params = filter_fields
+        query_params['size'] = size
+
+        if offset:
+            query_params['offset'] = offset
+
+        url = self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH, **query_params)
+        async with self.request('GET', url) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def delete(self, key_auth_id):
+        url = self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH, key_auth_id)
+        async with self.request('DELETE', url) as response:
+            if response.status not in (NO_CONTENT, NOT_FOUND):
+                raise ValueError('Could not delete Key Auth (status: %s): %s for Consumer: %s' % (
+                    response.status, key_auth_id, self.consumer_id))
+
+    async def retrieve(self, key_auth_id):
+        async with self.request('GET', self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH, key_auth_id)) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def count(self, estimate=False):
+        return await self.count_collection(self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH), estimate=estimate)
+
+    async def update(self, key_auth_id, **fields):
+        assert_valid_fields(fields, KEY_AUTH_UPDATE_FIELDS)
+        async with self.request('PATCH', self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH, key_auth_id),
+                                data=encode_form_data(fields)) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+
+class AsyncOAuth2AdminClient(AsyncCollectionMixin, AsyncBulkMixin, AsyncRestClient, OAuth2AdminContract):
+    def __init__(self, consumer_admin, consumer_id, api_url, owner=None):
+        super(AsyncOAuth2AdminClient, self).__init__(api_url, headers=get_default_kong_headers(), owner=owner)
+
+        self.consumer_admin = consumer_admin
+        self.consumer_id = consumer_id
+
+    async def destroy(self):
+        await super(AsyncOAuth2AdminClient, self).destroy()
+        self.consumer_admin = None
+        self.consumer_id = None
+
+    async def create_or_update(self, oauth2_id=None, name=None, redirect_uri=None, client_id=None,
+                               client_secret=None):
+        data = {
+            'name': name,
+            'redirect_uri': redirect_uri,
+            'client_id': client_id,
+            'client_secret': client_secret
+        }
+
+        if oauth2_id is not None:
+            data['id'] = oauth2_id
+
+        async with self.request('PUT', self.get_url(CONSUMERS, self.consumer_id, OAUTH2),
+                                data=encode_form_data(data)) as response:
+            await check_response(response, (CREATED, OK), conflict=True)
+
+            return self.codec.loads(await response.read())
+
+    async def create(self, name, redirect_uri, client_id=None, client_secret=None):
+        async with self.request('POST', self.get_url(CONSUMERS, self.consumer_id, OAUTH2), data=encode_form_data({
+            'name': name,
+            'redirect_uri': redirect_uri,
+            'client_id': client_id,
+            'client_secret': client_secret
+        })) as response:
+            await check_response(response, (CREATED,), conflict=True)
+
+            return self.codec.loads(await response.read())
+
+    async def list(self, size=100, offset=None, stream=False, **filter_fields):
+        check_stream(stream)
+        assert_valid_fields(filter_fields, OAUTH2_FILTER_FIELDS)
+
+        query_params = filter_fields
+        query_params['size'] = size
+
+        if offset:
+            query_params['offset'] = offset
+
+        url = self.get_url(CONSUMERS, self.consumer_id, OAUTH2, **query_params)
+        async with self.request('GET', url) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def delete(self, oauth2_id):
+        url = self.get_url(CONSUMERS, self.consumer_id, OAUTH2, oauth2_id)
+        async with self.request('DELETE', url) as response:
+            if response.status not in (NO_CONTENT, NOT_FOUND):
+                raise ValueError('Could not delete OAuth2 (status: %s): %s for Consumer: %s' % (
+                    response.status, oauth2_id, self.consumer_id))
+
+    async def retrieve(self, oauth2_id):
+        async with self.request('GET', self.get_url(CONSUMERS, self.consumer_id, OAUTH2, oauth2_id)) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def count(self, estimate=False):
+        return await self.count_collection(self.get_url(CONSUMERS, self.consumer_id, OAUTH2), estimate=estimate)
+
+    async def update(self, oauth2_id, **fields):
+        assert_valid_fields(fields, OAUTH2_UPDATE_FIELDS)
+        async with self.request('PATCH', self.get_url(CONSUMERS, self.consumer_id, OAUTH2, oauth2_id),
+                                data=encode_form_data(fields)) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+
+class AsyncConsumerAdminClient(AsyncCollectionMixin, AsyncBulkMixin, AsyncRestClient, ConsumerAdminContract):
+    def __init__(self, api_url, owner=None):
+        super(AsyncConsumerAdminClient, self).__init__(api_url, headers=get_default_kong_headers(), owner=owner)
+
+    async def destroy(self):
+        await super(AsyncConsumerAdminClient, self).destroy()
+
+    async def count(self, estimate=False):
+        return await self.count_collection(self.get_url(CONSUMERS), estimate=estimate)
+
+    async def create(self, username=None, custom_id=None):
+        async with self.request('POST', self.get_url(CONSUMERS), data=encode_form_data({
+            'username': username,
+            'custom_id': custom_id,
+        })) as response:
+            await check_response(response, (CREATED,), conflict=True)
+
+            return self.codec.loads(await response.read())
+
+    async def create_or_update(self, consumer_id=None, username=None, custom_id=None):
+        data = {
+            'username': username,
+            'custom_id': custom_id,
+        }
+
+        if consumer_id is not None:
+            data['id'] = consumer_id
+
+        async with self.request('PUT', self.get_url(CONSUMERS), data=encode_form_data(data)) as response:
+            await check_response(response, (CREATED, OK), conflict=True)
+
+            return self.codec.loads(await response.read())
+
+    async def update(self, username_or_id, **fields):
+        assert_valid_fields(fields, CONSUMER_UPDATE_FIELDS)
+        async with self.request('PATCH', self.get_url(CONSUMERS, username_or_id),
+                                data=encode_form_data(fields)) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def list(self, size=100, offset=None, stream=False, **filter_fields):
+        check_stream(stream)
+        assert_valid_fields(filter_fields, CONSUMER_FILTER_FIELDS)
+
+        query_params = filter_fields
+        query_params['size'] = size
+
+        if offset:
+            query_params['offset'] = offset
+
+        url = self.get_url(CONSUMERS, **query_params)
+        async with self.request('GET', url) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def delete(self, username_or_id):
+        async with self.request('DELETE', self.get_url(CONSUMERS, username_or_id)) as response:
+            if response.status not in (NO_CONTENT, NOT_FOUND):
+                raise ValueError('Could not delete Consumer (status: %s): %s' % (response.status, username_or_id))
+
+    async def retrieve(self, username_or_id):
+        async with self.request('GET', self.get_url(CONSUMERS, username_or_id)) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    def basic_auth(self, username_or_id):
+        return AsyncBasicAuthAdminClient(self, username_or_id, self.api_url, owner=self)
+
+    def key_auth(self, username_or_id):
+        return AsyncKeyAuthAdminClient(self, username_or_id, self.api_url, owner=self)
+
+    def oauth2(self, username_or_id):
+        return AsyncOAuth2AdminClient(self, username_or_id, self.api_url, owner=self)
+
+
+class AsyncPluginAdminClient(AsyncRestClient, PluginAdminContract):
+    def __init__(self, api_url, owner=None):
+        super(AsyncPluginAdminClient, self).__init__(api_url, headers=get_default_kong_headers(), owner=owner)
+
+    async def destroy(self):
+        await super(AsyncPluginAdminClient, self).destroy()
+
+    async def list(self):
+        async with self.request('GET', self.get_url(PLUGINS)) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+    async def retrieve_schema(self, plugin_name):
+        async with self.request('GET', self.get_url(PLUGINS, plugin_name, 'schema')) as response:
+            await check_response(response)
+
+            return self.codec.loads(await response.read())
+
+
+class AsyncKongAdminClient(KongAdminContract):
+    """
+    All sub-clients (including the credential and plugin configuration clients handed out by ``consumers`` and
+      ``apis``) share the ``aiohttp.ClientSession`` owned by this client, so a single connection pool serves every
+      in-flight request. Requests wait for a free connection once the pool is exhausted.
+
+    :param api_url: Base URL of the Kong admin API
+    :param pool_maxsize: The maximum number of simultaneous connections (0 means unlimited)
+    :param pool_maxsize_per_host: The maximum number of simultaneous connections per host (0 means unlimited)
+    :param rate_limit: Maximum average amount of requests per second sent to each Kong node (unlimited if None)
+    :type rate_limit: float
+    :param rate_limit_burst: Maximum amount of requests that may be sent at once to each Kong node
+    :type rate_limit_burst: int
+    :param codec: Decodes response bodies. See ``kong.codec.get_codec``.
+    :type codec: kong.codec.JSONCodec | str
+    :param retry_policy: Decides which failed requests are retried, and when. See ``kong.retry.RetryPolicy``.
+    :type retry_policy: kong.retry.RetryPolicy
+    :param circuit_breaker: When given, requests to a failing Kong node fail fast with a ``CircuitOpenError``
+    :type circuit_breaker: kong.circuitbreaker.NodeCircuitBreaker
+    """
+    def __init__(self, api_url, pool_maxsize=100, pool_maxsize_per_host=0, rate_limit=None, rate_limit_burst=None,
+                 codec=None, retry_policy=None, circuit_breaker=None):
+        super(AsyncKongAdminClient, self).__init__(
+            apis=AsyncAPIAdminClient(api_url, owner=self),
+            consumers=AsyncConsumerAdminClient(api_url, owner=self),
+            plugins=AsyncPluginAdminClient(api_url, owner=self))
+        self.pool_maxsize = pool_maxsize
+        self.pool_maxsize_per_host = pool_maxsize_per_host
+        self.rate_limiter = RateLimiter(rate_limit, burst=rate_limit_burst) if rate_limit else KONG_RATE_LIMITER
+        self.codec = get_codec(codec)
+        self.retry_policy = retry_policy or RetryPolicy(budget=RetryBudget())
+        self.circuit_breaker = circuit_breaker
+        self._session = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize, limit_per_host=self.pool_maxsize_per_host)
+            trace_configs = []
+            if self.rate_limiter is not None:
+                trace_config = aiohttp.TraceConfig()
+                trace_config.on_request_start.append(self._throttle)
+                trace_configs.append(trace_config)
+            self._session = aiohttp.ClientSession(connector=connector, trace_configs=trace_configs)
+        return self._session
+
+    async def _throttle(self, session, trace_config_ctx, params):
+        delay = self.rate_limiter.reserve(str(params.url))
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def close(self):
+        await self.apis.destroy()
+        await self.consumers.destroy()
+        await self.plugins.destroy()
+
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import threading
+
+from .compat import urljoin
+from .ratelimit import monotonic
+from .retry import RETRYABLE_ERRORS
+from .circuitbreaker import is_failure_status
+
+LEAST_OUTSTANDING = 'least-outstanding'
+ROUND_ROBIN = 'round-robin'
+STRATEGIES = (LEAST_OUTSTANDING, ROUND_ROBIN)
+
+# HTTP methods of requests that can be served by any node
+READ_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+
+class Node(object):
+    """
+    A Kong node serving the admin API, as tracked by a ``LoadBalancer``.
+    """
+    def __init__(self, url):
+        self.url = url
+        self.prefix = urljoin(url, '_')[:-1]
+        self.outstanding = 0
+        self.healthy = True
+        self.consecutive_failures = 0
+        self.ejected_until = None
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+    def is_available(self, now):
+        return self.healthy and (self.ejected_until is None or self.ejected_until <= now)
+
+    def __repr__(self):
+        return '<Node %s>' % self.url
+
+
+class LoadBalancer(object):
+    """
+    Spreads requests over the admin APIs of all nodes of a Kong cluster.
+
+    Reads go to the node with the least outstanding requests (ties are broken round-robin), or to the next node in
+      turn with the ``'round-robin'`` strategy. Writes go to the preferred node (the first one), so they are applied in
+      order, unless it is unavailable.
+
+    Nodes are taken out of rotation when they fail ``max_failures`` requests in a row (connection errors, timeouts and
+      5xx responses) for ``ejection_duration`` seconds, or when an active health check fails. When no node is available,
+      requests are spread over all of them anyway.
+
+    :param urls: Base URLs of the admin API of every node. The first one is the preferred node.
+    :type urls: list
+    :param strategy: ``'least-outstanding'`` or ``'round-robin'``
+    :param max_failures: Amount of consecutive failures after which a node is ejected
+    :type max_failures: int
+    :param ejection_duration: Amount of seconds an ejected node stays out of rotation
+    :type ejection_duration: float
+    """
+    def __init__(self, urls, strategy=LEAST_OUTSTANDING, max_failures=3, ejection_duration=30.0, clock=monotonic):
+        assert urls, 'at least one URL is required'
+        assert strategy in STRATEGIES, 'strategy should be one of %r' % (STRATEGIES,)
+        self.nodes = [Node(url) for url in urls]
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.ejection_duration = ejection_duration
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._next_index = 0
+        self._health_check_thread = None
+        self._stop_health_checks = threading.Event()
+
+    @property
+    def preferred_url(self):
+        return self.nodes[0].url
+
+    def choose(self, method='GET'):
+        """
+        Picks a node for a request, and registers the request as outstanding. Call ``release`` when it completes.
+
+        :param method: HTTP method of the request
+        :rtype: Node
+        """
+        with self._lock:
+            now = self._clock()
+            candidates = [node for node in self.nodes if node.is_available(now)] or self.nodes
+
+            if method.upper() not in READ_METHODS and candidates[0] is self.nodes[0]:
+                node = self.nodes[0]
+            else:
+                start = self._next_index % len(candidates)
+                self._next_index += 1
+                rotated = candidates[start:] + candidates[:start]
+                if self.strategy == LEAST_OUTSTANDING:
+                    node = min(rotated, key=lambda n: n.outstanding)
+                else:
+                    node = rotated[0]
+
+            node.outstanding += 1
+            node.requests += 1
+            return node
+
+    def release(self, node, failed):
+        """
+        Registers the completion of a request that was sent to ``node``.
+
+        :param failed: Whether the request failed in a way that indicates the node is unhealthy
+        :type failed: bool
+        """
+        with self._lock:
+            node.outstanding -= 1
+            if not failed:
+                node.consecutive_failures = 0
+                return
+
+            node.failures += 1
+            node.consecutive_failures += 1
+            if node.consecutive_failures >= self.max_failures:
+                node.consecutive_failures = 0
+                node.ejected_until = self._clock() + self.ejection_duration
+                node.ejections += 1
+
+    def rewrite(self, url, node):
+        """
+        :param url: URL built relative to the preferred node
+        :rtype: six.text_type
+        :return: The same URL, on ``node``
+        """
+        prefix = self.nodes[0].prefix
+        if node is self.nodes[0] or not url.startswith(prefix):
+            return url
+        return node.prefix + url[len(prefix):]
+
+    def call(self, method, url, send):
+        """
+        Sends a request through ``requests`` to one of the nodes.
+
+        :param method: HTTP method of the request
+        :param url: URL built relative to the preferred node
+        :param send: Callable that sends the request to the URL it is given
+        :rtype: requests.Response
+        """
+        node = self.choose(method)
+        try:
+            response = send(self.rewrite(url, node))
+        except RETRYABLE_ERRORS:
+            self.release(node, failed=True)
+            raise
+        except Exception:
+            self.release(node, failed=False)
+            raise
+
+        self.release(node, failed=is_failure_status(response.status_code))
+        return response
+
+    def check_health(self, probe):
+        """
+        Actively checks the health of every node.
+
+        :param probe: Callable that takes the URL of a node, and returns whether it is healthy. Exceptions count as
+            unhealthy.
+        """
+        for node in self.nodes:
+            try:
+                healthy = bool(probe(node.url))
+            except Exception:
+                healthy = False
+            with self._lock:
+                node.healthy = healthy
+
+    def start_health_checks(self, probe, interval):
+        """
+        Checks the health of every node every ``interval`` seconds, in a daemon thread, until ``stop_health_checks``
+          is called.
+        """
+        assert self._health_check_thread is None, 'health checks are running already'
+        self._stop_health_checks.clear()
+
+        def _run():
+            while not self._stop_health_checks.is_set():
+                self.check_health(probe)
+                self._stop_health_checks.wait(interval)
+
+        self._health_check_thread = threading.Thread(target=_run, name='kong-health-checks')
+        self._health_check_thread.daemon = True
+        self._health_check_thread.start()
+
+    def stop_health_checks(self):
+        if self._health_check_thread is None:
+            return
+        self._stop_health_checks.set()
+        self._health_check_thread.join()
+        self._health_check_thread = None
+
+    def stats(self):
+        """
+        :rtype: dict
+        :return: The amount of requests, failures and ejections of every node, whether it is currently available, and
+            the amount of requests that are outstanding
+        """
+        with self._lock:
+            now = self._clock()
+            return dict((node.url, {
+                'available': node.is_available(now),
+                'healthy': node.healthy,
+                'outstanding': node.outstanding,
+                'requests': node.requests,
+                'failures': node.failures,
+                'ejections': node.ejections,
+            }) for node in self.nodes)
@@ -0,0 +1,598 @@
+# -*- coding: utf-8 -*-
+"""
+Load generator for the Kong admin API. Drives a weighted mix of operations on APIs, consumers, credentials and plugin
+configurations through ``KongAdminClient``, from several threads, and reports throughput, latency percentiles and
+errors.
+
+Usage:
+
+    kong-bench --url http://localhost:8001 --concurrency 8 --duration 30 --mix create=1,retrieve=4,list=1
+    kong-bench --stand-in server --resources consumers,key-auth --json results.json
+
+Without ``--url``, the benchmark runs offline against a simulator: served over HTTP by a local ``SimulatorServer``
+(``--stand-in server``), or answered in-process by a ``SimulatorHTTPAdapter`` (``--stand-in adapter``).
+"""
+from __future__ import unicode_literals, print_function
+import argparse
+import itertools
+import json
+import math
+import random
+import sys
+import threading
+import uuid
+
+from .client import KongAdminClient
+from .constants import APIS, PLUGINS, CONSUMERS, KEY_AUTH, BASIC_AUTH, OAUTH2
+from .ratelimit import TokenBucket, monotonic
+from .server import SimulatorServer, SimulatorHTTPAdapter
+
+CREATE = 'create'
+RETRIEVE = 'retrieve'
+LIST = 'list'
+UPDATE = 'update'
+DELETE = 'delete'
+OPERATIONS = (CREATE, RETRIEVE, LIST, UPDATE, DELETE)
+
+RESOURCES = (APIS, CONSUMERS, KEY_AUTH, BASIC_AUTH, OAUTH2, PLUGINS)
+
+DEFAULT_MIX = 'create=1,retrieve=4,list=1,update=2,delete=1'
+
+SERVER = 'server'
+ADAPTER = 'adapter'
+STAND_INS = (SERVER, ADAPTER)
+
+# Base URL of the admin API answered by a SimulatorHTTPAdapter
+ADAPTER_URL = 'http://kong-simulator:8001/'
+
+PERCENTILES = (50, 95, 99)
+
+# Statuses of a benchmark compared with its baseline
+OK = 'ok'
+REGRESSION = 'REGRESSION'
+NEW = 'new'
+SIZE_DIFFERS = 'size differs'
+
+
+def parse_mix(mix):
+    """
+    :param mix: Comma separated weights of operations, like ``'create=1,retrieve=4'``
+    :rtype: list
+    :return: Tuples of every operation and its weight
+    """
+    result = []
+    for item in mix.split(','):
+        operation, _, weight = item.strip().partition('=')
+        if operation not in OPERATIONS:
+            raise ValueError('Unknown operation %r, expected one of %r' % (operation, OPERATIONS))
+        result.append((operation, float(weight or 1)))
+    if not any(weight > 0 for _, weight in result):
+        raise ValueError('At least one operation should have a positive weight')
+    return result
+
+
+def percentile(sorted_values, percent):
+    """
+    :param sorted_values: Sorted list of numbers
+    :param percent: Number between 0 and 100
+    :return: The nearest-rank percentile of the values, or None if there are none
+    """
+    if not sorted_values:
+        return None
+    rank = int(math.ceil(percent / 100.0 * len(sorted_values)))
+    return sorted_values[min(len(sorted_values) - 1, max(0, rank - 1))]
+
+
+def parse_thresholds(values):
+    """
+    :param values: Thresholds of specific benchmarks, like ``['scan_consumers=0.5']``
+    :rtype: dict
+    :return: Thresholds by benchmark name
+    """
+    thresholds = {}
+    for value in values or []:
+        name, separator, threshold = value.partition('=')
+        name = name.strip()
+        if not separator or not name:
+            raise ValueError('Invalid threshold %r, expected NAME=THRESHOLD' % value)
+        try:
+            thresholds[name] = float(threshold)
+        except ValueError:
+            raise ValueError('Invalid threshold %r of %s, expected a number' % (threshold, name))
+        if thresholds[name] < 0:
+            raise ValueError('Invalid threshold %r of %s, expected a number of at least 0' % (threshold, name))
+    return thresholds
+
+
+def compare_results(results, baseline, threshold, thresholds=None):
+    """
+    A benchmark regresses when it takes more than ``1 + threshold`` times its baseline.
+
+    :param results: Results by benchmark name, as dicts with the ``seconds`` and the ``size`` of a run
+    :param baseline: Baseline results by benchmark name, like ``results``
+    :param threshold: Default share by which a benchmark may be slower than its baseline
+    :param thresholds: Thresholds of specific benchmarks, by name
+    :rtype: list
+    :return: Tuples of the name, baseline seconds, current seconds, ratio and status of every benchmark
+    """
+    thresholds = thresholds or {}
+    rows = []
+    for name in sorted(results):
+        current = results[name]
+        previous = baseline.get(name)
+        if previous is None:
+            rows.append((name, None, current['seconds'], None, NEW))
+        elif previous.get('size') != current.get('size'):
+            rows.append((name, previous['seconds'], current['seconds'], None, SIZE_DIFFERS))
+        else:
+            ratio = current['seconds'] / previous['seconds']
+            limit = 1 + thresholds.get(name, threshold)
+            rows.append((name, previous['seconds'], current['seconds'], ratio, REGRESSION if ratio > limit else OK))
+    return rows
+
+
+def summarize_latencies(latencies):
+    """
+    :param latencies: Latencies, in seconds
+    :type latencies: list
+    :rtype: dict
+    :return: Dictionary containing the mean, the maximum and the percentiles (like ``'p95'``) of the latencies
+    """
+    values = sorted(latencies)
+    summary = dict(('p%d' % p, percentile(values, p)) for p in PERCENTILES)
+    summary['max'] = values[-1] if values else None
+    summary['mean'] = sum(values) / len(values) if values else None
+    return summary
+
+
+class ResourceWorkload(object):
+    """
+    Runs operations on the entities of a single resource. Keeps track of the entities it created, so they can be
+      retrieved, updated and deleted later on. Retrievals, updates and deletes fall back to a create while there are
+      no entities.
+
+    :param admin: The admin of the resource, like ``client.consumers``
+    :param create_fields: Callable that takes a unique number, and returns the keyword arguments of a create
+    :param update_fields: Callable that takes a unique number, and returns the keyword arguments of an update
+    """
+    def __init__(self, admin, create_fields, update_fields):
+        self.admin = admin
+        self.create_fields = create_fields
+        self.update_fields = update_fields
+        self._ids = []
+        self._in_use = {}  # id -> amount of operations running on it
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+
+    def next_number(self):
+        return next(self._counter)
+
+    def pick(self, rng, remove=False):
+        """
+        Picks a random entity. Entities that are picked without being removed are in use until ``release`` is called,
+          and are not removed meanwhile, so concurrent operations do not fail because of each other.
+
+        :return: The id of the entity, or None if there is no entity to pick
+        """
+        with self._lock:
+            if not self._ids:
+                return None
+            index = rng.randrange(len(self._ids))
+            entity_id = self._ids[index]
+            if not remove:
+                self._in_use[entity_id] = self._in_use.get(entity_id, 0) + 1
+                return entity_id
+            if self._in_use.get(entity_id):
+                return None
+            # Swap with the last id, so removal is O(1)
+            self._ids[index], self._ids[-1] = self._ids[-1], self._ids[index]
+            return self._ids.pop()
+
+    def release(self, entity_id):
+        with self._lock:
+            count = self._in_use.pop(entity_id) - 1
+            if count:
+                self._in_use[entity_id] = count
+
+    def using(self, entity_id, call):
+        """
+        :return: A callable that runs ``call``, and releases the entity afterwards
+        """
+        def _call():
+            try:
+                return call()
+            finally:
+                self.release(entity_id)
+        return _call
+
+    def add(self, entity):
+        with self._lock:
+            self._ids.append(entity['id'])
+        return entity
+
+    def prepare(self, operation, rng, page_size):
+        """
+        Prepares an operation, so that only the request itself is timed.
+
+        :rtype: tuple
+        :return: The operation that will actually run, and a callable without arguments that runs it
+        """
+        if operation == LIST:
+            return LIST, lambda: self.admin.list(size=page_size)
+        if operation != CREATE:
+            entity_id = self.pick(rng, remove=operation == DELETE)
+            if entity_id is not None:
+                if operation == RETRIEVE:
+                    return RETRIEVE, self.using(entity_id, lambda: self.admin.retrieve(entity_id))
+                elif operation == UPDATE:
+                    fields = self.update_fields(self.next_number())
+                    return UPDATE, self.using(entity_id, lambda: self.admin.update(entity_id, **fields))
+                return DELETE, lambda: self.admin.delete(entity_id)
+
+        fields = self.create_fields(self.next_number())
+        return CREATE, lambda: self.add(self.admin.create(**fields))
+
+    def cleanup(self):
+        while self._ids:
+            self.admin.delete(self._ids.pop())
+
+
+class PluginConfigurationWorkload(ResourceWorkload):
+    """
+    Runs operations on rate-limiting plugin configurations. Kong allows a single configuration of a plugin per API, so
+      every configuration gets an API of its own, which is created (untimed) when needed and reused once the
+      configuration is deleted.
+    """
+    def __init__(self, client, prefix):
+        super(PluginConfigurationWorkload, self).__init__(None, None, None)
+        self.client = client
+        self.prefix = prefix
+        self._api_ids = {}  # plugin configuration id -> API id
+        self._free_api_ids = []
+        self._all_api_ids = []
+
+    def _take_api(self):
+        with self._lock:
+            if self._free_api_ids:
+                return self._free_api_ids.pop()
+        number = self.next_number()
+        api = self.client.apis.create(
+            upstream_url='http://upstream.example.com/', name='%s-plugins-%d' % (self.prefix, number),
+            request_host='%s-plugins-%d.example.com' % (self.prefix, number))
+        with self._lock:
+            self._all_api_ids.append(api['id'])
+        return api['id']
+
+    def _created(self, api_id, configuration):
+        with self._lock:
+            self._api_ids[configuration['id']] = api_id
+        return self.add(configuration)
+
+    def _deleted(self, api_id):
+        with self._lock:
+            self._free_api_ids.append(api_id)
+
+    def prepare(self, operation, rng, page_size):
+        if operation != CREATE:
+            configuration_id = self.pick(rng, remove=operation == DELETE)
+            if configuration_id is not None:
+                with self._lock:
+                    api_id = self._api_ids[configuration_id]
+                admin = self.client.apis.plugins(api_id)
+                if operation == LIST:
+                    return LIST, self.using(configuration_id, lambda: admin.list(size=page_size))
+                elif operation == RETRIEVE:
+                    return RETRIEVE, self.using(configuration_id, lambda: admin.retrieve(configuration_id))
+                elif operation == UPDATE:
+                    second = rng.randint(1, 1000)
+                    return UPDATE, self.using(configuration_id, lambda: admin.update(configuration_id, second=second))
+                return DELETE, lambda: (admin.delete(configuration_id), self._deleted(api_id))
+
+        api_id = self._take_api()
+        admin = self.client.apis.plugins(api_id)
+        second = rng.randint(1, 1000)
+        return CREATE, lambda: self._created(api_id, admin.create('rate-limiting', second=second))
+
+    def cleanup(self):
+        for api_id in self._all_api_ids:
+            self.client.apis.delete(api_id)
+        self._all_api_ids = []
+        self._ids = []
+
+
+class Benchmark(object):
+    """
+    Drives a weighted mix of operations on one or more resources through a ``KongAdminClient``, from ``concurrency``
+      threads, until ``duration`` seconds have passed or ``max_operations`` operations have run.
+
+    Credentials are created for a consumer, and plugin configurations for APIs, that are set up before the benchmark
+      starts. All entities the benchmark created are deleted by ``cleanup``.
+
+    :type client: kong.client.KongAdminClient
+    :param resources: Resources to run operations on, out of ``RESOURCES``
+    :param mix: Weight of every operation, see ``parse_mix``
+    :type mix: list
+    :param concurrency: Amount of threads
+    :param duration: Maximum amount of seconds to run
+    :param rate: Maximum amount of operations per second, over all threads (unlimited if None)
+    :param max_operations: Maximum amount of operations to run (unlimited if None)
+    :param seed_entities: Amount of entities created per resource before the benchmark starts, so there is something
+        to retrieve, update and delete
+    :param page_size: Size of the pages of list operations
+    :param random_seed: Seeds the choice of operations and entities
+    """
+    def __init__(self, client, resources=RESOURCES, mix=None, concurrency=4, duration=10.0, rate=None,
+                 max_operations=None, seed_entities=20, page_size=100, random_seed=None):
+        assert concurrency >= 1 and (duration or max_operations), 'either a duration or max_operations is required'
+        unknown = set(resources) - set(RESOURCES)
+        assert not unknown, 'unknown resources: %r' % sorted(unknown)
+
+        self.client = client
+        self.resources = list(resources)
+        self.mix = mix or parse_mix(DEFAULT_MIX)
+        self.concurrency = concurrency
+        self.duration = duration
+        self.rate = rate
+        self.max_operations = max_operations
+        self.seed_entities = seed_entities
+        self.page_size = page_size
+        self.random_seed = random_seed
+        self.prefix = 'kong-bench-%s' % uuid.uuid4().hex[:8]
+
+        self._lock = threading.Lock()
+        self._latencies = {}  # resource.operation -> list
+        self._errors = {}  # resource.operation -> {error: count}
+        self._operations = 0
+        self._consumer = None
+        self.workloads = {}
+
+    def setup(self):
+        """
+        Creates the consumer the credentials belong to, and the initial entities of every resource.
+        """
+        prefix = self.prefix
+        consumers = self.client.consumers
+        if set(self.resources) & set([KEY_AUTH, BASIC_AUTH, OAUTH2]):
+            self._consumer = consumers.create(username=prefix, custom_id=prefix)
+            consumer_id = self._consumer['id']
+
+        for resource in self.resources:
+            if resource == APIS:
+                workload = ResourceWorkload(
+                    self.client.apis,
+                    lambda n: {'upstream_url': 'http://upstream.example.com/', 'name': '%s-api-%d' % (prefix, n),
+                               'request_host': '%s-api-%d.example.com' % (prefix, n)},
+                    lambda n: {'upstream_url': 'http://upstream-%d.example.com/' % n})
+            elif resource == CONSUMERS:
+                workload = ResourceWorkload(
+                    consumers,
+                    lambda n: {'username': '%s-consumer-%d' % (prefix, n), 'custom_id': '%s-%d' % (prefix, n)},
+                    lambda n: {'custom_id': '%s-updated-%d' % (prefix, n)})
+            elif resource == KEY_AUTH:
+                workload = ResourceWorkload(
+                    consumers.key_auth(consumer_id),
+                    lambda n: {'key': '%s-key-%d' % (prefix, n)},
+                    lambda n: {'key': '%s-key-updated-%d' % (prefix, n)})
+            elif resource == BASIC_AUTH:
+                workload = ResourceWorkload(
+                    consumers.basic_auth(consumer_id),
+                    lambda n: {'username': '%s-user-%d' % (prefix, n), 'password': 'secret'},
+                    lambda n: {'password': 'secret-%d' % n})
+            elif resource == OAUTH2:
+                workload = ResourceWorkload(
+                    consumers.oauth2(consumer_id),
+                    lambda n: {'name': '%s-app-%d' % (prefix, n),
+                               'redirect_uri': 'http://%s-app-%d.example.com/' % (prefix, n)},
+                    lambda n: {'redirect_uri': 'http://%s-app-updated-%d.example.com/' % (prefix, n)})
+            else:
+                workload = PluginConfigurationWorkload(self.client, prefix)
+            self.workloads[resource] = workload
+
+            rng = random.Random(self.random_seed)
+            for _ in range(self.seed_entities):
+                workload.prepare(CREATE, rng, self.page_size)[1]()
+
+    def cleanup(self):
+        for workload in self.workloads.values():
+            workload.cleanup()
+        if self._consumer is not None:
+            self.client.consumers.delete(self._consumer['id'])
+            self._consumer = None
+
+    def _next_operation(self):
+        with self._lock:
+            if self.max_operations is not None and self._operations >= self.max_operations:
+                return False
+            self._operations += 1
+            return True
+
+    def _record(self, key, latency, error=None):
+        with self._lock:
+            self._latencies.setdefault(key, []).append(latency)
+            if error is not None:
+                errors = self._errors.setdefault(key, {})
+                errors[error] = errors.get(error, 0) + 1
+
+    def _work(self, index, deadline, bucket):
+        rng = random.Random(None if self.random_seed is None else self.random_seed + index)
+        operations = [operation for operation, _ in self.mix]
+        weights = []
+        for _, weight in self.mix:
+            weights.append(weight + (weights[-1] if weights else 0))
+
+        while (deadline is None or monotonic() < deadline) and self._next_operation():
+            if bucket is not None:
+                bucket.acquire()
+
+            resource = rng.choice(self.resources)
+            workload = self.workloads[resource]
+            target = rng.random() * weights[-1]
+            operation = operations[next(i for i, total in enumerate(weights) if target < total)]
+            try:
+                operation, call = workload.prepare(operation, rng, self.page_size)
+            except Exception:
+                # Setting up the operation failed; it is not part of the measurements
+                continue
+
+            started_at = monotonic()
+            error = None
+            try:
+                call()
+            except Exception as e:
+                error = e.__class__.__name__
+            self._record('%s.%s' % (resource, operation), monotonic() - started_at, error=error)
+
+    def run(self):
+        """
+        Runs the benchmark. Call ``setup`` first.
+
+        :rtype: dict
+        :return: The results, see ``report``
+        """
+        bucket = TokenBucket(self.rate, capacity=1) if self.rate else None
+        started_at = monotonic()
+        deadline = started_at + self.duration if self.duration else None
+
+        threads = [threading.Thread(target=self._work, args=(index, deadline, bucket), name='kong-bench-%d' % index)
+                   for index in range(self.concurrency)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return self.results(monotonic() - started_at)
+
+    def results(self, elapsed):
+        """
+        :param elapsed: Amount of seconds the benchmark ran
+        :rtype: dict
+        :return: Dictionary containing the amount of operations and errors, the throughput (operations per second) and
+            latency summary (see ``summarize_latencies``) overall and by operation, and the errors by operation and
+            error class
+        """
+        with self._lock:
+            latencies = dict((key, list(values)) for key, values in self._latencies.items())
+            errors = dict((key, dict(values)) for key, values in self._errors.items())
+
+        operations = sum(len(values) for values in latencies.values())
+        by_operation = {}
+        for key, values in latencies.items():
+            by_operation[key] = dict(summarize_latencies(values), operations=len(values),
+                                     errors=sum(errors.get(key, {}).values()))
+
+        return {
+            'duration': elapsed,
+            'concurrency': self.concurrency,
+            'operations': operations,
+            'errors': sum(sum(values.values()) for values in errors.values()),
+            'throughput': operations / elapsed if elapsed > 0 else 0.0,
+            'latency': summarize_latencies(list(itertools.chain.from_iterable(latencies.values()))),
+            'by_operation': by_operation,
+            'errors_by_operation': errors,
+        }
+
+
+def _format_ms(value):
+    return '-' if value is None else '%.2f' % (value * 1000)
+
+
+def format_report(results):
+    """
+    :param results: Results of ``Benchmark.run``
+    :type results: dict
+    :rtype: six.text_type
+    :return: Human readable report of the results
+    """
+    latency = results['latency']
+    lines = [
+        '%d operations in %.2fs with %d threads: %.1f ops/s, %d errors' % (
+            results['operations'], results['duration'], results['concurrency'], results['throughput'],
+            results['errors']),
+        'Latency (ms): p50 %s, p95 %s, p99 %s, max %s' % tuple(
+            _format_ms(latency[key]) for key in ('p50', 'p95', 'p99', 'max')),
+        '',
+        '%-24s %8s %8s %9s %9s %9s %9s' % ('Operation', 'Count', 'Errors', 'p50 (ms)', 'p95 (ms)', 'p99 (ms)',
+                                           'max (ms)'),
+    ]
+    for key, summary in sorted(results['by_operation'].items()):
+        lines.append('%-24s %8d %8d %9s %9s %9s %9s' % (
+            key, summary['operations'], summary['errors'], _format_ms(summary['p50']), _format_ms(summary['p95']),
+            _format_ms(summary['p99']), _format_ms(summary['max'])))
+
+    if results['errors_by_operation']:
+        lines.append('')
+        lines.append('Errors:')
+        for key, errors in sorted(results['errors_by_operation'].items()):
+            for error, count in sorted(errors.items()):
+                lines.append('  %-22s %-30s %d' % (key, error, count))
+    return '\n'.join(lines) + '\n'
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Drives a mix of operations through KongAdminClient, and reports throughput and latencies.')
+    parser.add_argument('--url', action='append', dest='urls', metavar='URL',
+                        help='base URL of the admin API; repeat it to spread requests over several nodes')
+    parser.add_argument('--stand-in', choices=STAND_INS, default=SERVER,
+                        help='simulator to run against without --url: served over HTTP by a local server, or '
+                             'answered in-process by a transport adapter (default: %(default)s)')
+    parser.add_argument('--resources', default=','.join(RESOURCES),
+                        help='comma separated resources to operate on (default: %(default)s)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='weights of the operations (default: %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=4, help='amount of threads (default: %(default)s)')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds to run (default: %(default)s)')
+    parser.add_argument('--operations', type=int, help='stop after this amount of operations')
+    parser.add_argument('--rate', type=float, help='maximum amount of operations per second')
+    parser.add_argument('--seed-entities', type=int, default=20,
+                        help='entities created per resource before starting (default: %(default)s)')
+    parser.add_argument('--page-size', type=int, default=100, help='size of listed pages (default: %(default)s)')
+    parser.add_argument('--random-seed', type=int, help='seeds the choice of operations')
+    parser.add_argument('--json', metavar='PATH', help='write the results as JSON to PATH ("-" for stdout)')
+    options = parser.parse_args(args)
+
+    try:
+        mix = parse_mix(options.mix)
+    except ValueError as e:
+        parser.error(e)
+    resources = [resource.strip() for resource in options.resources.split(',') if resource.strip()]
+    for resource in resources:
+        if resource not in RESOURCES:
+            parser.error('unknown resource %r, expected one of %s' % (resource, ', '.join(RESOURCES)))
+
+    server = None
+    pool_size = max(10, options.concurrency)
+    if options.urls:
+        client = KongAdminClient(options.urls if len(options.urls) > 1 else options.urls[0], pool_maxsize=pool_size)
+    elif options.stand_in == SERVER:
+        server = SimulatorServer().start()
+        client = KongAdminClient(server.url, pool_maxsize=pool_size)
+    else:
+        client = KongAdminClient(ADAPTER_URL, pool_maxsize=pool_size)
+        client.session.mount(ADAPTER_URL, SimulatorHTTPAdapter())
+
+    benchmark = Benchmark(client, resources=resources, mix=mix, concurrency=options.concurrency,
+                          duration=options.duration, rate=options.rate, max_operations=options.operations,
+                          seed_entities=options.seed_entities, page_size=options.page_size,
+                          random_seed=options.random_seed)
+    try:
+        benchmark.setup()
+        results = benchmark.run()
+    finally:
+        benchmark.cleanup()
+        client.close()
+        if server is not None:
+            server.stop()
+
+    if options.json == '-':
+        print(json.dumps(results, indent=2, sort_keys=True))
+    else:
+        sys.stdout.write(format_report(results))
+        if options.json:
+            with open(options.json, 'w') as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
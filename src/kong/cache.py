@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import copy
+import threading
+
+import six
+
+from .compat import OrderedDict
+from .ratelimit import monotonic
+
+
+class EntityCache(object):
+    """
+    Thread-safe LRU cache with a time-to-live, for entities retrieved from the admin API.
+
+    Every entity is stored once, under its ``id``, and can additionally be found through any amount of aliases (like
+      the name of an API or the username of a consumer). Invalidating an entity by id or by any of its aliases removes
+      it entirely.
+
+    :param max_size: Maximum amount of entities kept in the cache
+    :type max_size: int
+    :param ttl: Amount of seconds an entity stays valid
+    :type ttl: float
+    """
+    def __init__(self, max_size=1000, ttl=60, clock=monotonic):
+        assert max_size > 0
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # id -> (expires_at, entity, aliases)
+        self._aliases = {}  # alias -> id
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        :param key: The id or any alias of the entity
+        :rtype: dict
+        :return: A copy of the cached entity, or None if it is unknown or expired
+        """
+        # Like get_url, accept any key (like the id of an entity as an int, or a UUID)
+        key = six.text_type(key)
+
+        with self._lock:
+            entity_id = key if key in self._entries else self._aliases.get(key)
+            entry = self._entries.pop(entity_id, None) if entity_id is not None else None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, entity, aliases = entry
+            if expires_at <= self._clock():
+                self._forget_aliases(entity_id, aliases)
+                self.misses += 1
+                self.evictions += 1
+                return None
+
+            # Re-insert, to mark the entry as most recently used
+            self._entries[entity_id] = entry
+            self.hits += 1
+            return copy.deepcopy(entity)
+
+    def put(self, entity, *aliases):
+        """
+        :param entity: The entity to cache. It should contain an ``id``.
+        :type entity: dict
+        :param aliases: Alternative keys the entity can be found by. ``None`` values are ignored.
+        """
+        entity_id = entity['id']
+        aliases = tuple(alias for alias in aliases if alias is not None)
+
+        with self._lock:
+            self._remove(entity_id)
+            for alias in aliases:
+                self._remove(self._aliases.get(alias))
+
+            self._entries[entity_id] = (self._clock() + self.ttl, copy.deepcopy(entity), aliases)
+            for alias in aliases:
+                self._aliases[alias] = entity_id
+
+            while len(self._entries) > self.max_size:
+                oldest_id = next(iter(self._entries))
+                self._remove(oldest_id)
+                self.evictions += 1
+
+    def invalidate(self, *keys):
+        """
+        :param keys: Ids or aliases of entities to remove from the cache. ``None`` values are ignored.
+        """
+        with self._lock:
+            for key in keys:
+                if key is None:
+                    continue
+                key = six.text_type(key)
+                self._remove(key if key in self._entries else self._aliases.get(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+
+    def stats(self):
+        """
+        :rtype: dict
+        :return: Dictionary containing the size of the cache and its hit, miss and eviction counters
+        """
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _remove(self, entity_id):
+        if entity_id is None:
+            return
+        entry = self._entries.pop(entity_id, None)
+        if entry is not None:
+            self._forget_aliases(entity_id, entry[2])
+
+    def _forget_aliases(self, entity_id, aliases):
+        for alias in aliases:
+            if self._aliases.get(alias) == entity_id:
+                del self._aliases[alias]
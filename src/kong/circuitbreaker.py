@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import threading
+from collections import deque
+
+from .compat import urlparse
+from .exceptions import CircuitOpenError
+from .ratelimit import monotonic
+from .retry import RETRYABLE_ERRORS
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker(object):
+    """
+    Thread-safe circuit breaker for a single Kong node.
+
+    While the circuit is closed, the outcome of the last ``window_size`` calls is recorded. Once at least
+      ``minimum_calls`` have been recorded, the circuit opens when the share of failed calls reaches
+      ``failure_rate_threshold``, or when the share of calls that took ``slow_call_duration`` or longer reaches
+      ``slow_call_rate_threshold``. While the circuit is open, calls fail immediately with a ``CircuitOpenError``.
+
+    After ``open_duration`` seconds the circuit becomes half-open: ``half_open_calls`` trial calls are let through
+      (other calls keep failing fast), and the circuit closes or opens again depending on their outcome.
+
+    :param failure_rate_threshold: Share of failed calls (between 0 and 1) that opens the circuit
+    :type failure_rate_threshold: float
+    :param slow_call_rate_threshold: Share of slow calls (between 0 and 1) that opens the circuit
+    :type slow_call_rate_threshold: float
+    :param slow_call_duration: Amount of seconds after which a call is considered slow
+    :type slow_call_duration: float
+    :param window_size: Amount of most recent calls the rates are computed over
+    :type window_size: int
+    :param minimum_calls: Amount of calls that has to be recorded before the circuit can open
+    :type minimum_calls: int
+    :param open_duration: Amount of seconds the circuit stays open before trial calls are let through
+    :type open_duration: float
+    :param half_open_calls: Amount of trial calls made while the circuit is half-open
+    :type half_open_calls: int
+    """
+    def __init__(self, failure_rate_threshold=0.5, slow_call_rate_threshold=1.0, slow_call_duration=5.0,
+                 window_size=20, minimum_calls=10, open_duration=30.0, half_open_calls=3, clock=monotonic):
+        assert 0 < failure_rate_threshold <= 1 and 0 < slow_call_rate_threshold <= 1
+        assert 1 <= minimum_calls <= window_size and half_open_calls >= 1
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.window_size = window_size
+        self.minimum_calls = minimum_calls
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._state = CLOSED
+        self._opened_at = None
+        self._outcomes = deque()  # (failed, slow)
+        self._failures = 0
+        self._slow_calls = 0
+        self._trials_started = 0
+
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def clock(self):
+        return self._clock
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._get_state()
+
+    def acquire(self):
+        """
+        Registers the start of a call.
+
+        :raises CircuitOpenError: If the circuit is open, or half-open and all trial calls have been started
+        """
+        with self._lock:
+            state = self._get_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._trials_started < self.half_open_calls:
+                self._trials_started += 1
+                return
+
+            self.rejected += 1
+            remaining = max(0.0, self._opened_at + self.open_duration - self._clock())
+            raise CircuitOpenError('Circuit is %s, retry in %.1f seconds' % (state, remaining), remaining)
+
+    def release(self, duration, failed):
+        """
+        Records the outcome of a call that was started with ``acquire``.
+
+        :param duration: Amount of seconds the call took
+        :type duration: float
+        :param failed: Whether the call failed
+        :type failed: bool
+        """
+        with self._lock:
+            if self._state == OPEN:
+                # The call was started before the circuit opened
+                return
+
+            self._outcomes.append((bool(failed), duration >= self.slow_call_duration))
+            self._failures += bool(failed)
+            self._slow_calls += duration >= self.slow_call_duration
+
+            if self._state == HALF_OPEN:
+                if len(self._outcomes) >= self.half_open_calls:
+                    if self._exceeds_thresholds():
+                        self._open()
+                    else:
+                        self._close()
+                return
+
+            if len(self._outcomes) > self.window_size:
+                old_failed, old_slow = self._outcomes.popleft()
+                self._failures -= old_failed
+                self._slow_calls -= old_slow
+
+            if self._state == CLOSED and len(self._outcomes) >= self.minimum_calls and self._exceeds_thresholds():
+                self._open()
+
+    def stats(self):
+        """
+        :rtype: dict
+        :return: Dictionary containing the state of the circuit, the failure and slow call rates over the current
+            window, and the amount of calls that were rejected and of times the circuit opened
+        """
+        with self._lock:
+            calls = len(self._outcomes)
+            return {
+                'state': self._get_state(),
+                'calls': calls,
+                'failure_rate': float(self._failures) / calls if calls else 0.0,
+                'slow_call_rate': float(self._slow_calls) / calls if calls else 0.0,
+                'rejected': self.rejected,
+                'times_opened': self.times_opened,
+            }
+
+    def _get_state(self):
+        if self._state == OPEN and self._clock() >= self._opened_at + self.open_duration:
+            self._state = HALF_OPEN
+            self._reset_window()
+        return self._state
+
+    def _exceeds_thresholds(self):
+        calls = float(len(self._outcomes))
+        return (self._failures / calls >= self.failure_rate_threshold or
+                self._slow_calls / calls >= self.slow_call_rate_threshold)
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self.times_opened += 1
+        self._reset_window()
+
+    def _close(self):
+        self._state = CLOSED
+        self._opened_at = None
+        self._reset_window()
+
+    def _reset_window(self):
+        self._outcomes.clear()
+        self._failures = 0
+        self._slow_calls = 0
+        self._trials_started = 0
+
+
+class NodeCircuitBreaker(object):
+    """
+    Maintains a separate ``CircuitBreaker`` for every host, so a failing Kong node does not cut off the others.
+
+    Calls fail when they raise a connection error or a timeout, or when Kong responds with a 5xx status code.
+
+    :param options: Passed on to every ``CircuitBreaker``
+    """
+    def __init__(self, **options):
+        self.options = options
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get_breaker(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(**self.options)
+            return breaker
+
+    def call(self, url, send):
+        """
+        Sends a request through ``requests``, unless the circuit of its host is open.
+
+        :param url: URL of the request
+        :param send: Callable without arguments that sends the request
+        :rtype: requests.Response
+        :raises CircuitOpenError: If the circuit of the host is open
+        """
+        breaker = self.get_breaker(url)
+        breaker.acquire()
+
+        started_at = breaker.clock()
+        try:
+            response = send()
+        except RETRYABLE_ERRORS:
+            breaker.release(breaker.clock() - started_at, failed=True)
+            raise
+        except Exception:
+            breaker.release(breaker.clock() - started_at, failed=False)
+            raise
+
+        breaker.release(breaker.clock() - started_at, failed=is_failure_status(response.status_code))
+        return response
+
+    def stats(self):
+        """
+        :rtype: dict
+        :return: The statistics of the circuit breaker of every host
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return dict((host, breaker.stats()) for host, breaker in breakers.items())
+
+
+def is_failure_status(status_code):
+    """
+    :rtype: bool
+    :return: Whether a response with this status code indicates that the node is failing
+    """
+    return status_code >= 500
@@ -1,21 +1,35 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals, print_function
-import time
 import os
 import copy
 
 import requests
-import backoff
 
-from requests.adapters import HTTPAdapter
 import six
 
-from constants import APIS, PLUGINS, CONSUMERS, KEY_AUTH, BASIC_AUTH, OAUTH2
+from .constants import APIS, PLUGINS, CONSUMERS, KEY_AUTH, BASIC_AUTH, OAUTH2
 from .contract import KongAdminContract, APIAdminContract, ConsumerAdminContract, PluginAdminContract, \
     APIPluginConfigurationAdminContract, BasicAuthAdminContract, KeyAuthAdminContract, OAuth2AdminContract
-from .utils import add_url_params, assert_dict_keys_in, ensure_trailing_slash
-from .compat import OK, CREATED, NO_CONTENT, NOT_FOUND, CONFLICT, INTERNAL_SERVER_ERROR, urljoin, utf8_or_str
-from .exceptions import ConflictError, ServerError
+from .utils import add_url_params, ensure_trailing_slash
+from .compat import OK, CREATED, NO_CONTENT, NOT_FOUND, utf8_or_str, urljoin
+from .ratelimit import RateLimiter, RateLimitingHTTPAdapter, monotonic
+from .cache import EntityCache
+from .concurrency import SingleFlight
+from .streaming import StreamingPage
+from .codec import get_codec
+from .retry import RetryPolicy, RetryBudget
+from .balancer import LoadBalancer, LEAST_OUTSTANDING, READ_METHODS
+from .metrics import RequestMetrics, ConnectionTrackingHTTPAdapter, describe_request
+from .tracing import TRACEPARENT_HEADER, traced
+from .profiling import profiled, URL_BUILDING, HEADERS, TRANSPORT, DECODE
+from .validation import API_UPDATE_FIELDS, API_FILTER_FIELDS, PLUGIN_CONFIGURATION_FILTER_FIELDS, \
+    CONSUMER_UPDATE_FIELDS, CONSUMER_FILTER_FIELDS, BASIC_AUTH_UPDATE_FIELDS, BASIC_AUTH_FILTER_FIELDS, \
+    KEY_AUTH_UPDATE_FIELDS, KEY_AUTH_FILTER_FIELDS, OAUTH2_UPDATE_FIELDS, OAUTH2_FILTER_FIELDS, URLBuilderMixin, \
+    assert_valid_fields, get_error_class
+from .validation import INVALID_FIELD_ERROR_TEMPLATE  # noqa: F401 (importable from here, as before)
+
+# Amount of seconds a node gets to respond to a health check
+HEALTH_CHECK_TIMEOUT = 2.0
 
 # WTF: As this is CI/Test specific, maybe better to only have this piece of code in your tests directory?
 
@@ -41,22 +55,9 @@ def get_default_kong_headers():
     return headers
 
 
-class ThrottlingHTTPAdapter(HTTPAdapter):
-    def __init__(self, *args, **kwargs):
-        super(ThrottlingHTTPAdapter, self).__init__(*args, **kwargs)
-        self._last_request = None
-
-    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
-        if self._last_request is not None and KONG_MINIMUM_REQUEST_INTERVAL > 0:
-            diff = (self._last_request + KONG_MINIMUM_REQUEST_INTERVAL) - time.time()
-            if diff > 0:
-                time.sleep(diff)
-        result = super(ThrottlingHTTPAdapter, self).send(request, stream, timeout, verify, cert, proxies)
-        self._last_request = time.time()
-        return result
-
-# Create a singleton
-THROTTLING_ADAPTER = ThrottlingHTTPAdapter()
+# Process-wide rate limiter that enforces KONG_MINIMUM_REQUEST_INTERVAL (if any)
+KONG_RATE_LIMITER = RateLimiter(rate=1.0 / KONG_MINIMUM_REQUEST_INTERVAL, burst=1) \
+    if KONG_MINIMUM_REQUEST_INTERVAL > 0 else None
 
 ########################################################################################################################
 # END: CI fixes
@@ -68,51 +69,331 @@ def raise_response_error(response, exception_class=None):
     assert issubclass(exception_class, BaseException)
     raise exception_class(response.content)
 
-INVALID_FIELD_ERROR_TEMPLATE = '%r is not a valid field. Allowed fields: %r'
 
-
-class RestClient(object):
-    def __init__(self, api_url, headers=None):
+def check_response(response, expected_status_codes=(OK,), conflict=False):
+    """
+    Raises the exception that ``kong.validation.get_error_class`` maps the status code of ``response`` to, if any.
+    """
+    error_class = get_error_class(response.status_code, expected_status_codes, conflict=conflict)
+    if error_class is not None:
+        raise_response_error(response, error_class)
+
+
+def create_session(pool_connections=10, pool_maxsize=10, pool_block=False, rate_limiter=None):
+    """
+    Creates a ``requests.Session`` with a connection pool that can be shared by several ``RestClient`` instances.
+
+    :param pool_connections: The number of per-host connection pools to cache
+    :param pool_maxsize: The maximum number of connections to keep per host
+    :param pool_block: Whether the pool should block when no free connections are available, instead of opening
+        (and afterwards discarding) an extra connection
+    :param rate_limiter: Throttles all requests sent through the session. Defaults to ``KONG_RATE_LIMITER``.
+    :type rate_limiter: kong.ratelimit.RateLimiter
+    :rtype: requests.Session
+    """
+    rate_limiter = rate_limiter or KONG_RATE_LIMITER
+    pool_kwargs = dict(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+
+    if rate_limiter is not None:
+        adapter = RateLimitingHTTPAdapter(rate_limiter, **pool_kwargs)
+    else:
+        adapter = ConnectionTrackingHTTPAdapter(**pool_kwargs)
+
+    session = requests.session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class RestClient(URLBuilderMixin):
+    """
+    :param api_url: Base URL of the Kong admin API
+    :param headers: Headers that are sent along with every request
+    :param session: When given, this (shared) session is used instead of a private one. Shared sessions are owned by
+        the caller, and are not closed when the client is destroyed.
+    :param single_flight: When given, concurrent identical GET requests are coalesced into a single request, whose
+        response is handed to all callers
+    :type single_flight: kong.concurrency.SingleFlight
+    :param codec: Decodes response bodies. See ``kong.codec.get_codec`` for the accepted values.
+    :type codec: kong.codec.JSONCodec | six.text_type
+    :param retry_policy: Decides which failed requests are retried, and when. Defaults to a policy without a retry
+        budget.
+    :type retry_policy: kong.retry.RetryPolicy
+    :param circuit_breaker: When given, requests to a failing Kong node fail fast with a ``CircuitOpenError``
+    :type circuit_breaker: kong.circuitbreaker.NodeCircuitBreaker
+    :param balancer: When given, requests are spread over the nodes of the balancer. URLs are built relative to
+        ``api_url``, which should be the URL of its preferred node.
+    :type balancer: kong.balancer.LoadBalancer
+    :param hedging: When given, slow reads are hedged with a duplicate request
+    :type hedging: kong.hedging.HedgingPolicy
+    :param request_hooks: Callables that are called with the ``kong.metrics.RequestMetrics`` of every request
+    :type request_hooks: list
+    :param timeout: Timeout of every request, in seconds, or a ``(connect timeout, read timeout)`` tuple. None waits
+        forever.
+    :type timeout: float | tuple
+    :param tracer: When given, method calls, requests, attempts and JSON decoding are wrapped in spans
+    :type tracer: kong.tracing.Tracer
+    :param profiler: When given, the time spent in method calls is attributed to URL building, header merge,
+        transport, JSON decode and dispatch
+    :type profiler: kong.profiling.Profiler
+    """
+    def __init__(self, api_url, headers=None, session=None, single_flight=None, codec=None, retry_policy=None,
+                 circuit_breaker=None, balancer=None, hedging=None, request_hooks=None, timeout=None, tracer=None,
+                 profiler=None):
         self.api_url = api_url
         self.headers = headers
-        self._session = None
+        self.single_flight = single_flight
+        self.codec = get_codec(codec)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.balancer = balancer
+        self.hedging = hedging
+        self.request_hooks = list(request_hooks or [])
+        self.timeout = timeout
+        self.tracer = tracer
+        self.profiler = profiler
+        self._session = session
+        self._owns_session = session is None
+        self._url_builder = None
 
     def destroy(self):
         self.api_url = None
         self.headers = None
+        self.single_flight = None
 
-        if self._session is not None:
+        if self._session is not None and self._owns_session:
             self._session.close()
         self._session = None
 
     @property
     def session(self):
+        if not self._owns_session:
+            return self._session
+
         if self._session is None:
-            self._session = requests.session()
-            if KONG_MINIMUM_REQUEST_INTERVAL > 0:
-                self._session.mount(self.api_url, THROTTLING_ADAPTER)
+            self._session = create_session()
         elif not KONG_REUSE_CONNECTIONS:
             self._session.close()
             self._session = None
             return self.session
         return self._session
 
+    def get_shared_options(self):
+        """
+        :rtype: dict
+        :return: Keyword arguments for the clients this client hands out, so they share its session and settings
+        """
+        return {
+            'session': self.session,
+            'single_flight': self.single_flight,
+            'codec': self.codec,
+            'retry_policy': self.retry_policy,
+            'circuit_breaker': self.circuit_breaker,
+            'balancer': self.balancer,
+            'hedging': self.hedging,
+            'request_hooks': self.request_hooks,
+            'timeout': self.timeout,
+            'tracer': self.tracer,
+            'profiler': self.profiler,
+        }
+
+    def request(self, method, url, idempotent=None, operation=None, **kwargs):
+        """
+        Sends a request to the admin API, along with the client's headers. Failed requests are retried according to
+          the client's retry policy. Every attempt is sent to a node picked by the balancer, if any, and passes the
+          circuit breaker, if any, so retries stop as soon as the circuit of the node opens. Slow reads are hedged when
+          the client has a hedging policy. Once the request completes (or fails), its ``RequestMetrics`` are handed to
+          every request hook. When the client has a tracer, the request and each of its attempts are wrapped in a span.
+
+        :param method: HTTP method, like ``'GET'``
+        :param url: Absolute URL, usually built by ``get_url``
+        :param idempotent: Overrides whether the retry policy considers the request idempotent
+        :type idempotent: bool
+        :param operation: Name of the operation reported to the request hooks, like ``'count'``. Derived from the
+            method and the URL by default (see ``kong.metrics.describe_request``).
+        :param kwargs: Passed on to the session
+        :rtype: requests.Response
+        """
+        headers = self.get_headers(**kwargs.pop('headers', {}))
+        stream = kwargs.pop('stream', False)
+        send = getattr(self.session, method.lower())
+        tracer = self.tracer
+        request_span = None
+        attempts = []
+
+        def _send_directly(node_url, attempt_headers):
+            if self.circuit_breaker is not None:
+                return self.circuit_breaker.call(node_url, lambda: send(
+                    node_url, headers=attempt_headers, stream=stream, timeout=self.timeout, **kwargs))
+            return send(node_url, headers=attempt_headers, stream=stream, timeout=self.timeout, **kwargs)
+
+        def _send_to(node_url):
+            if tracer is None:
+                return _send_directly(node_url, headers)
+
+            # Hedged attempts run in other threads, so the parent has to be passed explicitly
+            span = tracer.start_span('kong.attempt', parent=request_span, method=method, url=node_url,
+                                     attempt=len(attempts))
+            attempt_headers = headers
+            if tracer.propagate:
+                attempt_headers = dict(headers, **{TRACEPARENT_HEADER: span.traceparent})
+            try:
+                response = _send_directly(node_url, attempt_headers)
+            except BaseException as e:
+                tracer.finish_span(span, error=e)
+                raise
+            span.set_attribute('status_code', response.status_code)
+            tracer.finish_span(span)
+            return response
+
+        def _send_once():
+            if self.balancer is not None:
+                return self.balancer.call(method, url, _send_to)
+            return _send_to(url)
+
+        def _attempt():
+            attempts.append(None)
+            if self.hedging is not None and method in READ_METHODS:
+                return self.hedging.call(_send_once)
+            return _send_once()
+
+        def _send_with_policies():
+            # Streamed responses can only be consumed once, so they are never shared
+            if method == 'GET' and self.single_flight is not None and not stream and not kwargs:
+                return self.single_flight.do(
+                    (url, tuple(sorted(headers.items()))),
+                    lambda: self.retry_policy.call(method, _attempt, idempotent=idempotent))
+            return self.retry_policy.call(method, _attempt, idempotent=idempotent)
+
+        def _send():
+            if self.profiler is None:
+                return _send_with_policies()
+            with self.profiler.phase(TRANSPORT):
+                return _send_with_policies()
+
+        def _send_and_report():
+            if not self.request_hooks:
+                return _send()
+
+            started_at = monotonic()
+            try:
+                response = _send()
+            except Exception as e:
+                self._report(method, url, operation, started_at, attempts, error=e)
+                raise
+            self._report(method, url, operation, started_at, attempts, response=response, stream=stream)
+            return response
+
+        if tracer is None:
+            return _send_and_report()
+
+        with tracer.span('kong.request', method=method, url=url) as request_span:
+            response = _send_and_report()
+            request_span.set_attribute('status_code', response.status_code)
+            request_span.set_attribute('retries', max(0, len(attempts) - 1))
+            return response
+
+    def _report(self, method, url, operation, started_at, attempts, response=None, error=None, stream=False):
+        resource, default_operation = describe_request(method, url)
+        metrics = RequestMetrics(resource, operation or default_operation, method, url,
+                                 latency=monotonic() - started_at, retries=max(0, len(attempts) - 1))
+
+        if response is None:
+            metrics.error = error.__class__.__name__
+        else:
+            metrics.status_code = response.status_code
+            body = getattr(getattr(response, 'request', None), 'body', None)
+            metrics.request_bytes = len(body) if body else 0
+            if not stream:
+                metrics.response_bytes = len(response.content)
+            elif 'Content-Length' in response.headers:
+                metrics.response_bytes = int(response.headers['Content-Length'])
+            metrics.connection_reused = getattr(response, 'connection_reused', None)
+
+        for hook in self.request_hooks:
+            hook(metrics)
+
+    def count_collection(self, url, estimate=False):
+        """
+        Reads the amount of objects in the collection at ``url`` from the ``total`` of a page containing a single
+          object. When Kong does not report the total, the collection is counted by paging through it.
+
+        :param url: URL of the collection
+        :param estimate: See ``CollectionMixin.count_by_paging``
+        :type estimate: bool
+        :rtype: int
+        """
+        if self.profiler is None:
+            url = add_url_params(url, {'size': 1})
+        else:
+            with self.profiler.phase(URL_BUILDING):
+                url = add_url_params(url, {'size': 1})
+        response = self.request('GET', url, operation='count')
+
+        check_response(response)
+
+        result = self.read_json(response)
+        if 'total' in result:
+            return result['total']
+        elif result.get('next') is None:
+            return len(result.get('data'))
+        return self.count_by_paging(estimate=estimate)
+
+    def read_page(self, response, stream=False):
+        """
+        :param response: Successful response of a ``list`` request
+        :type response: requests.Response
+        :param stream: Whether the request was sent with ``stream=True``
+        :type stream: bool
+        :rtype: dict | kong.streaming.StreamingPage
+        """
+        if stream:
+            return StreamingPage.from_response(response)
+        return self.read_json(response)
+
+    def read_json(self, response):
+        """
+        :param response: Successful response
+        :type response: requests.Response
+        :return: The decoded body of the response
+        """
+        if self.profiler is None:
+            return self._decode(response)
+        with self.profiler.phase(DECODE):
+            return self._decode(response)
+
+    def _decode(self, response):
+        if self.tracer is None:
+            return self.codec.loads(response.content)
+
+        with self.tracer.span('kong.decode', codec=self.codec.name) as span:
+            content = response.content
+            span.set_attribute('bytes', len(content))
+            return self.codec.loads(content)
+
     def get_headers(self, **headers):
+        if self.profiler is None:
+            return self._merge_headers(headers)
+        with self.profiler.phase(HEADERS):
+            return self._merge_headers(headers)
+
+    def _merge_headers(self, headers):
         result = {}
         result.update(self.headers)
         result.update(headers)
         return result
 
     def get_url(self, *path, **query_params):
-        # WTF: Never use str, unless in some very specific cases, like in compatibility layers! Fixed for you.
-        path = [six.text_type(p) for p in path]
-        url = ensure_trailing_slash(urljoin(self.api_url, '/'.join(path)))
-        return add_url_params(url, query_params)
+        if self.profiler is None:
+            return self.build_url(path, query_params)
+        with self.profiler.phase(URL_BUILDING):
+            return self.build_url(path, query_params)
 
 
-class APIPluginConfigurationAdminClient(APIPluginConfigurationAdminContract, RestClient):
-    def __init__(self, api_admin, api_name_or_id, api_url):
-        super(APIPluginConfigurationAdminClient, self).__init__(api_url, headers=get_default_kong_headers())
+class APIPluginConfigurationAdminClient(RestClient, APIPluginConfigurationAdminContract):
+    def __init__(self, api_admin, api_name_or_id, api_url, **options):
+        super(APIPluginConfigurationAdminClient, self).__init__(
+            api_url, headers=get_default_kong_headers(), **options)
 
         self.api_admin = api_admin
         self.api_name_or_id = api_name_or_id
@@ -122,6 +403,8 @@ class APIPluginConfigurationAdminClient(APIPluginConfigurationAdminContract, Res
         self.api_admin = None
         self.api_name_or_id = None
 
+    @profiled
+    @traced
     def create(self, plugin_name, enabled=None, consumer_id=None, **fields):
         values = {}
         for key in fields:
@@ -135,18 +418,14 @@ class APIPluginConfigurationAdminClient(APIPluginConfigurationAdminContract, Res
         if enabled is not None and isinstance(enabled, bool):
             data['enabled'] = enabled
 
-        response = self.session.post(self.get_url(APIS, self.api_name_or_id, PLUGINS), data=data,
-                                     headers=self.get_headers())
+        response = self.request('POST', self.get_url(APIS, self.api_name_or_id, PLUGINS), data=data)
 
-        if response.status_code == CONFLICT:
-            raise_response_error(response, ConflictError)
-        elif response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != CREATED:
-            raise_response_error(response, ValueError)
+        check_response(response, (CREATED,), conflict=True)
 
-        return response.json()
+        return self.read_json(response)
 
+    @profiled
+    @traced
     def create_or_update(self, plugin_name, plugin_configuration_id=None, enabled=None, consumer_id=None, **fields):
         values = {}
         for key in fields:
@@ -163,18 +442,14 @@ class APIPluginConfigurationAdminClient(APIPluginConfigurationAdminContract, Res
         if plugin_configuration_id is not None:
             data['id'] = plugin_configuration_id
 
-        response = self.session.put(self.get_url(APIS, self.api_name_or_id, PLUGINS), data=data,
-                                    headers=self.get_headers())
+        response = self.request('PUT', self.get_url(APIS, self.api_name_or_id, PLUGINS), data=data)
 
-        if response.status_code == CONFLICT:
-            raise_response_error(response, ConflictError)
-        elif response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code not in (CREATED, OK):
-            raise_response_error(response, ValueError)
+        check_response(response, (CREATED, OK), conflict=True)
 
-        return response.json()
+        return self.read_json(response)
 
+    @profiled
+    @traced
     def update(self, plugin_id, enabled=None, consumer_id=None, **fields):
         values = {}
         for key in fields:
@@ -190,18 +465,16 @@ class APIPluginConfigurationAdminClient(APIPluginConfigurationAdminContract, Res
 
         url = self.get_url(APIS, self.api_name_or_id, PLUGINS, plugin_id)
 
-        response = self.session.patch(url, data=data_struct_update, headers=self.get_headers())
+        response = self.request('PATCH', url, data=data_struct_update)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        return self.read_json(response)
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
-    def list(self, size=100, offset=None, **filter_fields):
-        assert_dict_keys_in(filter_fields, ['id', 'name', 'api_id', 'consumer_id'], INVALID_FIELD_ERROR_TEMPLATE)
+    @profiled
+    @traced
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
+        assert_valid_fields(filter_fields, PLUGIN_CONFIGURATION_FILTER_FIELDS)
 
         query_params = filter_fields
         query_params['size'] = size
@@ -210,86 +483,77 @@ class APIPluginConfigurationAdminClient(APIPluginConfigurationAdminContract, Res
             query_params['offset'] = offset
 
         url = self.get_url(APIS, self.api_name_or_id, PLUGINS, **query_params)
-        response = self.session.get(url, headers=self.get_headers())
+        response = self.request('GET', url, stream=stream)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        return self.read_page(response, stream)
 
-    @backoff.on_exception(backoff.expo, ValueError, max_tries=3)
+    @profiled
+    @traced
     def delete(self, plugin_id):
-        response = self.session.delete(self.get_url(APIS, self.api_name_or_id, PLUGINS, plugin_id),
-                                       headers=self.get_headers())
+        response = self.request('DELETE', self.get_url(APIS, self.api_name_or_id, PLUGINS, plugin_id))
 
         if response.status_code not in (NO_CONTENT, NOT_FOUND):
             raise ValueError('Could not delete Plugin Configuration (status: %s): %s' % (
                 response.status_code, plugin_id))
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
+    @profiled
+    @traced
     def retrieve(self, plugin_id):
-        response = self.session.get(self.get_url(APIS, self.api_name_or_id, PLUGINS, plugin_id),
-                                    headers=self.get_headers())
-
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
-
-        return response.json()
+        response = self.request('GET', self.get_url(APIS, self.api_name_or_id, PLUGINS, plugin_id))
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
-    def count(self):
-        response = self.session.get(self.get_url(APIS, self.api_name_or_id, PLUGINS), headers=self.get_headers())
+        check_response(response)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
+        return self.read_json(response)
 
-        result = response.json()
-        amount = result.get('total', len(result.get('data')))
-        return amount
+    @profiled
+    @traced
+    def count(self, estimate=False):
+        return self.count_collection(self.get_url(APIS, self.api_name_or_id, PLUGINS), estimate=estimate)
 
 
-class APIAdminClient(APIAdminContract, RestClient):
-    def __init__(self, api_url):
-        super(APIAdminClient, self).__init__(api_url, headers=get_default_kong_headers())
+class APIAdminClient(RestClient, APIAdminContract):
+    """
+    :param cache: Optional read-through cache for ``retrieve``, which indexes APIs by id and name. It is invalidated by
+        all writes issued through this client.
+    :type cache: kong.cache.EntityCache
+    """
+    def __init__(self, api_url, cache=None, **options):
+        super(APIAdminClient, self).__init__(api_url, headers=get_default_kong_headers(), **options)
+        self.cache = cache
 
     def destroy(self):
         super(APIAdminClient, self).destroy()
+        self.cache = None
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
-    def count(self):
-        response = self.session.get(self.get_url(APIS), headers=self.get_headers())
-
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-
-        result = response.json()
-        amount = result.get('total', len(result.get('data')))
-        return amount
+    @profiled
+    @traced
+    def count(self, estimate=False):
+        return self.count_collection(self.get_url(APIS), estimate=estimate)
 
+    @profiled
+    @traced
     def create(self, upstream_url, name=None, request_host=None, request_path=None, strip_request_path=False,
                preserve_host=False):
-        response = self.session.post(self.get_url(APIS), data={
+        response = self.request('POST', self.get_url(APIS), data={
             'name': name,
             'request_host': request_host or None,  # Empty strings are not allowed
             'request_path': request_path or None,  # Empty strings are not allowed
             'strip_request_path': strip_request_path,
             'preserve_host': preserve_host,
             'upstream_url': upstream_url
-        }, headers=self.get_headers())
+        })
 
-        if response.status_code == CONFLICT:
-            raise_response_error(response, ConflictError)
-        elif response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != CREATED:
-            raise_response_error(response, ValueError)
+        check_response(response, (CREATED,), conflict=True)
 
-        return response.json()
+        if self.cache is not None:
+            self.cache.invalidate(name)
 
+        return self.read_json(response)
+
+    @profiled
+    @traced
     def create_or_update(self, upstream_url, api_id=None, name=None, request_host=None, request_path=None,
                          strip_request_path=False, preserve_host=False):
         data = {
@@ -304,57 +568,82 @@ class APIAdminClient(APIAdminContract, RestClient):
         if api_id is not None:
             data['id'] = api_id
 
-        response = self.session.put(self.get_url(APIS), data=data, headers=self.get_headers())
+        if self.cache is not None:
+            self.cache.invalidate(api_id, name)
+
+        response = self.request('PUT', self.get_url(APIS), data=data)
 
-        if response.status_code == CONFLICT:
-            raise_response_error(response, ConflictError)
-        elif response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code not in (CREATED, OK):
-            raise_response_error(response, ValueError)
+        check_response(response, (CREATED, OK), conflict=True)
 
-        return response.json()
+        result = self.read_json(response)
 
+        if self.cache is not None:
+            self.cache.invalidate(result.get('id'), result.get('name'))
+
+        return result
+
+    @profiled
+    @traced
     def update(self, name_or_id, upstream_url, **fields):
-        assert_dict_keys_in(
-            fields, ['name', 'request_host', 'request_path', 'strip_request_path', 'preserve_host'],
-            INVALID_FIELD_ERROR_TEMPLATE)
+        assert_valid_fields(fields, API_UPDATE_FIELDS)
 
         # Explicitly encode on beforehand before passing to requests!
         fields = dict((k, utf8_or_str(v)) if isinstance(v, six.text_type) else v for k, v in fields.items())
 
-        response = self.session.patch(self.get_url(APIS, name_or_id), data=dict({
+        if self.cache is not None:
+            self.cache.invalidate(name_or_id)
+
+        response = self.request('PATCH', self.get_url(APIS, name_or_id), data=dict({
             'upstream_url': upstream_url
-        }, **fields), headers=self.get_headers())
+        }, **fields))
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        result = self.read_json(response)
 
-    @backoff.on_exception(backoff.expo, ValueError, max_tries=3)
+        if self.cache is not None:
+            self.cache.invalidate(result.get('id'), result.get('name'))
+
+        return result
+
+    @profiled
+    @traced
     def delete(self, name_or_id):
-        response = self.session.delete(self.get_url(APIS, name_or_id), headers=self.get_headers())
+        if self.cache is not None:
+            self.cache.invalidate(name_or_id)
+
+        response = self.request('DELETE', self.get_url(APIS, name_or_id))
+
+        if self.cache is not None:
+            # A concurrent retrieve may have cached the entity again while it was being deleted
+            self.cache.invalidate(name_or_id)
 
         if response.status_code not in (NO_CONTENT, NOT_FOUND):
             raise ValueError('Could not delete API (status: %s): %s' % (response.status_code, name_or_id))
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
+    @profiled
+    @traced
     def retrieve(self, name_or_id):
-        response = self.session.get(self.get_url(APIS, name_or_id), headers=self.get_headers())
+        if self.cache is not None:
+            result = self.cache.get(name_or_id)
+            if result is not None:
+                return result
+
+        response = self.request('GET', self.get_url(APIS, name_or_id))
+
+        check_response(response)
+
+        result = self.read_json(response)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        if self.cache is not None:
+            self.cache.put(result, result.get('name'))
 
-        return response.json()
+        return result
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
-    def list(self, size=100, offset=None, **filter_fields):
-        assert_dict_keys_in(filter_fields, ['id', 'name', 'request_host', 'request_path'], INVALID_FIELD_ERROR_TEMPLATE)
+    @profiled
+    @traced
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
+        assert_valid_fields(filter_fields, API_FILTER_FIELDS)
 
         query_params = filter_fields
         query_params['size'] = size
@@ -363,22 +652,19 @@ class APIAdminClient(APIAdminContract, RestClient):
             query_params['offset'] = offset
 
         url = self.get_url(APIS, **query_params)
-        response = self.session.get(url, headers=self.get_headers())
+        response = self.request('GET', url, stream=stream)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        return self.read_page(response, stream)
 
     def plugins(self, name_or_id):
-        return APIPluginConfigurationAdminClient(self, name_or_id, self.api_url)
+        return APIPluginConfigurationAdminClient(self, name_or_id, self.api_url, **self.get_shared_options())
 
 
-class BasicAuthAdminClient(BasicAuthAdminContract, RestClient):
-    def __init__(self, consumer_admin, consumer_id, api_url):
-        super(BasicAuthAdminClient, self).__init__(api_url, headers=get_default_kong_headers())
+class BasicAuthAdminClient(RestClient, BasicAuthAdminContract):
+    def __init__(self, consumer_admin, consumer_id, api_url, **options):
+        super(BasicAuthAdminClient, self).__init__(api_url, headers=get_default_kong_headers(), **options)
 
         self.consumer_admin = consumer_admin
         self.consumer_id = consumer_id
@@ -388,6 +674,8 @@ class BasicAuthAdminClient(BasicAuthAdminContract, RestClient):
         self.consumer_admin = None
         self.consumer_id = None
 
+    @profiled
+    @traced
     def create_or_update(self, basic_auth_id=None, username=None, password=None):
         data = {
             'username': utf8_or_str(username),
@@ -397,36 +685,28 @@ class BasicAuthAdminClient(BasicAuthAdminContract, RestClient):
         if basic_auth_id is not None:
             data['id'] = basic_auth_id
 
-        response = self.session.put(self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH), data=data,
-                                    headers=self.get_headers())
+        response = self.request('PUT', self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH), data=data)
 
-        if response.status_code == CONFLICT:
-            raise_response_error(response, ConflictError)
-        elif response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code not in (CREATED, OK):
-            raise_response_error(response, ValueError)
+        check_response(response, (CREATED, OK), conflict=True)
 
-        return response.json()
+        return self.read_json(response)
 
+    @profiled
+    @traced
     def create(self, username, password):
-        response = self.session.post(self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH), data={
+        response = self.request('POST', self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH), data={
             'username': utf8_or_str(username),
             'password': utf8_or_str(password),
-        }, headers=self.get_headers())
+        })
 
-        if response.status_code == CONFLICT:
-            raise_response_error(response, ConflictError)
-        elif response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != CREATED:
-            raise_response_error(response, ValueError)
+        check_response(response, (CREATED,), conflict=True)
 
-        return response.json()
+        return self.read_json(response)
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
-    def list(self, size=100, offset=None, **filter_fields):
-        assert_dict_keys_in(filter_fields, ['id', 'username'], INVALID_FIELD_ERROR_TEMPLATE)
+    @profiled
+    @traced
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
+        assert_valid_fields(filter_fields, BASIC_AUTH_FILTER_FIELDS)
 
         query_params = filter_fields
         query_params['size'] = size
@@ -435,67 +715,51 @@ class BasicAuthAdminClient(BasicAuthAdminContract, RestClient):
             query_params['offset'] = offset
 
         url = self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH, **query_params)
-        response = self.session.get(url, headers=self.get_headers())
+        response = self.request('GET', url, stream=stream)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        return self.read_page(response, stream)
 
-    @backoff.on_exception(backoff.expo, ValueError, max_tries=3)
+    @profiled
+    @traced
     def delete(self, basic_auth_id):
         url = self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH, basic_auth_id)
-        response = self.session.delete(url, headers=self.get_headers())
+        response = self.request('DELETE', url)
 
         if response.status_code not in (NO_CONTENT, NOT_FOUND):
             raise ValueError('Could not delete Basic Auth (status: %s): %s for Consumer: %s' % (
                 response.status_code, basic_auth_id, self.consumer_id))
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
+    @profiled
+    @traced
     def retrieve(self, basic_auth_id):
-        response = self.session.get(self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH, basic_auth_id),
-                                    headers=self.get_headers())
-
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        response = self.request('GET', self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH, basic_auth_id))
 
-        return response.json()
+        check_response(response)
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
-    def count(self):
-        response = self.session.get(self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH),
-                                    headers=self.get_headers())
+        return self.read_json(response)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
-
-        result = response.json()
-        amount = result.get('total', len(result.get('data')))
-        return amount
+    @profiled
+    @traced
+    def count(self, estimate=False):
+        return self.count_collection(self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH), estimate=estimate)
 
+    @profiled
+    @traced
     def update(self, basic_auth_id, **fields):
-        assert_dict_keys_in(fields, ['username', 'password'], INVALID_FIELD_ERROR_TEMPLATE)
-        response = self.session.patch(
-            self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH, basic_auth_id), data=fields,
-            headers=self.get_headers())
+        assert_valid_fields(fields, BASIC_AUTH_UPDATE_FIELDS)
+        response = self.request(
+            'PATCH', self.get_url(CONSUMERS, self.consumer_id, BASIC_AUTH, basic_auth_id), data=fields)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        return self.read_json(response)
 
 
-class KeyAuthAdminClient(KeyAuthAdminContract, RestClient):
-    def __init__(self, consumer_admin, consumer_id, api_url):
-        super(KeyAuthAdminClient, self).__init__(api_url, headers=get_default_kong_headers())
+class KeyAuthAdminClient(RestClient, KeyAuthAdminContract):
+    def __init__(self, consumer_admin, consumer_id, api_url, **options):
+        super(KeyAuthAdminClient, self).__init__(api_url, headers=get_default_kong_headers(), **options)
 
         self.consumer_admin = consumer_admin
         self.consumer_id = consumer_id
@@ -505,6 +769,8 @@ class KeyAuthAdminClient(KeyAuthAdminContract, RestClient):
         self.consumer_admin = None
         self.consumer_id = None
 
+    @profiled
+    @traced
     def create_or_update(self, key_auth_id=None, key=None):
         data = {
             'key': key
@@ -513,35 +779,27 @@ class KeyAuthAdminClient(KeyAuthAdminContract, RestClient):
         if key_auth_id is not None:
             data['id'] = key_auth_id
 
-        response = self.session.put(self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH), data=data,
-                                    headers=self.get_headers())
+        response = self.request('PUT', self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH), data=data)
 
-        if response.status_code == CONFLICT:
-            raise_response_error(response, ConflictError)
-        elif response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code not in (CREATED, OK):
-            raise_response_error(response, ValueError)
+        check_response(response, (CREATED, OK), conflict=True)
 
-        return response.json()
+        return self.read_json(response)
 
+    @profiled
+    @traced
     def create(self, key=None):
-        response = self.session.post(self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH), data={
+        response = self.request('POST', self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH), data={
             'key': key,
-        }, headers=self.get_headers())
+        })
 
-        if response.status_code == CONFLICT:
-            raise_response_error(response, ConflictError)
-        elif response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != CREATED:
-            raise_response_error(response, ValueError)
+        check_response(response, (CREATED,), conflict=True)
 
-        return response.json()
+        return self.read_json(response)
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
-    def list(self, size=100, offset=None, **filter_fields):
-        assert_dict_keys_in(filter_fields, ['id', 'key'], INVALID_FIELD_ERROR_TEMPLATE)
+    @profiled
+    @traced
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
+        assert_valid_fields(filter_fields, KEY_AUTH_FILTER_FIELDS)
 
         query_params = filter_fields
         query_params['size'] = size
@@ -550,67 +808,51 @@ class KeyAuthAdminClient(KeyAuthAdminContract, RestClient):
             query_params['offset'] = offset
 
         url = self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH, **query_params)
-        response = self.session.get(url, headers=self.get_headers())
+        response = self.request('GET', url, stream=stream)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        return self.read_page(response, stream)
 
-    @backoff.on_exception(backoff.expo, ValueError, max_tries=3)
+    @profiled
+    @traced
     def delete(self, key_auth_id):
         url = self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH, key_auth_id)
-        response = self.session.delete(url, headers=self.get_headers())
+        response = self.request('DELETE', url)
 
         if response.status_code not in (NO_CONTENT, NOT_FOUND):
             raise ValueError('Could not delete Key Auth (status: %s): %s for Consumer: %s' % (
                 response.status_code, key_auth_id, self.consumer_id))
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
+    @profiled
+    @traced
     def retrieve(self, key_auth_id):
-        response = self.session.get(self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH, key_auth_id),
-                                    headers=self.get_headers())
-
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        response = self.request('GET', self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH, key_auth_id))
 
-        return response.json()
+        check_response(response)
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
-    def count(self):
-        response = self.session.get(self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH),
-                                    headers=self.get_headers())
+        return self.read_json(response)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
-
-        result = response.json()
-        amount = result.get('total', len(result.get('data')))
-        return amount
+    @profiled
+    @traced
+    def count(self, estimate=False):
+        return self.count_collection(self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH), estimate=estimate)
 
+    @profiled
+    @traced
     def update(self, key_auth_id, **fields):
-        assert_dict_keys_in(fields, ['key'], INVALID_FIELD_ERROR_TEMPLATE)
-        response = self.session.patch(
-            self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH, key_auth_id), data=fields,
-            headers=self.get_headers())
+        assert_valid_fields(fields, KEY_AUTH_UPDATE_FIELDS)
+        response = self.request(
+            'PATCH', self.get_url(CONSUMERS, self.consumer_id, KEY_AUTH, key_auth_id), data=fields)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        return self.read_json(response)
 
 
-class OAuth2AdminClient(OAuth2AdminContract, RestClient):
-    def __init__(self, consumer_admin, consumer_id, api_url):
-        super(OAuth2AdminClient, self).__init__(api_url, headers=get_default_kong_headers())
+class OAuth2AdminClient(RestClient, OAuth2AdminContract):
+    def __init__(self, consumer_admin, consumer_id, api_url, **options):
+        super(OAuth2AdminClient, self).__init__(api_url, headers=get_default_kong_headers(), **options)
 
         self.consumer_admin = consumer_admin
         self.consumer_id = consumer_id
@@ -620,6 +862,8 @@ class OAuth2AdminClient(OAuth2AdminContract, RestClient):
         self.consumer_admin = None
         self.consumer_id = None
 
+    @profiled
+    @traced
     def create_or_update(self, oauth2_id=None, name=None, redirect_uri=None, client_id=None, client_secret=None):
         data = {
             'name': name,
@@ -631,38 +875,30 @@ class OAuth2AdminClient(OAuth2AdminContract, RestClient):
         if oauth2_id is not None:
             data['id'] = oauth2_id
 
-        response = self.session.put(self.get_url(CONSUMERS, self.consumer_id, OAUTH2), data=data,
-                                    headers=self.get_headers())
+        response = self.request('PUT', self.get_url(CONSUMERS, self.consumer_id, OAUTH2), data=data)
 
-        if response.status_code == CONFLICT:
-            raise_response_error(response, ConflictError)
-        elif response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code not in (CREATED, OK):
-            raise_response_error(response, ValueError)
+        check_response(response, (CREATED, OK), conflict=True)
 
-        return response.json()
+        return self.read_json(response)
 
+    @profiled
+    @traced
     def create(self, name, redirect_uri, client_id=None, client_secret=None):
-        response = self.session.post(self.get_url(CONSUMERS, self.consumer_id, OAUTH2), data={
+        response = self.request('POST', self.get_url(CONSUMERS, self.consumer_id, OAUTH2), data={
             'name': name,
             'redirect_uri': redirect_uri,
             'client_id': client_id,
             'client_secret': client_secret
-        }, headers=self.get_headers())
+        })
 
-        if response.status_code == CONFLICT:
-            raise_response_error(response, ConflictError)
-        elif response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != CREATED:
-            raise_response_error(response, ValueError)
+        check_response(response, (CREATED,), conflict=True)
 
-        return response.json()
+        return self.read_json(response)
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
-    def list(self, size=100, offset=None, **filter_fields):
-        assert_dict_keys_in(filter_fields, ['id', 'name', 'redirect_url', 'client_id'], INVALID_FIELD_ERROR_TEMPLATE)
+    @profiled
+    @traced
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
+        assert_valid_fields(filter_fields, OAUTH2_FILTER_FIELDS)
 
         query_params = filter_fields
         query_params['size'] = size
@@ -671,98 +907,84 @@ class OAuth2AdminClient(OAuth2AdminContract, RestClient):
             query_params['offset'] = offset
 
         url = self.get_url(CONSUMERS, self.consumer_id, OAUTH2, **query_params)
-        response = self.session.get(url, headers=self.get_headers())
+        response = self.request('GET', url, stream=stream)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        return self.read_page(response, stream)
 
-    @backoff.on_exception(backoff.expo, ValueError, max_tries=3)
+    @profiled
+    @traced
     def delete(self, oauth2_id):
         url = self.get_url(CONSUMERS, self.consumer_id, OAUTH2, oauth2_id)
-        response = self.session.delete(url, headers=self.get_headers())
+        response = self.request('DELETE', url)
 
         if response.status_code not in (NO_CONTENT, NOT_FOUND):
             raise ValueError('Could not delete OAuth2 (status: %s): %s for Consumer: %s' % (
                 response.status_code, oauth2_id, self.consumer_id))
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
+    @profiled
+    @traced
     def retrieve(self, oauth2_id):
-        response = self.session.get(self.get_url(CONSUMERS, self.consumer_id, OAUTH2, oauth2_id),
-                                    headers=self.get_headers())
-
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        response = self.request('GET', self.get_url(CONSUMERS, self.consumer_id, OAUTH2, oauth2_id))
 
-        return response.json()
+        check_response(response)
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
-    def count(self):
-        response = self.session.get(self.get_url(CONSUMERS, self.consumer_id, OAUTH2),
-                                    headers=self.get_headers())
+        return self.read_json(response)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
-
-        result = response.json()
-        amount = result.get('total', len(result.get('data')))
-        return amount
+    @profiled
+    @traced
+    def count(self, estimate=False):
+        return self.count_collection(self.get_url(CONSUMERS, self.consumer_id, OAUTH2), estimate=estimate)
 
+    @profiled
+    @traced
     def update(self, oauth2_id, **fields):
-        assert_dict_keys_in(
-            fields, ['name', 'redirect_uri', 'client_id', 'client_secret'], INVALID_FIELD_ERROR_TEMPLATE)
-        response = self.session.patch(
-            self.get_url(CONSUMERS, self.consumer_id, OAUTH2, oauth2_id), data=fields,
-            headers=self.get_headers())
+        assert_valid_fields(fields, OAUTH2_UPDATE_FIELDS)
+        response = self.request(
+            'PATCH', self.get_url(CONSUMERS, self.consumer_id, OAUTH2, oauth2_id), data=fields)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        return self.read_json(response)
 
 
-class ConsumerAdminClient(ConsumerAdminContract, RestClient):
-    def __init__(self, api_url):
-        super(ConsumerAdminClient, self).__init__(api_url, headers=get_default_kong_headers())
+class ConsumerAdminClient(RestClient, ConsumerAdminContract):
+    """
+    :param cache: Optional read-through cache for ``retrieve``, which indexes consumers by id and username. It is
+        invalidated by all writes issued through this client.
+    :type cache: kong.cache.EntityCache
+    """
+    def __init__(self, api_url, cache=None, **options):
+        super(ConsumerAdminClient, self).__init__(api_url, headers=get_default_kong_headers(), **options)
+        self.cache = cache
 
     def destroy(self):
         super(ConsumerAdminClient, self).destroy()
+        self.cache = None
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
-    def count(self):
-        response = self.session.get(self.get_url(CONSUMERS), headers=self.get_headers())
-
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-
-        result = response.json()
-        amount = result.get('total', len(result.get('data')))
-        return amount
+    @profiled
+    @traced
+    def count(self, estimate=False):
+        return self.count_collection(self.get_url(CONSUMERS), estimate=estimate)
 
+    @profiled
+    @traced
     def create(self, username=None, custom_id=None):
-        response = self.session.post(self.get_url(CONSUMERS), data={
+        response = self.request('POST', self.get_url(CONSUMERS), data={
             'username': username,
             'custom_id': custom_id,
-        }, headers=self.get_headers())
+        })
+
+        check_response(response, (CREATED,), conflict=True)
 
-        if response.status_code == CONFLICT:
-            raise_response_error(response, ConflictError)
-        elif response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != CREATED:
-            raise_response_error(response, ValueError)
+        if self.cache is not None:
+            self.cache.invalidate(username)
 
-        return response.json()
+        return self.read_json(response)
 
+    @profiled
+    @traced
     def create_or_update(self, consumer_id=None, username=None, custom_id=None):
         data = {
             'username': username,
@@ -772,32 +994,43 @@ class ConsumerAdminClient(ConsumerAdminContract, RestClient):
         if consumer_id is not None:
             data['id'] = consumer_id
 
-        response = self.session.put(self.get_url(CONSUMERS), data=data, headers=self.get_headers())
+        if self.cache is not None:
+            self.cache.invalidate(consumer_id, username)
+
+        response = self.request('PUT', self.get_url(CONSUMERS), data=data)
+
+        check_response(response, (CREATED, OK), conflict=True)
 
-        if response.status_code == CONFLICT:
-            raise_response_error(response, ConflictError)
-        elif response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code not in (CREATED, OK):
-            raise_response_error(response, ValueError)
+        result = self.read_json(response)
 
-        return response.json()
+        if self.cache is not None:
+            self.cache.invalidate(result.get('id'), result.get('username'))
 
+        return result
+
+    @profiled
+    @traced
     def update(self, username_or_id, **fields):
-        assert_dict_keys_in(fields, ['username', 'custom_id'], INVALID_FIELD_ERROR_TEMPLATE)
-        response = self.session.patch(self.get_url(CONSUMERS, username_or_id), data=fields,
-                                      headers=self.get_headers())
+        assert_valid_fields(fields, CONSUMER_UPDATE_FIELDS)
+
+        if self.cache is not None:
+            self.cache.invalidate(username_or_id)
+
+        response = self.request('PATCH', self.get_url(CONSUMERS, username_or_id), data=fields)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        result = self.read_json(response)
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
-    def list(self, size=100, offset=None, **filter_fields):
-        assert_dict_keys_in(filter_fields, ['id', 'custom_id', 'username'], INVALID_FIELD_ERROR_TEMPLATE)
+        if self.cache is not None:
+            self.cache.invalidate(result.get('id'), result.get('username'))
+
+        return result
+
+    @profiled
+    @traced
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
+        assert_valid_fields(filter_fields, CONSUMER_FILTER_FIELDS)
 
         query_params = filter_fields
         query_params['size'] = size
@@ -806,81 +1039,199 @@ class ConsumerAdminClient(ConsumerAdminContract, RestClient):
             query_params['offset'] = offset
 
         url = self.get_url(CONSUMERS, **query_params)
-        response = self.session.get(url, headers=self.get_headers())
+        response = self.request('GET', url, stream=stream)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        return self.read_page(response, stream)
 
-    @backoff.on_exception(backoff.expo, ValueError, max_tries=3)
+    @profiled
+    @traced
     def delete(self, username_or_id):
-        response = self.session.delete(self.get_url(CONSUMERS, username_or_id), headers=self.get_headers())
+        if self.cache is not None:
+            self.cache.invalidate(username_or_id)
+
+        response = self.request('DELETE', self.get_url(CONSUMERS, username_or_id))
+
+        if self.cache is not None:
+            # A concurrent retrieve may have cached the entity again while it was being deleted
+            self.cache.invalidate(username_or_id)
 
         if response.status_code not in (NO_CONTENT, NOT_FOUND):
             raise ValueError('Could not delete Consumer (status: %s): %s' % (response.status_code, username_or_id))
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
+    @profiled
+    @traced
     def retrieve(self, username_or_id):
-        response = self.session.get(self.get_url(CONSUMERS, username_or_id), headers=self.get_headers())
+        if self.cache is not None:
+            result = self.cache.get(username_or_id)
+            if result is not None:
+                return result
+
+        response = self.request('GET', self.get_url(CONSUMERS, username_or_id))
+
+        check_response(response)
+
+        result = self.read_json(response)
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        if self.cache is not None:
+            self.cache.put(result, result.get('username'))
 
-        return response.json()
+        return result
 
     def basic_auth(self, username_or_id):
-        return BasicAuthAdminClient(self, username_or_id, self.api_url)
+        return BasicAuthAdminClient(self, username_or_id, self.api_url, **self.get_shared_options())
 
     def key_auth(self, username_or_id):
-        return KeyAuthAdminClient(self, username_or_id, self.api_url)
+        return KeyAuthAdminClient(self, username_or_id, self.api_url, **self.get_shared_options())
 
     def oauth2(self, username_or_id):
-        return OAuth2AdminClient(self, username_or_id, self.api_url)
+        return OAuth2AdminClient(self, username_or_id, self.api_url, **self.get_shared_options())
 
 
-class PluginAdminClient(PluginAdminContract, RestClient):
-    def __init__(self, api_url):
-        super(PluginAdminClient, self).__init__(api_url, headers=get_default_kong_headers())
+class PluginAdminClient(RestClient, PluginAdminContract):
+    def __init__(self, api_url, **options):
+        super(PluginAdminClient, self).__init__(api_url, headers=get_default_kong_headers(), **options)
 
     def destroy(self):
         super(PluginAdminClient, self).destroy()
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
+    @profiled
+    @traced
     def list(self):
-        response = self.session.get(self.get_url(PLUGINS), headers=self.get_headers())
+        response = self.request('GET', self.get_url(PLUGINS))
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        return self.read_json(response)
 
-    @backoff.on_exception(backoff.expo, ServerError, max_tries=3)
+    @profiled
+    @traced
     def retrieve_schema(self, plugin_name):
-        response = self.session.get(self.get_url(PLUGINS, plugin_name, 'schema'), headers=self.get_headers())
+        response = self.request('GET', self.get_url(PLUGINS, plugin_name, 'schema'), operation='retrieve_schema')
 
-        if response.status_code == INTERNAL_SERVER_ERROR:
-            raise_response_error(response, ServerError)
-        elif response.status_code != OK:
-            raise_response_error(response, ValueError)
+        check_response(response)
 
-        return response.json()
+        return self.read_json(response)
 
 
 class KongAdminClient(KongAdminContract):
-    def __init__(self, api_url):
+    """
+    All sub-clients (including the credential and plugin configuration clients handed out by ``consumers`` and
+      ``apis``) share a single connection pool, which is owned by this client.
+
+    :param api_url: Base URL of the Kong admin API, or a list with the base URLs of the admin API of every node of the
+        cluster. Requests are spread over all nodes in that case, and writes go to the first node while it is healthy.
+        See ``balancer.stats()``.
+    :type api_url: six.text_type | list
+    :param pool_connections: The number of per-host connection pools to cache
+    :param pool_maxsize: The maximum number of connections to keep per host
+    :param pool_block: Whether to block when the pool has no free connections, instead of opening extra ones
+    :param rate_limit: Maximum average amount of requests per second sent to each Kong node (unlimited if None)
+    :type rate_limit: float
+    :param rate_limit_burst: Maximum amount of requests that may be sent at once to each Kong node
+    :type rate_limit_burst: int
+    :param cache_ttl: When given, ``apis.retrieve`` and ``consumers.retrieve`` are served from an LRU cache whose
+        entries expire after this amount of seconds. See ``apis.cache.stats()`` and ``consumers.cache.stats()``.
+    :type cache_ttl: float
+    :param cache_size: Maximum amount of APIs and of consumers kept in the cache
+    :type cache_size: int
+    :param coalesce_reads: Whether concurrent identical GET requests (from any thread, through any sub-client) should
+        share a single request to Kong. See ``single_flight.stats()``.
+    :type coalesce_reads: bool
+    :param codec: Decodes response bodies. Pass ``'fast'`` to use the fastest JSON library that is installed (like
+        orjson), falling back to the standard library. See ``kong.codec.get_codec``.
+    :type codec: kong.codec.JSONCodec | six.text_type
+    :param retry_policy: Decides which failed requests are retried, and when. Defaults to 3 attempts with full jitter,
+        and a retry budget shared by all sub-clients. See ``retry_policy.stats()``.
+    :type retry_policy: kong.retry.RetryPolicy
+    :param circuit_breaker: When given, requests to a Kong node that keeps failing (or responding slowly) fail fast
+        with a ``CircuitOpenError`` for a while, instead of piling up. See ``circuit_breaker.stats()``.
+    :type circuit_breaker: kong.circuitbreaker.NodeCircuitBreaker
+    :param load_balancing: How reads are spread over the nodes: ``'least-outstanding'`` or ``'round-robin'``
+    :param health_check_interval: When given (and there are several nodes), the ``/status`` endpoint of every node is
+        probed at this interval in seconds, and nodes that do not respond successfully are taken out of rotation
+    :type health_check_interval: float
+    :param hedging: When given, reads that are slower than most recent reads are sent a second time (to another node,
+        when there are several), and the first response is used. See ``hedging.stats()``.
+    :type hedging: kong.hedging.HedgingPolicy
+    :param request_hooks: Callables that are called with the ``kong.metrics.RequestMetrics`` (resource, operation,
+        status code, latency, sizes, retries and connection reuse) of every request, like a
+        ``kong.metrics.MetricsCollector``
+    :type request_hooks: list
+    :param timeout: Timeout of every request, in seconds, or a ``(connect timeout, read timeout)`` tuple. None waits
+        forever.
+    :type timeout: float | tuple
+    :param tracer: When given, every call of a client method is wrapped in a span, with nested spans for its requests,
+        their attempts (including retries and hedges) and JSON decoding. See ``kong.tracing.Tracer``.
+    :type tracer: kong.tracing.Tracer
+    :param profiler: When given, the time spent in every call of a client method is attributed to URL building,
+        header merge, transport, JSON decode and dispatch. See ``profiler.report()``.
+    :type profiler: kong.profiling.Profiler
+    """
+    def __init__(self, api_url, pool_connections=10, pool_maxsize=10, pool_block=False, rate_limit=None,
+                 rate_limit_burst=None, cache_ttl=None, cache_size=1000, coalesce_reads=False, codec=None,
+                 retry_policy=None, circuit_breaker=None, load_balancing=LEAST_OUTSTANDING,
+                 health_check_interval=None, hedging=None, request_hooks=None, timeout=None, tracer=None,
+                 profiler=None):
+        self.rate_limiter = RateLimiter(rate_limit, burst=rate_limit_burst) if rate_limit else None
+        self.single_flight = SingleFlight() if coalesce_reads else None
+        self.codec = get_codec(codec)
+        self.retry_policy = retry_policy or RetryPolicy(budget=RetryBudget())
+        self.circuit_breaker = circuit_breaker
+        self.balancer = None
+        self.hedging = hedging
+        self.request_hooks = list(request_hooks or [])
+        self.timeout = timeout
+        self.tracer = tracer
+        self.profiler = profiler
+        self._session = create_session(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                       pool_block=pool_block, rate_limiter=self.rate_limiter)
+
+        if not isinstance(api_url, six.string_types):
+            self.balancer = LoadBalancer(api_url, strategy=load_balancing)
+            api_url = self.balancer.preferred_url
+            if health_check_interval:
+                self.balancer.start_health_checks(self.probe_node, health_check_interval)
+
+        options = dict(session=self._session, single_flight=self.single_flight, codec=self.codec,
+                       retry_policy=self.retry_policy, circuit_breaker=self.circuit_breaker, balancer=self.balancer,
+                       hedging=self.hedging, request_hooks=self.request_hooks, timeout=self.timeout,
+                       tracer=self.tracer, profiler=self.profiler)
+
+        api_cache, consumer_cache = None, None
+        if cache_ttl:
+            api_cache = EntityCache(max_size=cache_size, ttl=cache_ttl)
+            consumer_cache = EntityCache(max_size=cache_size, ttl=cache_ttl)
+
         super(KongAdminClient, self).__init__(
-            apis=APIAdminClient(api_url),
-            consumers=ConsumerAdminClient(api_url),
-            plugins=PluginAdminClient(api_url))
+            apis=APIAdminClient(api_url, cache=api_cache, **options),
+            consumers=ConsumerAdminClient(api_url, cache=consumer_cache, **options),
+            plugins=PluginAdminClient(api_url, **options))
+
+    @property
+    def session(self):
+        return self._session
+
+    def probe_node(self, node_url):
+        """
+        :param node_url: Base URL of the admin API of a Kong node
+        :rtype: bool
+        :return: Whether the node responds successfully to a status request
+        """
+        # Without the trailing slash, urljoin would drop the last segment of a path prefix (like /admin)
+        response = self._session.get(urljoin(ensure_trailing_slash(node_url), 'status'), timeout=HEALTH_CHECK_TIMEOUT)
+        response.close()
+        return response.status_code == OK
 
     def close(self):
+        if self.balancer is not None:
+            self.balancer.stop_health_checks()
+
         self.apis.destroy()
         self.consumers.destroy()
         self.plugins.destroy()
+
+        if self._session is not None:
+            self._session.close()
+        self._session = None
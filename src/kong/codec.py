@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import json
+
+import six
+
+# Codecs that are tried (in this order) when the fastest available codec is requested
+FAST_CODEC_NAMES = ('orjson', 'ujson')
+
+
+class JSONCodec(object):
+    """
+    Decodes JSON response bodies using the standard library. Subclasses can plug in faster implementations.
+
+    Request bodies are form encoded, so only decoding is pluggable.
+    """
+    name = 'json'
+
+    def loads(self, data):
+        """
+        :param data: UTF-8 encoded JSON document
+        :type data: bytes | six.text_type
+        :return: The decoded document
+        """
+        if isinstance(data, six.binary_type):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, self.name)
+
+
+class OrjsonCodec(JSONCodec):
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+
+CODECS = {
+    JSONCodec.name: JSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec,
+}
+
+DEFAULT_CODEC = JSONCodec()
+
+
+def get_codec(codec=None):
+    """
+    :param codec: A codec instance, the name of a codec (``'json'``, ``'orjson'`` or ``'ujson'``), or ``'fast'`` for
+        the fastest codec that is installed. ``'fast'`` falls back to the standard library if none of them is. None
+        returns the default (standard library) codec.
+    :rtype: JSONCodec
+    """
+    if codec is None:
+        return DEFAULT_CODEC
+    elif isinstance(codec, JSONCodec):
+        return codec
+    elif codec == 'fast':
+        for name in FAST_CODEC_NAMES:
+            try:
+                return CODECS[name]()
+            except ImportError:
+                continue
+        return DEFAULT_CODEC
+    elif codec in CODECS:
+        return CODECS[codec]()
+    raise ValueError('Unknown codec %r. Available codecs: %r' % (codec, sorted(CODECS) + ['fast']))
@@ -7,6 +7,12 @@ try:
 except ImportError:  # pragma: no cover
     from httplib import OK, CREATED, CONFLICT, NO_CONTENT, NOT_FOUND, BAD_REQUEST, INTERNAL_SERVER_ERROR, HTTPConnection
 
+try:
+    from http.client import TOO_MANY_REQUESTS, BAD_GATEWAY, SERVICE_UNAVAILABLE, GATEWAY_TIMEOUT
+except ImportError:  # pragma: no cover
+    from httplib import BAD_GATEWAY, SERVICE_UNAVAILABLE, GATEWAY_TIMEOUT
+    TOO_MANY_REQUESTS = 429
+
 try:
     from urllib.parse import urlparse, urljoin, urlencode, quote, unquote, parse_qs, parse_qsl, ParseResult
 except ImportError:  # pragma: no cover
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import sys
+import threading
+from multiprocessing.pool import ThreadPool
+
+import six
+from six.moves import queue
+from requests.exceptions import Timeout, ConnectionError
+
+from .exceptions import ServerError
+from .ratelimit import monotonic
+
+DEFAULT_MAX_WORKERS = 10
+
+# Errors that indicate Kong (or its datastore) is overloaded
+OVERLOAD_ERRORS = (ServerError, Timeout, ConnectionError)
+
+# Interval (in seconds) at which a blocked background producer checks whether its consumer went away
+PRODUCER_POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+
+class BulkResult(object):
+    """
+    Outcome of a single item of a bulk operation. Exactly one of ``result`` and ``error`` is meaningful, depending on
+      whether or not the operation succeeded for this item.
+    """
+    def __init__(self, item, result=None, error=None):
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.succeeded:
+            return '<BulkResult item=%r result=%r>' % (self.item, self.result)
+        return '<BulkResult item=%r error=%r>' % (self.item, self.error)
+
+
+class AdaptiveConcurrencyController(object):
+    """
+    AIMD (additive increase, multiplicative decrease) limiter for the amount of requests in flight.
+
+    While requests succeed and latency stays below ``latency_threshold``, the limit grows by ``increase`` per limit's
+      worth of successful requests (so roughly by ``increase`` per round trip). As soon as a request fails with one of
+      the ``overload_errors`` (500s, timeouts, connection errors), or takes longer than ``latency_threshold``, the
+      limit is multiplied by ``decrease_factor``. Failures and slow requests that were started before the last
+      decrease are ignored, so a single burst of them only backs off once.
+
+    :param initial_limit: Amount of requests allowed in flight at the start
+    :param min_limit: Lower bound for the limit
+    :param max_limit: Upper bound for the limit
+    :param increase: Additive increase per round trip
+    :param decrease_factor: Multiplicative decrease applied on overload
+    :param latency_threshold: Requests slower than this amount of seconds decrease the limit (None to disable)
+    :param overload_errors: Exception classes that indicate the server is overloaded
+    """
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=64, increase=1.0, decrease_factor=0.5,
+                 latency_threshold=None, overload_errors=OVERLOAD_ERRORS, clock=monotonic):
+        assert 1 <= min_limit <= initial_limit <= max_limit
+        assert 0 < decrease_factor < 1
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_threshold = latency_threshold
+        self.overload_errors = overload_errors
+        self._clock = clock
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._last_decrease = None
+        self._condition = threading.Condition()
+
+        self.successes = 0
+        self.failures = 0
+        self.decreases = 0
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def try_acquire(self):
+        """
+        :return: A token that has to be passed to ``release``, or None if the limit has been reached
+        """
+        with self._condition:
+            if self._in_flight >= self.limit:
+                return None
+            self._in_flight += 1
+            return self._clock()
+
+    def acquire(self):
+        """
+        Blocks until a request may be sent.
+
+        :return: A token that has to be passed to ``release``
+        """
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+            return self._clock()
+
+    def release(self, token, error=None):
+        """
+        :param token: The token returned by ``acquire`` or ``try_acquire``
+        :param error: The exception raised by the request, if any
+        """
+        with self._condition:
+            now = self._clock()
+            self._in_flight -= 1
+
+            if error is not None and isinstance(error, self.overload_errors):
+                self.failures += 1
+                self._decrease(token, now)
+            else:
+                self.successes += 1
+                if self.latency_threshold is not None and now - token > self.latency_threshold:
+                    self._decrease(token, now)
+                else:
+                    self._limit = min(float(self.max_limit), self._limit + self.increase / self._limit)
+
+            self._condition.notify_all()
+
+    def _decrease(self, token, now):
+        if self._last_decrease is None or token >= self._last_decrease:
+            self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+            self._last_decrease = now
+            self.decreases += 1
+
+    def __repr__(self):
+        return '<AdaptiveConcurrencyController limit=%s in_flight=%s>' % (self.limit, self.in_flight)
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exc_info = None
+
+
+class SingleFlight(object):
+    """
+    Collapses concurrent calls that share the same key into a single call. The first caller (the leader) executes the
+      call; callers that arrive while it is in flight wait for it and receive the same result, or the same exception.
+      Nothing is cached: once the call has completed, the next caller with the same key executes it again.
+    """
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key, func):
+        """
+        :param key: Hashable identifier of the call
+        :param func: Callable without arguments that performs the call
+        :return: The result of ``func``, possibly as produced for another caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.exc_info is not None:
+                six.reraise(*call.exc_info)
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException:
+            call.exc_info = sys.exc_info()
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """
+        :rtype: dict
+        :return: Dictionary containing the amount of executed calls, and the amount of calls that shared their result
+        """
+        return {
+            'calls': self.calls,
+            'shared': self.shared,
+        }
+
+
+def run_concurrently(func, items, max_workers=None, controller=None):
+    """
+    Calls ``func`` for every item using a bounded pool of threads. A failing item does not abort the others; its
+      exception is stored on the corresponding ``BulkResult`` instead.
+
+    :param func: Callable that accepts a single item
+    :param items: Iterable of items
+    :param max_workers: Maximum number of items that are processed at the same time. Defaults to the controller's
+        ``max_limit`` when a controller is given.
+    :type max_workers: int
+    :param controller: Adapts the amount of items that are processed at the same time to the server's health
+    :type controller: AdaptiveConcurrencyController
+    :rtype: list
+    :return: List of BulkResult instances, in the same order as ``items``
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def _call(item):
+        token = controller.acquire() if controller is not None else None
+        error = None
+        try:
+            return BulkResult(item, result=func(item))
+        except Exception as e:
+            error = e
+            return BulkResult(item, error=e)
+        finally:
+            if controller is not None:
+                controller.release(token, error)
+
+    if max_workers is None and controller is not None:
+        max_workers = controller.max_limit
+
+    pool = ThreadPool(min(max_workers or DEFAULT_MAX_WORKERS, len(items)))
+    try:
+        return pool.map(_call, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def prefetch(iterable, depth=1):
+    """
+    Consumes ``iterable`` in a background thread, which stays at most ``depth`` items ahead of the caller. Exceptions
+      raised by ``iterable`` are re-raised to the caller once it has received all preceding items. When the caller
+      stops iterating early (by closing the generator, or by dropping it), the background thread stops as well.
+
+    :param iterable: Iterable that is slow to produce its items, like a paginated listing
+    :param depth: Maximum amount of items buffered ahead of the caller
+    :type depth: int
+    :rtype: collections.Iterator
+    """
+    assert depth > 0
+    buffer = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(entry):
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=PRODUCER_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except Exception:
+            put((_DONE, sys.exc_info()))
+        else:
+            put((_DONE, None))
+
+    thread = threading.Thread(target=produce)
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            item, exc_info = buffer.get()
+            if item is _DONE:
+                if exc_info is not None:
+                    six.reraise(*exc_info)
+                return
+            yield item
+    finally:
+        stopped.set()
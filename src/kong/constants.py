@@ -6,3 +6,6 @@ CONSUMERS = "consumers"
 KEY_AUTH = "key-auth"
 BASIC_AUTH = "basic-auth"
 OAUTH2 = "oauth2"
+
+# Largest page size accepted by the admin API
+MAX_PAGE_SIZE = 1000
@@ -4,10 +4,10 @@ from abc import ABCMeta, abstractmethod
 
 from six import with_metaclass
 
-from .mixins import CollectionMixin
+from .mixins import CollectionMixin, BulkMixin
 
 
-class APIPluginConfigurationAdminContract(CollectionMixin):
+class APIPluginConfigurationAdminContract(CollectionMixin, BulkMixin):
     """
     Because we are already mixing with CollectionMixin, we cannot use 'with_metaclass(ABCMeta, ...)'. The solution is
       to explicitly define the __metaclass__ property on the class like below.
@@ -21,8 +21,11 @@ class APIPluginConfigurationAdminContract(CollectionMixin):
         """
 
     @abstractmethod
-    def count(self):
+    def count(self, estimate=False):
         """
+        :param estimate: When the amount of records is not reported by Kong, return the amount of records on the first
+            (largest possible) page instead of counting all of them
+        :type estimate: bool
         :rtype: int
         :return: Amount of records
         """
@@ -88,12 +91,15 @@ class APIPluginConfigurationAdminContract(CollectionMixin):
         """
 
     @abstractmethod
-    def list(self, size=100, offset=None, **filter_fields):
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
         """
         :param size: A limit on the number of objects to be returned.
         :type size: int
         :param offset: A cursor used for pagination. offset is an object identifier that defines a place in the list.
         :type offset: uuid.UUID
+        :param stream: Whether to decode the objects one at a time, while the response is being received. The result
+            is a ``kong.streaming.StreamingPage`` whose ``data`` can only be iterated once.
+        :type stream: bool
         :param filter_fields: Dictionary containing values to filter for
         :type filter_fields: dict
         :rtype: dict
@@ -171,7 +177,7 @@ class APIPluginConfigurationAdminContract(CollectionMixin):
         """
 
 
-class APIAdminContract(CollectionMixin):
+class APIAdminContract(CollectionMixin, BulkMixin):
     __metaclass__ = ABCMeta
 
     @abstractmethod
@@ -181,8 +187,11 @@ class APIAdminContract(CollectionMixin):
         """
 
     @abstractmethod
-    def count(self):
+    def count(self, estimate=False):
         """
+        :param estimate: When the amount of records is not reported by Kong, return the amount of records on the first
+            (largest possible) page instead of counting all of them
+        :type estimate: bool
         :rtype: int
         :return: Amount of records
         """
@@ -262,12 +271,15 @@ class APIAdminContract(CollectionMixin):
         """
 
     @abstractmethod
-    def list(self, size=100, offset=None, **filter_fields):
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
         """
         :param size: A limit on the number of objects to be returned.
         :type size: int
         :param offset: A cursor used for pagination. offset is an object identifier that defines a place in the list.
         :type offset: uuid.UUID
+        :param stream: Whether to decode the objects one at a time, while the response is being received. The result
+            is a ``kong.streaming.StreamingPage`` whose ``data`` can only be iterated once.
+        :type stream: bool
         :param filter_fields: Dictionary containing values to filter for
         :type filter_fields: dict
         :rtype: dict
@@ -331,7 +343,7 @@ class APIAdminContract(CollectionMixin):
         """
 
 
-class BasicAuthAdminContract(CollectionMixin):
+class BasicAuthAdminContract(CollectionMixin, BulkMixin):
     __metaclass__ = ABCMeta
 
     @abstractmethod
@@ -341,8 +353,11 @@ class BasicAuthAdminContract(CollectionMixin):
         """
 
     @abstractmethod
-    def count(self):
+    def count(self, estimate=False):
         """
+        :param estimate: When the amount of records is not reported by Kong, return the amount of records on the first
+            (largest possible) page instead of counting all of them
+        :type estimate: bool
         :rtype: int
         :return: Amount of records
         """
@@ -420,12 +435,15 @@ class BasicAuthAdminContract(CollectionMixin):
         """
 
     @abstractmethod
-    def list(self, size=100, offset=None, **filter_fields):
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
         """
         :param size: A limit on the number of objects to be returned.
         :type size: int
         :param offset: A cursor used for pagination. offset is an object identifier that defines a place in the list.
         :type offset: uuid.UUID
+        :param stream: Whether to decode the objects one at a time, while the response is being received. The result
+            is a ``kong.streaming.StreamingPage`` whose ``data`` can only be iterated once.
+        :type stream: bool
         :param filter_fields: Dictionary containing values to filter for
         :type filter_fields: dict
         :rtype: dict
@@ -458,7 +476,7 @@ class BasicAuthAdminContract(CollectionMixin):
         """
 
 
-class KeyAuthAdminContract(CollectionMixin):
+class KeyAuthAdminContract(CollectionMixin, BulkMixin):
     __metaclass__ = ABCMeta
 
     @abstractmethod
@@ -468,8 +486,11 @@ class KeyAuthAdminContract(CollectionMixin):
         """
 
     @abstractmethod
-    def count(self):
+    def count(self, estimate=False):
         """
+        :param estimate: When the amount of records is not reported by Kong, return the amount of records on the first
+            (largest possible) page instead of counting all of them
+        :type estimate: bool
         :rtype: int
         :return: Amount of records
         """
@@ -540,12 +561,15 @@ class KeyAuthAdminContract(CollectionMixin):
         """
 
     @abstractmethod
-    def list(self, size=100, offset=None, **filter_fields):
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
         """
         :param size: A limit on the number of objects to be returned.
         :type size: int
         :param offset: A cursor used for pagination. offset is an object identifier that defines a place in the list.
         :type offset: uuid.UUID
+        :param stream: Whether to decode the objects one at a time, while the response is being received. The result
+            is a ``kong.streaming.StreamingPage`` whose ``data`` can only be iterated once.
+        :type stream: bool
         :param filter_fields: Dictionary containing values to filter for
         :type filter_fields: dict
         :rtype: dict
@@ -576,7 +600,7 @@ class KeyAuthAdminContract(CollectionMixin):
         """
 
 
-class OAuth2AdminContract(CollectionMixin):
+class OAuth2AdminContract(CollectionMixin, BulkMixin):
     __metaclass__ = ABCMeta
 
     @abstractmethod
@@ -586,8 +610,11 @@ class OAuth2AdminContract(CollectionMixin):
         """
 
     @abstractmethod
-    def count(self):
+    def count(self, estimate=False):
         """
+        :param estimate: When the amount of records is not reported by Kong, return the amount of records on the first
+            (largest possible) page instead of counting all of them
+        :type estimate: bool
         :rtype: int
         :return: Amount of records
         """
@@ -683,12 +710,15 @@ class OAuth2AdminContract(CollectionMixin):
         """
 
     @abstractmethod
-    def list(self, size=100, offset=None, **filter_fields):
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
         """
         :param size: A limit on the number of objects to be returned.
         :type size: int
         :param offset: A cursor used for pagination. offset is an object identifier that defines a place in the list.
         :type offset: uuid.UUID
+        :param stream: Whether to decode the objects one at a time, while the response is being received. The result
+            is a ``kong.streaming.StreamingPage`` whose ``data`` can only be iterated once.
+        :type stream: bool
         :param filter_fields: Dictionary containing values to filter for
         :type filter_fields: dict
         :rtype: dict
@@ -725,7 +755,7 @@ class OAuth2AdminContract(CollectionMixin):
         """
 
 
-class ConsumerAdminContract(CollectionMixin):
+class ConsumerAdminContract(CollectionMixin, BulkMixin):
     __metaclass__ = ABCMeta
 
     @abstractmethod
@@ -735,8 +765,11 @@ class ConsumerAdminContract(CollectionMixin):
         """
 
     @abstractmethod
-    def count(self):
+    def count(self, estimate=False):
         """
+        :param estimate: When the amount of records is not reported by Kong, return the amount of records on the first
+            (largest possible) page instead of counting all of them
+        :type estimate: bool
         :rtype: int
         :return: Amount of records
         """
@@ -792,12 +825,15 @@ class ConsumerAdminContract(CollectionMixin):
         """
 
     @abstractmethod
-    def list(self, size=100, offset=None, **filter_fields):
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
         """
         :param size: A limit on the number of objects to be returned.
         :type size: int
         :param offset: A cursor used for pagination. offset is an object identifier that defines a place in the list.
         :type offset: uuid.UUID
+        :param stream: Whether to decode the objects one at a time, while the response is being received. The result
+            is a ``kong.streaming.StreamingPage`` whose ``data`` can only be iterated once.
+        :type stream: bool
         :param filter_fields: Dictionary containing values to filter for
         :type filter_fields: dict
         :rtype: dict
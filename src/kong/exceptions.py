@@ -8,3 +8,12 @@ class ConflictError(Exception):
 
 class ServerError(Exception):
     pass
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request to a Kong node whose circuit breaker is open.
+    """
+    def __init__(self, message, retry_in=None):
+        super(CircuitOpenError, self).__init__(message)
+        self.retry_in = retry_in
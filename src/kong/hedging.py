@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import sys
+import threading
+from collections import deque
+
+import six
+from six.moves import queue
+
+from .ratelimit import monotonic
+from .retry import RetryBudget, RETRYABLE_STATUS_CODES
+
+# Amount of new latency samples after which the hedge delay is recomputed
+_RECOMPUTE_INTERVAL = 16
+
+
+class LatencyTracker(object):
+    """
+    Thread-safe sliding window of the latencies of recent requests.
+
+    :param window_size: Amount of most recent latencies that are kept
+    :type window_size: int
+    """
+    def __init__(self, window_size=1000):
+        self._samples = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._new_samples = 0
+
+    def __len__(self):
+        return len(self._samples)
+
+    def record(self, latency):
+        with self._lock:
+            self._samples.append(latency)
+            self._new_samples += 1
+            if self._new_samples >= _RECOMPUTE_INTERVAL:
+                self._cache.clear()
+                self._new_samples = 0
+
+    def percentile(self, percentile):
+        """
+        :param percentile: Number between 0 and 100
+        :rtype: float
+        :return: The latency below which ``percentile`` percent of the recorded latencies fall, or None if nothing
+            has been recorded. Recomputed after every few new samples only, as sorting the window is not free.
+        """
+        with self._lock:
+            if percentile not in self._cache:
+                if not self._samples:
+                    return None
+                samples = sorted(self._samples)
+                index = min(len(samples) - 1, int(len(samples) * percentile / 100.0))
+                self._cache[percentile] = samples[index]
+            return self._cache[percentile]
+
+
+class _WorkerPool(object):
+    """
+    Daemon threads that run the attempts of hedged requests. Idle threads are reused, so a request does not pay for
+      starting a thread. Threads exit after being idle for ``idle_timeout`` seconds.
+    """
+    def __init__(self, idle_timeout=60.0):
+        self._idle_timeout = idle_timeout
+        self._tasks = queue.Queue()
+        self._lock = threading.Lock()
+        self._idle = 0
+
+    def submit(self, func, *args):
+        with self._lock:
+            claimed = self._idle > 0
+            if claimed:
+                self._idle -= 1
+
+        if claimed:
+            self._tasks.put((func, args))
+        else:
+            thread = threading.Thread(target=self._work, args=(func, args), name='kong-hedge')
+            thread.daemon = True
+            thread.start()
+
+    def _work(self, func, args):
+        while True:
+            func(*args)
+
+            with self._lock:
+                self._idle += 1
+            try:
+                func, args = self._tasks.get(timeout=self._idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    if self._idle > 0:
+                        self._idle -= 1
+                        return
+                # Every idle thread, including this one, was handed a task meanwhile
+                func, args = self._tasks.get()
+
+
+class HedgingPolicy(object):
+    """
+    Cuts the tail latency of reads by hedging: when a request has not completed after the ``percentile``-th percentile
+      of the latencies of recent requests, a duplicate request is sent (to another node, when load balancing, or over
+      another connection otherwise). The first successful response is used, and the other one is closed as soon as it
+      arrives. Attempts are sent by a pool of reused threads, while the caller waits for the first one to complete.
+
+    Hedges are limited by a budget, so they cannot multiply the load on a Kong cluster that is slow across the board.
+
+    :param percentile: Percentile of recent latencies after which a request is hedged
+    :type percentile: float
+    :param min_delay: Lower bound of the hedge delay, in seconds
+    :type min_delay: float
+    :param max_delay: Upper bound of the hedge delay, in seconds. Also used until ``min_samples`` latencies have been
+        recorded.
+    :type max_delay: float
+    :param window_size: Amount of recent latencies the percentile is computed over
+    :type window_size: int
+    :param min_samples: Amount of latencies that has to be recorded before the percentile is used
+    :type min_samples: int
+    :param budget: Limits the amount of hedges relative to the amount of requests. Defaults to 10% of the requests.
+    :type budget: kong.retry.RetryBudget
+    :param retry_status_codes: Status codes of failed responses. When the first attempt to complete fails with one of
+        these (or with an error), the response of the other attempt is awaited instead.
+    :type retry_status_codes: frozenset
+    """
+    def __init__(self, percentile=95.0, min_delay=0.005, max_delay=2.0, window_size=1000, min_samples=20,
+                 budget=None, retry_status_codes=RETRYABLE_STATUS_CODES, clock=monotonic):
+        assert 0 < percentile < 100 and 0 <= min_delay <= max_delay
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.budget = budget or RetryBudget(ratio=0.1, min_retries_per_second=1.0, capacity=10)
+        self.retry_status_codes = retry_status_codes
+        self.latencies = LatencyTracker(window_size)
+        self._clock = clock
+        self._pool = _WorkerPool()
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+
+    def get_delay(self):
+        """
+        :rtype: float
+        :return: The amount of seconds after which a request is hedged
+        """
+        if len(self.latencies) < self.min_samples:
+            return self.max_delay
+        return min(self.max_delay, max(self.min_delay, self.latencies.percentile(self.percentile)))
+
+    def call(self, send):
+        """
+        Sends a request through ``requests``, hedging it when it is slow.
+
+        :param send: Callable without arguments that sends the request. It is called from background threads.
+        :rtype: requests.Response
+        """
+        with self._lock:
+            self.requests += 1
+        self.budget.deposit()
+
+        results = queue.Queue()
+        state = {'done': False}
+        lock = threading.Lock()
+
+        def _attempt(index):
+            started_at = self._clock()
+            try:
+                result = (index, send(), None)
+                self.latencies.record(self._clock() - started_at)
+            except Exception:
+                result = (index, None, sys.exc_info())
+
+            with lock:
+                if not state['done']:
+                    results.put(result)
+                    return
+            if result[1] is not None:
+                # Another attempt won: cancel this one
+                result[1].close()
+
+        self._pool.submit(_attempt, 0)
+        in_flight = 1
+        try:
+            result = results.get(timeout=self.get_delay())
+        except queue.Empty:
+            if self.budget.withdraw():
+                with self._lock:
+                    self.hedges += 1
+                self._pool.submit(_attempt, 1)
+                in_flight += 1
+            else:
+                with self._lock:
+                    self.budget_exhausted += 1
+            result = results.get()
+        in_flight -= 1
+
+        # Fall back to the other attempt when the first one to complete failed
+        if in_flight and self._failed(result):
+            other_result = results.get()
+            if not self._failed(other_result) or result[1] is None:
+                result, other_result = other_result, result
+            if other_result[1] is not None:
+                other_result[1].close()
+
+        with lock:
+            state['done'] = True
+        while True:
+            try:
+                late_response = results.get_nowait()[1]
+            except queue.Empty:
+                break
+            if late_response is not None:
+                late_response.close()
+
+        index, response, exc_info = result
+        if exc_info is not None:
+            six.reraise(*exc_info)
+        if index > 0:
+            with self._lock:
+                self.hedge_wins += 1
+        return response
+
+    def _failed(self, result):
+        return result[2] is not None or result[1].status_code in self.retry_status_codes
+
+    def stats(self):
+        """
+        :rtype: dict
+        :return: Dictionary containing the amount of requests, of hedges sent and won, and of requests that were not
+            hedged because the budget was exhausted, along with the current hedge delay
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins,
+                'budget_exhausted': self.budget_exhausted,
+                'delay': self.get_delay(),
+            }
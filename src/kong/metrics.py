@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import bisect
+import threading
+import weakref
+
+from requests.adapters import HTTPAdapter
+
+from .compat import urlparse
+from .constants import APIS, PLUGINS, CONSUMERS, KEY_AUTH, BASIC_AUTH, OAUTH2
+
+# Upper bounds (in seconds) of the buckets of the latency histograms
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+RESOURCES = frozenset([APIS, PLUGINS, CONSUMERS, KEY_AUTH, BASIC_AUTH, OAUTH2])
+
+# Operation of a request, by HTTP method, depending on whether it targets a collection or a single entity
+COLLECTION_OPERATIONS = {'GET': 'list', 'POST': 'create', 'PUT': 'create_or_update', 'DELETE': 'delete'}
+ENTITY_OPERATIONS = {'GET': 'retrieve', 'PATCH': 'update', 'PUT': 'create_or_update', 'DELETE': 'delete'}
+
+# Amount of requests sent over every socket, to tell new connections from reused ones
+_socket_requests = weakref.WeakKeyDictionary()
+_socket_requests_lock = threading.Lock()
+
+
+def track_connection_reuse(response):
+    """
+    Registers a request on the connection its response was received on. Has to be called before the body of the
+      response is read, as the connection is returned to the pool afterwards.
+
+    :type response: requests.Response
+    :rtype: bool
+    :return: Whether the connection had been used for earlier requests, or None if that cannot be determined
+    """
+    connection = getattr(response.raw, '_connection', None)
+    sock = getattr(connection, 'sock', None)
+    if sock is None:
+        return None
+
+    with _socket_requests_lock:
+        count = _socket_requests.get(sock, 0)
+        _socket_requests[sock] = count + 1
+    return count > 0
+
+
+class ConnectionTrackingHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that sets ``connection_reused`` on every response (see ``track_connection_reuse``).
+    """
+    def send(self, request, *args, **kwargs):
+        response = super(ConnectionTrackingHTTPAdapter, self).send(request, *args, **kwargs)
+        response.connection_reused = track_connection_reuse(response)
+        return response
+
+
+def describe_request(method, url):
+    """
+    :param method: HTTP method of a request to the admin API
+    :param url: URL of the request
+    :rtype: tuple
+    :return: The resource the request operates on (like ``'consumers'`` or ``'key-auth'``), and the operation (like
+        ``'list'`` or ``'retrieve'``)
+    """
+    segments = [segment for segment in urlparse(url).path.split('/') if segment]
+    for index in range(len(segments) - 1, -1, -1):
+        if segments[index] in RESOURCES:
+            operations = ENTITY_OPERATIONS if index < len(segments) - 1 else COLLECTION_OPERATIONS
+            return segments[index], operations.get(method, method.lower())
+    return 'unknown', method.lower()
+
+
+class RequestMetrics(object):
+    """
+    Measurements of a single call of ``RestClient.request``, including all of its retries. Handed to every request
+      hook of the client.
+
+    :ivar resource: The resource the request operates on, like ``'consumers'``
+    :ivar operation: The operation, like ``'create'``, ``'list'`` or ``'count'``
+    :ivar method: HTTP method
+    :ivar url: URL of the request, as built by the client (before load balancing)
+    :ivar status_code: Status code of the response, or None if the request failed
+    :ivar error: Name of the class of the exception raised by the request, if any
+    :ivar latency: Amount of seconds the request (including retries) took
+    :ivar request_bytes: Size of the request body
+    :ivar response_bytes: Size of the response body, or None if it was streamed and its size is unknown
+    :ivar retries: Amount of times the request was retried
+    :ivar connection_reused: Whether the response was received over a connection that was used before, or None if
+        unknown
+    """
+    __slots__ = ('resource', 'operation', 'method', 'url', 'status_code', 'error', 'latency', 'request_bytes',
+                 'response_bytes', 'retries', 'connection_reused')
+
+    def __init__(self, resource, operation, method, url, status_code=None, error=None, latency=0.0, request_bytes=0,
+                 response_bytes=None, retries=0, connection_reused=None):
+        self.resource = resource
+        self.operation = operation
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.error = error
+        self.latency = latency
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+        self.retries = retries
+        self.connection_reused = connection_reused
+
+    @property
+    def outcome(self):
+        """
+        :return: The status code, or the name of the error if the request failed
+        """
+        return self.error if self.status_code is None else self.status_code
+
+    def __repr__(self):
+        return '<RequestMetrics %s %s %s in %.3fs>' % (self.operation, self.resource, self.outcome, self.latency)
+
+
+class Histogram(object):
+    """
+    Cumulative histogram, like a Prometheus histogram. Not thread-safe by itself.
+
+    :param buckets: Sorted upper bounds of the buckets
+    """
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        """
+        :rtype: list
+        :return: Tuples of every upper bound (ending with ``float('inf')``) and the amount of values up to it
+        """
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class MetricsCollector(object):
+    """
+    In-process collector of request metrics. Pass it as a request hook:
+
+        collector = MetricsCollector()
+        client = KongAdminClient('http://localhost:8001', request_hooks=[collector])
+        ...
+        print(export_prometheus(collector))
+
+    :param buckets: Upper bounds of the buckets of the latency histograms, in seconds
+    """
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self.requests = {}  # (resource, operation, outcome) -> count
+        self.latencies = {}  # (resource, operation) -> Histogram
+        self.request_bytes = {}  # (resource, operation) -> bytes
+        self.response_bytes = {}  # (resource, operation) -> bytes
+        self.retries = {}  # (resource, operation) -> count
+        self.connections = {}  # reused -> count
+
+    def __call__(self, metrics):
+        self.record(metrics)
+
+    def record(self, metrics):
+        """
+        :type metrics: RequestMetrics
+        """
+        key = (metrics.resource, metrics.operation)
+        with self._lock:
+            outcome_key = key + (metrics.outcome,)
+            self.requests[outcome_key] = self.requests.get(outcome_key, 0) + 1
+
+            histogram = self.latencies.get(key)
+            if histogram is None:
+                histogram = self.latencies[key] = Histogram(self.buckets)
+            histogram.observe(metrics.latency)
+
+            self.request_bytes[key] = self.request_bytes.get(key, 0) + metrics.request_bytes
+            if metrics.response_bytes is not None:
+                self.response_bytes[key] = self.response_bytes.get(key, 0) + metrics.response_bytes
+            if metrics.retries:
+                self.retries[key] = self.retries.get(key, 0) + metrics.retries
+            if metrics.connection_reused is not None:
+                self.connections[metrics.connection_reused] = self.connections.get(metrics.connection_reused, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            for values in (self.requests, self.latencies, self.request_bytes, self.response_bytes, self.retries,
+                           self.connections):
+                values.clear()
+
+
+def _format_labels(**labels):
+    return '{%s}' % ','.join('%s="%s"' % (name, _escape_label_value(labels[name])) for name in sorted(labels))
+
+
+def _escape_label_value(value):
+    return ('%s' % value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else '%d' % value
+
+
+def export_prometheus(collector, namespace='kong_client'):
+    """
+    Renders the metrics of a collector in the Prometheus text exposition format.
+
+    :type collector: MetricsCollector
+    :param namespace: Prefix of the metric names
+    :rtype: six.text_type
+    """
+    lines = []
+
+    def _family(name, metric_type, help_text):
+        lines.append('# HELP %s_%s %s' % (namespace, name, help_text))
+        lines.append('# TYPE %s_%s %s' % (namespace, name, metric_type))
+
+    def _sample(name, value, **labels):
+        lines.append('%s_%s%s %s' % (namespace, name, _format_labels(**labels) if labels else '', _format_value(value)))
+
+    with collector._lock:
+        _family('requests_total', 'counter', 'Requests sent to the Kong admin API.')
+        for (resource, operation, outcome), count in sorted(collector.requests.items(), key=repr):
+            _sample('requests_total', count, resource=resource, operation=operation, status=outcome)
+
+        _family('request_duration_seconds', 'histogram',
+                'Latency of requests to the Kong admin API, including retries.')
+        for (resource, operation), histogram in sorted(collector.latencies.items()):
+            for bound, count in histogram.cumulative_counts():
+                _sample('request_duration_seconds_bucket', count, resource=resource, operation=operation,
+                        le=_format_value(bound))
+            _sample('request_duration_seconds_sum', histogram.sum, resource=resource, operation=operation)
+            _sample('request_duration_seconds_count', histogram.count, resource=resource, operation=operation)
+
+        _family('request_bytes_total', 'counter', 'Size of the bodies of requests to the Kong admin API.')
+        for (resource, operation), size in sorted(collector.request_bytes.items()):
+            _sample('request_bytes_total', size, resource=resource, operation=operation)
+
+        _family('response_bytes_total', 'counter', 'Size of the bodies of responses of the Kong admin API.')
+        for (resource, operation), size in sorted(collector.response_bytes.items()):
+            _sample('response_bytes_total', size, resource=resource, operation=operation)
+
+        _family('retries_total', 'counter', 'Retried requests to the Kong admin API.')
+        for (resource, operation), count in sorted(collector.retries.items()):
+            _sample('retries_total', count, resource=resource, operation=operation)
+
+        _family('connections_total', 'counter', 'Responses by whether their connection was reused.')
+        for reused, count in sorted(collector.connections.items()):
+            _sample('connections_total', count, reused='true' if reused else 'false')
+
+    return '\n'.join(lines) + '\n'
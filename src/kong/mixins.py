@@ -4,30 +4,138 @@ from abc import ABCMeta, abstractmethod
 
 from six import with_metaclass
 
+from .constants import MAX_PAGE_SIZE
 from .utils import parse_query_parameters
+from .concurrency import run_concurrently, prefetch as prefetch_iterator
 
 
 class CollectionMixin(with_metaclass(ABCMeta, object)):
     @abstractmethod
-    def list(self, size=100, offset=None, **filter_fields):
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
         """
         :param size: A limit on the number of objects to be returned.
         :type size: int
         :param offset: A cursor used for pagination. offset is an object identifier that defines a place in the list.
         :type offset: uuid.UUID
+        :param stream: Whether to decode the objects one at a time, while the response is being received. The result
+            is a ``kong.streaming.StreamingPage`` whose ``data`` can only be iterated once.
+        :type stream: bool
         :param filter_fields: Dictionary containing values to filter for
         :type filter_fields: dict
         :rtype: dict
         :return: Dictionary containing dictionaries
         """
 
-    def iterate(self, window_size=10, **filter_fields):
+    def iterate(self, window_size=10, prefetch=0, page_sizer=None, stream=False, **filter_fields):
+        """
+        :param window_size: The amount of objects requested per page
+        :type window_size: int
+        :param prefetch: The amount of pages to request ahead in a background thread, while the caller is still
+            processing the current page. At most ``prefetch`` pages are buffered. 0 disables prefetching.
+        :type prefetch: int
+        :param page_sizer: When given, it determines the size of every page instead of ``window_size``, based on the
+            latency and payload size of the pages fetched before
+        :type page_sizer: kong.pagination.AdaptivePageSizer
+        :param stream: Whether to yield every object as soon as it has been received, instead of decoding a page as a
+            whole first. Only a single object is held in memory at a time. Cannot be combined with ``prefetch`` or
+            ``page_sizer``, which both require complete pages.
+        :type stream: bool
+        :param filter_fields: Dictionary containing values to filter for
+        :type filter_fields: dict
+        :rtype: collections.Iterator
+        :return: Iterator over all objects in the collection
+        """
+        assert not stream or (not prefetch and page_sizer is None), \
+            'stream cannot be combined with prefetch or page_sizer'
+
+        pages = self._iterate_pages(window_size, page_sizer, filter_fields, stream=stream)
+        if prefetch > 0:
+            pages = prefetch_iterator(pages, depth=prefetch)
+
+        for page in pages:
+            for item in page:
+                yield item
+
+    def count_by_paging(self, estimate=False, **filter_fields):
+        """
+        Counts the objects in the collection by paging through it, using the largest page size Kong accepts. Pages are
+          discarded as soon as they have been counted.
+
+        :param estimate: Whether to stop after the first page, and return the amount of objects on it. This is a lower
+            bound of the actual amount.
+        :type estimate: bool
+        :param filter_fields: Dictionary containing values to filter for
+        :type filter_fields: dict
+        :rtype: int
+        :return: Amount of objects
+        """
+        amount = 0
+        for page in self._iterate_pages(MAX_PAGE_SIZE, None, filter_fields):
+            amount += len(page)
+            if estimate:
+                break
+        return amount
+
+    def _iterate_pages(self, window_size, page_sizer, filter_fields, stream=False):
         current_offset = None
         while True:
-            response = self.list(size=window_size, offset=current_offset, **filter_fields)
-            for item in response['data']:
-                yield item
+            if page_sizer is None:
+                response = self.list(size=window_size, offset=current_offset, stream=stream, **filter_fields)
+            else:
+                size = page_sizer.size
+                started_at = page_sizer.clock()
+                response = self.list(size=size, offset=current_offset, **filter_fields)
+                page_sizer.record(size, response['data'], page_sizer.clock() - started_at)
+            yield response['data']
             next_url = response.get('next', None)
             if next_url is None:
                 return
             current_offset = parse_query_parameters(next_url).get('offset')[0]
+
+
+class BulkMixin(object):
+    """
+    Concurrent counterparts of ``create``, ``update`` and ``delete``. Every item is processed independently, so a
+      failure does not abort the remaining items. The outcome of each item is returned as a ``BulkResult``.
+    """
+    def create_many(self, items, max_workers=None, controller=None):
+        """
+        :param items: Iterable of dictionaries containing the keyword arguments for ``create``
+        :type items: collections.Iterable
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :param controller: Adapts the amount of concurrent requests to the health of the Kong cluster
+        :type controller: kong.concurrency.AdaptiveConcurrencyController
+        :rtype: list
+        :return: List of BulkResult instances, in the same order as ``items``
+        """
+        return run_concurrently(lambda fields: self.create(**fields), items, max_workers=max_workers,
+                                controller=controller)
+
+    def update_many(self, items, max_workers=None, controller=None):
+        """
+        :param items: Iterable of (id, fields) tuples, where fields is a dictionary containing the keyword arguments for
+            ``update``
+        :type items: collections.Iterable
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :param controller: Adapts the amount of concurrent requests to the health of the Kong cluster
+        :type controller: kong.concurrency.AdaptiveConcurrencyController
+        :rtype: list
+        :return: List of BulkResult instances, in the same order as ``items``
+        """
+        return run_concurrently(lambda item: self.update(item[0], **item[1]), items, max_workers=max_workers,
+                                controller=controller)
+
+    def delete_many(self, ids, max_workers=None, controller=None):
+        """
+        :param ids: Iterable of identifiers accepted by ``delete``
+        :type ids: collections.Iterable
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :param controller: Adapts the amount of concurrent requests to the health of the Kong cluster
+        :type controller: kong.concurrency.AdaptiveConcurrencyController
+        :rtype: list
+        :return: List of BulkResult instances, in the same order as ``ids``
+        """
+        return run_concurrently(self.delete, ids, max_workers=max_workers, controller=controller)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import json
+import threading
+
+from .constants import MAX_PAGE_SIZE
+from .ratelimit import monotonic
+
+
+class AdaptivePageSizer(object):
+    """
+    Tunes the page size of ``CollectionMixin.iterate`` to the observed latency and payload size of every page.
+
+    The page size doubles (up to ``max_size``) while full pages arrive in less than half of ``target_latency`` and
+      their payload stays below half of ``max_payload_bytes``. It halves (down to ``min_size``) as soon as a page
+      exceeds either of them. The payload size is estimated from the serialized size of the first entity of a page, so
+      measuring it does not require access to the raw response.
+
+    :param initial_size: The page size of the first page
+    :type initial_size: int
+    :param min_size: Lower bound for the page size
+    :type min_size: int
+    :param max_size: Upper bound for the page size. Capped at the largest page size accepted by Kong.
+    :type max_size: int
+    :param target_latency: Amount of seconds a single page is allowed to take
+    :type target_latency: float
+    :param max_payload_bytes: Estimated amount of bytes a single page is allowed to contain (None to disable)
+    :type max_payload_bytes: int
+    """
+    def __init__(self, initial_size=100, min_size=10, max_size=MAX_PAGE_SIZE, target_latency=1.0,
+                 max_payload_bytes=4 * 1024 * 1024, growth_factor=2.0, shrink_factor=0.5, clock=monotonic):
+        max_size = min(max_size, MAX_PAGE_SIZE)
+        assert 1 <= min_size <= initial_size <= max_size
+        assert growth_factor > 1 and 0 < shrink_factor < 1
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency = target_latency
+        self.max_payload_bytes = max_payload_bytes
+        self.growth_factor = growth_factor
+        self.shrink_factor = shrink_factor
+        self.clock = clock
+
+        self._size = initial_size
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        """
+        :rtype: int
+        :return: The page size to request next
+        """
+        return self._size
+
+    def record(self, size, items, latency):
+        """
+        Adjusts the page size to a page that has been fetched.
+
+        :param size: The page size that was requested
+        :type size: int
+        :param items: The entities of the page
+        :type items: list
+        :param latency: The amount of seconds it took to fetch the page
+        :type latency: float
+        """
+        payload_bytes = estimate_payload_bytes(items) if self.max_payload_bytes is not None else 0
+
+        with self._lock:
+            if latency > self.target_latency or \
+                    (self.max_payload_bytes is not None and payload_bytes > self.max_payload_bytes):
+                self._size = max(self.min_size, int(size * self.shrink_factor))
+            elif len(items) >= size and latency * 2 <= self.target_latency and \
+                    (self.max_payload_bytes is None or payload_bytes * 2 <= self.max_payload_bytes):
+                self._size = min(self.max_size, int(size * self.growth_factor))
+
+    def __repr__(self):
+        return '<AdaptivePageSizer size=%s>' % self.size
+
+
+def estimate_payload_bytes(items):
+    """
+    :param items: List of entities
+    :type items: list
+    :rtype: int
+    :return: Estimate of the amount of bytes the entities take up in a JSON response
+    """
+    if not items:
+        return 0
+    return len(json.dumps(items[0])) * len(items)
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import cProfile
+import functools
+import pstats
+import threading
+from contextlib import contextmanager
+
+import six
+
+from .mixins import CollectionMixin
+from .contract import PluginAdminContract
+from .ratelimit import monotonic
+
+# Phases the time of a client method call is attributed to
+URL_BUILDING = 'url'
+HEADERS = 'headers'
+TRANSPORT = 'transport'
+DECODE = 'decode'
+DISPATCH = 'dispatch'
+PHASES = (URL_BUILDING, HEADERS, TRANSPORT, DECODE, DISPATCH)
+
+
+class _Timing(object):
+    __slots__ = ('count', 'total')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+
+    def as_dict(self):
+        return {
+            'calls': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+        }
+
+
+class _CallFrame(object):
+    __slots__ = ('phases', 'children')
+
+    def __init__(self):
+        self.phases = 0.0
+        self.children = 0.0
+
+
+class Profiler(object):
+    """
+    Thread-safe profiler that attributes the time spent in client method calls to phases: URL building, header merge,
+      transport (sending the request, including retries, balancing and waiting for the response), JSON decode, and
+      dispatch (everything else, like validating arguments and interpreting the response).
+
+        profiler = Profiler()
+        client = KongAdminClient('http://localhost:8001', profiler=profiler)
+        ...
+        print(profiler.report())
+
+    Time spent in a nested method call is attributed to the phases of the nested call only. Phases of hedged attempts
+      run in other threads, so the caller's wait for them is attributed to transport as usual.
+
+    :param cprofile: Whether method calls should also be run under ``cProfile``, to rank the functions they spend
+        their time in. Only one call is profiled at a time (calls made meanwhile by other threads are only timed), as
+        ``cProfile`` is expensive and cannot profile several threads at once on every Python version.
+    :type cprofile: bool
+    """
+    def __init__(self, cprofile=False, clock=monotonic):
+        self.cprofile = cprofile
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cprofile_lock = threading.Lock()
+        self._phases = {}  # phase -> _Timing
+        self._calls = {}  # method -> _Timing
+        self._pstats = None
+        self.profiled_calls = 0
+
+    def _get_stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, timings, name, elapsed):
+        with self._lock:
+            timing = timings.get(name)
+            if timing is None:
+                timing = timings[name] = _Timing()
+            timing.add(elapsed)
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Context manager that attributes the time spent in it to the phase ``name``.
+        """
+        started_at = self._clock()
+        try:
+            yield
+        finally:
+            elapsed = self._clock() - started_at
+            self._record(self._phases, name, elapsed)
+            stack = self._get_stack()
+            if stack:
+                stack[-1].phases += elapsed
+
+    @contextmanager
+    def call(self, name):
+        """
+        Context manager that times a method call named ``name`` (like ``'ConsumerAdminClient.create'``), and
+          attributes the time that is not spent in any phase to dispatch.
+        """
+        stack = self._get_stack()
+        frame = _CallFrame()
+        stack.append(frame)
+
+        profile = None
+        if self.cprofile and len(stack) == 1 and self._cprofile_lock.acquire(False):
+            profile = cProfile.Profile()
+            profile.enable()
+
+        started_at = self._clock()
+        try:
+            yield
+        finally:
+            elapsed = self._clock() - started_at
+            if profile is not None:
+                profile.disable()
+                self._add_profile(profile)
+                self._cprofile_lock.release()
+
+            stack.pop()
+            if stack:
+                stack[-1].children += elapsed
+            self._record(self._calls, name, elapsed)
+            self._record(self._phases, DISPATCH, max(0.0, elapsed - frame.phases - frame.children))
+
+    def _add_profile(self, profile):
+        with self._lock:
+            self.profiled_calls += 1
+            if self._pstats is None:
+                self._pstats = pstats.Stats(profile, stream=six.StringIO())
+            else:
+                self._pstats.add(profile)
+
+    def stats(self):
+        """
+        :rtype: dict
+        :return: Dictionary containing the amount of calls, the total amount of seconds and the mean amount of seconds
+            per call, by phase (``'phases'``) and by method (``'calls'``)
+        """
+        with self._lock:
+            return {
+                'phases': dict((name, timing.as_dict()) for name, timing in self._phases.items()),
+                'calls': dict((name, timing.as_dict()) for name, timing in self._calls.items()),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._phases.clear()
+            self._calls.clear()
+            self._pstats = None
+            self.profiled_calls = 0
+
+    def report(self, limit=20):
+        """
+        :param limit: Maximum amount of methods (and of functions, with ``cprofile``) that are listed
+        :type limit: int
+        :rtype: six.text_type
+        :return: Human readable report, ranking phases and methods by the total amount of time spent in them
+        """
+        stats = self.stats()
+        phases = sorted(stats['phases'].items(), key=lambda item: -item[1]['total'])
+        calls = sorted(stats['calls'].items(), key=lambda item: -item[1]['total'])[:limit]
+        grand_total = sum(timing['total'] for _, timing in phases) or 1.0
+
+        lines = ['%-12s %10s %12s %12s %8s' % ('Phase', 'Calls', 'Total (s)', 'Mean (ms)', 'Share')]
+        for name, timing in phases:
+            lines.append('%-12s %10d %12.6f %12.4f %7.1f%%' % (
+                name, timing['calls'], timing['total'], timing['mean'] * 1000, 100 * timing['total'] / grand_total))
+
+        width = max([len('Method')] + [len(name) for name, _ in calls])
+        lines.append('')
+        lines.append('%-*s %10s %12s %12s' % (width, 'Method', 'Calls', 'Total (s)', 'Mean (ms)'))
+        for name, timing in calls:
+            lines.append('%-*s %10d %12.6f %12.4f' % (
+                width, name, timing['calls'], timing['total'], timing['mean'] * 1000))
+
+        with self._lock:
+            if self._pstats is not None:
+                stream = six.StringIO()
+                self._pstats.stream = stream
+                self._pstats.sort_stats('cumulative').print_stats(limit)
+                lines.append('')
+                lines.append('cProfile of %d calls, by cumulative time:' % self.profiled_calls)
+                lines.append(stream.getvalue().strip('\n'))
+
+        return '\n'.join(lines) + '\n'
+
+
+def profiled(func):
+    """
+    Decorator for client methods, which profiles every call under a name made of the client class and the method (like
+      ``ConsumerAdminClient.create``) when the client has a profiler.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        profiler = self.profiler
+        if profiler is None:
+            return func(self, *args, **kwargs)
+
+        with profiler.call('%s.%s' % (self.__class__.__name__, func.__name__)):
+            return func(self, *args, **kwargs)
+    return wrapper
+
+
+class ProfiledAdmin(object):
+    """
+    Proxy that profiles every call of a public method of an admin (like a simulator), including the admins it hands
+      out (like ``consumers.key_auth(...)``). All of their time is attributed to dispatch.
+
+    :param admin: Admin whose calls are profiled
+    :type profiler: Profiler
+    """
+    def __init__(self, admin, profiler):
+        self._admin = admin
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        attribute = getattr(self._admin, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        call_name = '%s.%s' % (self._admin.__class__.__name__, name)
+
+        @functools.wraps(attribute)
+        def wrapper(*args, **kwargs):
+            with self._profiler.call(call_name):
+                result = attribute(*args, **kwargs)
+            if isinstance(result, (CollectionMixin, PluginAdminContract)):
+                return ProfiledAdmin(result, self._profiler)
+            return result
+        return wrapper
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import time
+import threading
+
+from .compat import urlparse
+from .metrics import ConnectionTrackingHTTPAdapter
+
+try:
+    monotonic = time.monotonic
+except AttributeError:  # pragma: no cover
+    monotonic = time.time
+
+
+class TokenBucket(object):
+    """
+    Thread-safe token bucket. Tokens are added at a constant ``rate`` up to ``capacity``, which allows short bursts
+      while enforcing the average rate.
+
+    Tokens are handed out as reservations: the bucket may go into debt, and every caller is told how long to wait
+      before its reservation becomes valid. This way concurrent callers are served in order of arrival, without having
+      to hold the lock while sleeping.
+
+    :param rate: Amount of tokens added per second
+    :type rate: float
+    :param capacity: Maximum amount of tokens in the bucket (the burst size). Defaults to ``max(1, rate)``.
+    :type capacity: float
+    :param clock: Function returning the current time in seconds
+    """
+    def __init__(self, rate, capacity=None, clock=monotonic):
+        assert rate > 0, 'rate should be positive'
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, self.rate))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._last_refill = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """
+        Takes ``tokens`` out of the bucket.
+
+        :rtype: float
+        :return: The amount of seconds the caller has to wait before it may proceed
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens=1):
+        """
+        Takes ``tokens`` out of the bucket, blocking until they are available.
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RateLimiter(object):
+    """
+    Maintains a separate ``TokenBucket`` for every host, so one slow or busy Kong node does not throttle the others.
+
+    :param rate: Maximum average amount of requests per second, per host
+    :type rate: float
+    :param burst: Maximum amount of requests that may be sent at once, per host. Defaults to ``max(1, rate)``.
+    :type burst: int
+    """
+    def __init__(self, rate, burst=None, clock=monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst, clock=self._clock)
+            return bucket
+
+    def reserve(self, url):
+        """
+        :rtype: float
+        :return: The amount of seconds to wait before a request to ``url`` may be sent
+        """
+        return self.get_bucket(url).reserve()
+
+    def acquire(self, url):
+        """
+        Blocks until a request to ``url`` may be sent.
+        """
+        self.get_bucket(url).acquire()
+
+
+class RateLimitingHTTPAdapter(ConnectionTrackingHTTPAdapter):
+    """
+    HTTPAdapter that consults a ``RateLimiter`` before every request it sends.
+    """
+    def __init__(self, rate_limiter, *args, **kwargs):
+        super(RateLimitingHTTPAdapter, self).__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+
+    def send(self, request, *args, **kwargs):
+        self.rate_limiter.acquire(request.url)
+        return super(RateLimitingHTTPAdapter, self).send(request, *args, **kwargs)
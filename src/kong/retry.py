@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import random
+import threading
+import time
+from email.utils import parsedate_tz, mktime_tz
+
+from requests.exceptions import ConnectionError, ConnectTimeout, Timeout
+
+try:
+    from urllib3.exceptions import NewConnectionError
+except ImportError:  # pragma: no cover
+    from requests.packages.urllib3.exceptions import NewConnectionError
+
+from .compat import TOO_MANY_REQUESTS, INTERNAL_SERVER_ERROR, BAD_GATEWAY, SERVICE_UNAVAILABLE, GATEWAY_TIMEOUT
+from .ratelimit import monotonic
+
+# Status codes of responses that are worth retrying
+RETRYABLE_STATUS_CODES = frozenset([TOO_MANY_REQUESTS, INTERNAL_SERVER_ERROR, BAD_GATEWAY, SERVICE_UNAVAILABLE,
+                                    GATEWAY_TIMEOUT])
+
+# Status codes of responses to requests that were refused without being processed, so even non-idempotent requests
+# can safely be retried
+REJECTED_STATUS_CODES = frozenset([TOO_MANY_REQUESTS, SERVICE_UNAVAILABLE])
+
+# HTTP methods whose requests can be sent several times without changing the outcome
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+# Errors raised by ``requests`` that are worth retrying
+RETRYABLE_ERRORS = (ConnectionError, Timeout)
+
+
+def is_connect_error(error):
+    """
+    :param error: An exception raised by ``requests``
+    :rtype: bool
+    :return: Whether the error occurred while connecting, so the request has not been sent at all
+    """
+    if isinstance(error, ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def parse_retry_after(value, clock=time.time):
+    """
+    :param value: Value of a ``Retry-After`` header: either an amount of seconds, or an HTTP date
+    :rtype: float
+    :return: The amount of seconds to wait, or None if the value cannot be parsed
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        return None
+    return max(0.0, mktime_tz(parsed) - clock())
+
+
+class RetryBudget(object):
+    """
+    Caps retries at a fraction of the requests sent, so retries cannot multiply the load on a Kong cluster that is
+      already struggling. Every request deposits ``ratio`` tokens (up to ``capacity``), and every retry withdraws one.
+      To let clients with little traffic retry at all, ``min_retries_per_second`` tokens are added over time as well.
+
+    :param ratio: Amount of retries allowed per request
+    :type ratio: float
+    :param min_retries_per_second: Amount of retries that is always allowed, regardless of the amount of requests
+    :type min_retries_per_second: float
+    :param capacity: Maximum amount of tokens that can be saved up
+    :type capacity: float
+    """
+    def __init__(self, ratio=0.2, min_retries_per_second=1.0, capacity=100.0, clock=monotonic):
+        assert ratio >= 0 and min_retries_per_second >= 0 and capacity >= 1
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._balance = min(self.capacity, 10.0)
+        self._last_refill = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def balance(self):
+        return self._balance
+
+    def deposit(self):
+        """
+        Registers a request.
+        """
+        with self._lock:
+            self._balance = min(self.capacity, self._balance + self.ratio)
+
+    def withdraw(self):
+        """
+        :rtype: bool
+        :return: Whether a retry is allowed
+        """
+        with self._lock:
+            now = self._clock()
+            self._balance = min(self.capacity, self._balance + (now - self._last_refill) * self.min_retries_per_second)
+            self._last_refill = now
+
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class RetryPolicy(object):
+    """
+    Decides which requests are retried, and when.
+
+    Requests are retried when they fail with a connection error or a timeout, or when Kong responds with one of the
+      ``retry_status_codes``. Only idempotent requests (see ``idempotent_methods``) are retried in general; other
+      requests are only retried when they were certainly not processed: when the connection could not be established,
+      or when Kong refused them with a 429 or 503.
+
+    The delay before every retry is drawn uniformly between 0 and ``base_delay * 2 ** (attempt - 1)`` (capped at
+      ``max_delay``), which is known as "full jitter". When Kong sends a ``Retry-After`` header along with a 429 or 503,
+      the request is not retried earlier than that.
+
+    :param max_attempts: Maximum amount of times a request is sent (1 disables retries)
+    :type max_attempts: int
+    :param base_delay: Upper bound of the delay before the first retry, in seconds
+    :type base_delay: float
+    :param max_delay: Upper bound of the delay before any retry, in seconds
+    :type max_delay: float
+    :param retry_status_codes: Status codes of responses that are retried
+    :param idempotent_methods: HTTP methods of requests that can safely be retried
+    :param budget: Limits the amount of retries relative to the amount of requests. Share a single budget between all
+        clients talking to the same Kong cluster.
+    :type budget: RetryBudget
+    :param respect_retry_after: Whether to honour ``Retry-After`` headers
+    :type respect_retry_after: bool
+    :param max_retry_after: Responses asking to wait longer than this amount of seconds are not retried at all
+    :type max_retry_after: float
+    """
+    def __init__(self, max_attempts=3, base_delay=1.0, max_delay=30.0, retry_status_codes=RETRYABLE_STATUS_CODES,
+                 idempotent_methods=IDEMPOTENT_METHODS, budget=None, respect_retry_after=True, max_retry_after=60.0,
+                 sleep=time.sleep):
+        assert max_attempts >= 1
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_status_codes = frozenset(retry_status_codes)
+        self.idempotent_methods = frozenset(idempotent_methods)
+        self.budget = budget
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.sleep = sleep
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.retries = 0
+        self.retries_by_reason = {}
+        self.exhausted = 0
+        self.budget_exhausted = 0
+
+    def is_idempotent(self, method):
+        return method.upper() in self.idempotent_methods
+
+    def get_backoff(self, attempt):
+        """
+        :param attempt: The number of the attempt that failed, starting at 1
+        :rtype: float
+        :return: The amount of seconds to wait before the next attempt
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def start(self):
+        """
+        Registers a new request (as opposed to a retry).
+        """
+        with self._lock:
+            self.requests += 1
+        if self.budget is not None:
+            self.budget.deposit()
+
+    def get_response_delay(self, attempt, idempotent, status_code, retry_after=None):
+        """
+        :param attempt: The number of the attempt that got the response, starting at 1
+        :param idempotent: Whether the request is idempotent
+        :param status_code: The status code of the response
+        :param retry_after: The value of the ``Retry-After`` header of the response, if any
+        :rtype: float
+        :return: The amount of seconds to wait before retrying, or None if the request should not be retried
+        """
+        if status_code not in self.retry_status_codes:
+            return None
+        if not idempotent and status_code not in REJECTED_STATUS_CODES:
+            return None
+
+        delay = self.get_backoff(attempt)
+        if self.respect_retry_after and status_code in REJECTED_STATUS_CODES:
+            retry_after = parse_retry_after(retry_after)
+            if retry_after is not None:
+                if retry_after > self.max_retry_after:
+                    return None
+                delay = max(delay, retry_after)
+
+        return self._allow(attempt, 'status:%d' % status_code, delay)
+
+    def get_error_delay(self, attempt, idempotent, error, connect_error=False):
+        """
+        :param attempt: The number of the attempt that failed, starting at 1
+        :param idempotent: Whether the request is idempotent
+        :param error: The exception raised by the attempt. It has to be one of the retryable errors of the transport.
+        :param connect_error: Whether the error occurred while connecting, before anything was sent
+        :rtype: float
+        :return: The amount of seconds to wait before retrying, or None if the request should not be retried
+        """
+        if not idempotent and not connect_error:
+            return None
+        return self._allow(attempt, error.__class__.__name__, self.get_backoff(attempt))
+
+    def call(self, method, send, idempotent=None):
+        """
+        Sends a request through ``requests``, retrying it according to this policy.
+
+        :param method: HTTP method of the request
+        :param send: Callable without arguments that sends the request
+        :param idempotent: Overrides whether the request is idempotent (derived from ``method`` by default)
+        :rtype: requests.Response
+        """
+        idempotent = self.is_idempotent(method) if idempotent is None else idempotent
+        self.start()
+
+        attempt = 1
+        while True:
+            try:
+                response = send()
+            except RETRYABLE_ERRORS as e:
+                delay = self.get_error_delay(attempt, idempotent, e, connect_error=is_connect_error(e))
+                if delay is None:
+                    raise
+            else:
+                delay = self.get_response_delay(attempt, idempotent, response.status_code,
+                                                response.headers.get('Retry-After'))
+                if delay is None:
+                    return response
+                response.close()
+
+            self.sleep(delay)
+            attempt += 1
+
+    def stats(self):
+        """
+        :rtype: dict
+        :return: Dictionary containing the amount of requests and retries, the amount of retries per reason (status
+            code or error), and the amount of requests that could not be retried because they ran out of attempts or
+            because the retry budget was exhausted
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'retries_by_reason': dict(self.retries_by_reason),
+                'exhausted': self.exhausted,
+                'budget_exhausted': self.budget_exhausted,
+            }
+
+    def _allow(self, attempt, reason, delay):
+        if attempt >= self.max_attempts:
+            with self._lock:
+                self.exhausted += 1
+            return None
+
+        if self.budget is not None and not self.budget.withdraw():
+            with self._lock:
+                self.budget_exhausted += 1
+            return None
+
+        with self._lock:
+            self.retries += 1
+            self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+        return delay
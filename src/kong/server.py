@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import argparse
+import io
+import json
+import threading
+
+import six
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from six.moves import socketserver
+from six.moves.http_client import responses
+from six.moves.BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+from .compat import OK, CREATED, NO_CONTENT, NOT_FOUND, BAD_REQUEST, CONFLICT, INTERNAL_SERVER_ERROR, urlparse, \
+    parse_qsl
+from .constants import APIS, PLUGINS, CONSUMERS, KEY_AUTH, BASIC_AUTH, OAUTH2
+from .exceptions import ConflictError
+from .simulator import KongAdminSimulator, PluginAdminSimulator
+from .utils import add_url_params, parse_query_parameters
+
+METHOD_NOT_ALLOWED = 405
+
+# Fields of APIs and plugin configurations that Kong parses as booleans
+BOOLEAN_FIELDS = frozenset(['strip_request_path', 'preserve_host', 'enabled'])
+
+CONFIG_PREFIX = 'config.'
+
+# Response of the root and of the status endpoint
+NODE_INFORMATION = {
+    'tagline': 'Welcome to Kong',
+    'version': '0.x (simulated)',
+}
+NODE_STATUS = {
+    'server': {
+        'connections_handled': 0,
+        'connections_accepted': 0,
+        'connections_active': 0,
+        'connections_reading': 0,
+        'connections_writing': 0,
+        'connections_waiting': 0,
+        'total_requests': 0,
+    },
+    'database': {},
+}
+
+
+def parse_boolean(value):
+    if isinstance(value, bool):
+        return value
+    return six.text_type(value).lower() in ('true', '1', 'yes', 'on')
+
+
+def parse_config_value(field, value):
+    """
+    :param field: Schema of a field of a plugin configuration, see ``PluginAdminSimulator.PLUGINS``
+    :type field: dict
+    :param value: Value of the field, as received in a form
+    :return: The value, converted to the type of the field
+    """
+    if not isinstance(value, six.string_types):
+        return value
+
+    field_type = field.get('type')
+    if field_type == 'boolean':
+        return parse_boolean(value)
+    elif field_type == 'number':
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+    elif field_type == 'array':
+        return [item for item in value.split(',') if item]
+    return value
+
+
+def parse_body(body, content_type=None):
+    """
+    :param body: Body of a request to the admin API, form or JSON encoded
+    :type body: bytes | six.text_type
+    :param content_type: Value of the ``Content-Type`` header of the request
+    :rtype: dict
+    """
+    if not body:
+        return {}
+    if isinstance(body, six.binary_type):
+        body = body.decode('utf-8')
+    if content_type and content_type.split(';')[0].strip() == 'application/json':
+        return json.loads(body)
+    return dict(parse_qsl(body, keep_blank_values=True))
+
+
+class AdminAPIDispatcher(object):
+    """
+    Answers requests to Kong's admin API from a ``KongAdminSimulator``, with the status codes and response bodies a real
+      Kong node would respond with. Requests are handled one at a time, as the simulator is not fully thread-safe.
+
+    :param simulator: The simulator holding the data. Defaults to an empty one.
+    :type simulator: kong.simulator.KongAdminSimulator
+    """
+    def __init__(self, simulator=None):
+        self.simulator = simulator or KongAdminSimulator()
+        self._lock = threading.RLock()
+
+    def dispatch(self, method, url, body=None, content_type=None):
+        """
+        :param method: HTTP method, like ``'GET'``
+        :param url: Absolute URL of the request. Pagination links in the response point to the same host.
+        :param body: Body of the request, form or JSON encoded
+        :type body: bytes | six.text_type
+        :param content_type: Value of the ``Content-Type`` header of the request
+        :rtype: tuple
+        :return: The status code and the body of the response (None if it has no body)
+        """
+        parsed_url = urlparse(url)
+        segments = [segment for segment in parsed_url.path.split('/') if segment]
+        query = dict(parse_qsl(parsed_url.query, keep_blank_values=True))
+        base_url = '%s://%s%s' % (parsed_url.scheme, parsed_url.netloc, parsed_url.path)
+
+        try:
+            data = parse_body(body, content_type)
+            with self._lock:
+                return self._route(method.upper(), segments, query, data, base_url)
+        except ConflictError as e:
+            return CONFLICT, {'message': six.text_type(e)}
+        except (ValueError, TypeError, AssertionError, KeyError) as e:
+            return BAD_REQUEST, {'message': six.text_type(e)}
+        except Exception as e:
+            return INTERNAL_SERVER_ERROR, {'message': six.text_type(e)}
+
+    def _route(self, method, segments, query, data, base_url):
+        if not segments or segments == ['status']:
+            if method != 'GET':
+                return METHOD_NOT_ALLOWED, {'message': 'Method not allowed'}
+            return OK, NODE_STATUS if segments else NODE_INFORMATION
+
+        resource, rest = segments[0], segments[1:]
+        if resource == APIS:
+            if len(rest) >= 2 and rest[1] == PLUGINS:
+                if self.simulator.apis.retrieve(rest[0]) is None:
+                    return NOT_FOUND, {'message': 'Not found'}
+                plugins = self.simulator.apis.plugins(rest[0])
+                plugin_name = data.get('name')
+                if plugin_name is None and len(rest) == 3:
+                    # Updates only carry the fields that change, so the schema is looked up by the existing entity
+                    existing = plugins.retrieve(rest[2])
+                    plugin_name = existing['name'] if existing is not None else None
+                return self._dispatch_collection(plugins, method, rest[2:], query,
+                                                 self._parse_plugin_configuration(data, plugin_name), base_url)
+            return self._dispatch_collection(self.simulator.apis, method, rest, query,
+                                             self._parse_fields(data), base_url)
+
+        if resource == CONSUMERS:
+            if len(rest) >= 2 and rest[1] in (BASIC_AUTH, KEY_AUTH, OAUTH2):
+                if self.simulator.consumers.retrieve(rest[0]) is None:
+                    return NOT_FOUND, {'message': 'Not found'}
+                credentials = {
+                    BASIC_AUTH: self.simulator.consumers.basic_auth,
+                    KEY_AUTH: self.simulator.consumers.key_auth,
+                    OAUTH2: self.simulator.consumers.oauth2,
+                }[rest[1]](rest[0])
+                return self._dispatch_collection(credentials, method, rest[2:], query, data, base_url)
+            return self._dispatch_collection(self.simulator.consumers, method, rest, query, data, base_url)
+
+        if resource == PLUGINS and method == 'GET':
+            if not rest:
+                return OK, {'enabled_plugins': list(self.simulator.plugins.list()['enabled_plugins'])}
+            if len(rest) == 2 and rest[1] == 'schema':
+                schema = self.simulator.plugins.retrieve_schema(rest[0])
+                if schema is None:
+                    return NOT_FOUND, {'message': 'Not found'}
+                return OK, schema
+
+        return NOT_FOUND, {'message': 'Not found'}
+
+    def _dispatch_collection(self, admin, method, rest, query, data, base_url):
+        if not rest:
+            if method == 'GET':
+                return OK, self._list(admin, query, base_url)
+            elif method == 'POST':
+                return CREATED, admin.create(**data)
+            elif method == 'PUT':
+                entity_id = data.pop('id', None)
+                if entity_id is None:
+                    return CREATED, admin.create(**data)
+                data.pop('plugin_name', None)
+                result = admin.update(entity_id, **data)
+                if result is None:
+                    return NOT_FOUND, {'message': 'Not found'}
+                return OK, result
+            return METHOD_NOT_ALLOWED, {'message': 'Method not allowed'}
+
+        if len(rest) != 1:
+            return NOT_FOUND, {'message': 'Not found'}
+
+        if method not in ('GET', 'PATCH', 'DELETE'):
+            return METHOD_NOT_ALLOWED, {'message': 'Method not allowed'}
+
+        entity = admin.retrieve(rest[0])
+        if entity is None:
+            return NOT_FOUND, {'message': 'Not found'}
+        elif method == 'GET':
+            return OK, entity
+        elif method == 'PATCH':
+            data.pop('plugin_name', None)
+            return OK, admin.update(rest[0], **data)
+
+        admin.delete(rest[0])
+        return NO_CONTENT, None
+
+    def _list(self, admin, query, base_url):
+        filter_fields = dict(query)
+        size = int(filter_fields.pop('size', 100))
+        offset = filter_fields.pop('offset', None)
+
+        result = dict(admin.list(size=size, offset=offset, **filter_fields))
+        if not filter_fields:
+            result['total'] = admin.count()
+
+        # The simulator does not know where it is served from, so its pagination links are rebuilt
+        if result.get('next') is not None:
+            next_offset = parse_query_parameters(result['next'])['offset'][0]
+            result['next'] = add_url_params(base_url, dict(query, size=size, offset=next_offset))
+        return result
+
+    @staticmethod
+    def _parse_fields(data):
+        return dict((key, parse_boolean(value) if key in BOOLEAN_FIELDS else value) for key, value in data.items())
+
+    @staticmethod
+    def _parse_plugin_configuration(data, plugin_name):
+        result = {}
+        schema = PluginAdminSimulator.PLUGINS.get(plugin_name, {}).get('fields', {})
+        for key, value in data.items():
+            if key == 'name':
+                result['plugin_name'] = value
+            elif key.startswith(CONFIG_PREFIX):
+                field = key[len(CONFIG_PREFIX):]
+                result[field] = parse_config_value(schema.get(field, {}), value)
+            elif key in BOOLEAN_FIELDS:
+                result[key] = parse_boolean(value)
+            else:
+                result[key] = value
+        return result
+
+
+def encode_response(payload):
+    """
+    :param payload: Body of a response of the admin API, or None
+    :rtype: bytes
+    """
+    return json.dumps(payload).encode('utf-8') if payload is not None else b''
+
+
+class SimulatorHTTPAdapter(BaseAdapter):
+    """
+    Transport adapter that answers admin API requests in-process, from a ``KongAdminSimulator``, instead of sending
+      them over the network. Mount it on the session of a client to run its complete code path (URL building,
+      encoding, retries, decoding and response dispatch) without any sockets, which isolates the overhead of the
+      client from network time:
+
+        client = KongAdminClient('http://kong:8001')
+        client.session.mount('http://kong:8001', SimulatorHTTPAdapter())
+
+    :param simulator: The simulator holding the data. Defaults to an empty one.
+    :type simulator: kong.simulator.KongAdminSimulator
+    """
+    def __init__(self, simulator=None):
+        super(SimulatorHTTPAdapter, self).__init__()
+        self.dispatcher = AdminAPIDispatcher(simulator)
+
+    @property
+    def simulator(self):
+        return self.dispatcher.simulator
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        body = request.body
+        if body is not None and not isinstance(body, (six.binary_type, six.text_type)):
+            body = b''.join(chunk if isinstance(chunk, six.binary_type) else chunk.encode('utf-8') for chunk in body)
+
+        status_code, payload = self.dispatcher.dispatch(
+            request.method, request.url, body=body, content_type=request.headers.get('Content-Type'))
+        content = encode_response(payload)
+
+        response = Response()
+        response.status_code = status_code
+        response.reason = responses.get(status_code)
+        response.headers = CaseInsensitiveDict({'Content-Length': str(len(content))})
+        if payload is not None:
+            response.headers['Content-Type'] = 'application/json; charset=utf-8'
+        response.encoding = 'utf-8'
+        response.raw = io.BytesIO(content)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.connection_reused = None
+        if not stream:
+            # Consumes the body, as requests does for responses that are not streamed
+            response.content
+        return response
+
+    def close(self):
+        pass
+
+
+class AdminAPIRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the admin API from the ``dispatcher`` of its server, over persistent HTTP/1.1 connections.
+    """
+    protocol_version = 'HTTP/1.1'
+    server_version = 'kong-simulator'
+    # Headers and body are written separately, which Nagle's algorithm would delay
+    disable_nagle_algorithm = True
+
+    def _read_body(self):
+        if 'chunked' in (self.headers.get('Transfer-Encoding') or '').lower():
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b';')[0].strip() or b'0', 16)
+                if size == 0:
+                    # Skip the trailers, up to the empty line ending the body
+                    while self.rfile.readline().strip():
+                        pass
+                    return b''.join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else None
+
+    def _handle(self):
+        body = self._read_body()
+        url = 'http://%s%s' % (self.headers.get('Host') or '%s:%s' % self.server.server_address[:2], self.path)
+
+        status_code, payload = self.server.dispatcher.dispatch(
+            self.command, url, body=body, content_type=self.headers.get('Content-Type'))
+
+        content = encode_response(payload)
+        self.send_response(status_code)
+        if payload is not None:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        if content:
+            self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+class SimulatorServer(socketserver.ThreadingMixIn, HTTPServer):
+    """
+    Local stand-in for a Kong node, serving a ``KongAdminSimulator`` over the admin API. ``KongAdminClient`` (and
+      everything built on it, like retries, load balancing and metrics) can be tested and benchmarked end-to-end
+      against it, on a single machine and without a datastore:
+
+        with SimulatorServer() as server:
+            client = KongAdminClient(server.url)
+            client.consumers.create(username='john')
+
+    :param simulator: The simulator holding the data. Defaults to an empty one.
+    :type simulator: kong.simulator.KongAdminSimulator
+    :param host: Address to listen on
+    :param port: Port to listen on. Defaults to a free port.
+    :type port: int
+    :param verbose: Whether every request should be logged to stderr
+    :type verbose: bool
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, simulator=None, host='127.0.0.1', port=0, verbose=False):
+        HTTPServer.__init__(self, (host, port), AdminAPIRequestHandler)
+        self.dispatcher = AdminAPIDispatcher(simulator)
+        self.verbose = verbose
+        self._thread = None
+
+    @property
+    def simulator(self):
+        return self.dispatcher.simulator
+
+    @property
+    def url(self):
+        """
+        :return: Base URL of the admin API served by this server
+        """
+        host, port = self.server_address[:2]
+        return 'http://%s:%d/' % (host, port)
+
+    def start(self):
+        """
+        Starts serving requests in a daemon thread, until ``stop`` is called.
+        """
+        assert self._thread is None, 'the server is running already'
+        self._thread = threading.Thread(target=self.serve_forever, name='kong-simulator-server')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Serves a simulated Kong admin API.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=8001, help='port to listen on (default: %(default)s)')
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    options = parser.parse_args(args)
+
+    server = SimulatorServer(host=options.host, port=options.port, verbose=options.verbose)
+    print('Serving a simulated Kong admin API on %s' % server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,16 +2,18 @@
 from __future__ import unicode_literals, print_function
 
 import uuid
-import copy
 import hashlib
+import threading
+
+from six.moves import range
 
 from .contract import KongAdminContract, APIPluginConfigurationAdminContract, APIAdminContract, ConsumerAdminContract, \
     PluginAdminContract, BasicAuthAdminContract, KeyAuthAdminContract, OAuth2AdminContract
 from .utils import timestamp, uuid_or_string, add_url_params, assert_dict_keys_in, ensure_trailing_slash
 from .compat import OrderedDict
 from .exceptions import ConflictError
-
-INVALID_FIELD_ERROR_TEMPLATE = '%r is not a valid field. Allowed fields: %r'
+from .profiling import ProfiledAdmin
+from .validation import INVALID_FIELD_ERROR_TEMPLATE
 
 
 def filter_api_struct(api_struct, filter_dict):
@@ -30,7 +32,7 @@ def filter_dict_list(list_of_dicts, **field_filter):
     def _filter(_dicts, key, value):
         return [d for d in _dicts if d[key] == value]
 
-    list_of_dicts = copy.copy(list_of_dicts)
+    list_of_dicts = list(list_of_dicts)
     for key in field_filter:
         list_of_dicts = _filter(list_of_dicts, key, field_filter[key])
 
@@ -38,15 +40,36 @@ def filter_dict_list(list_of_dicts, **field_filter):
 
 
 class SimulatorDataStore(object):
-    def __init__(self, api_url, data_struct_filter=None):
+    """
+    In-memory collection of entities, by id, in order of creation.
+
+    :param api_url: URL of the collection, used to build the links to next pages
+    :param data_struct_filter: Fields that are left out of the returned entities when they have the given value
+    :type data_struct_filter: dict
+    :param index_keys: Fields that entities are looked up by (for conflicts, or by ``retrieve``, ``update`` and
+        ``delete``) in constant time, instead of by scanning every entity. Entities without a value (None) for a field
+        are not indexed by it, and do not conflict with each other.
+    :type index_keys: tuple
+    """
+    def __init__(self, api_url, data_struct_filter=None, index_keys=None):
         self.api_url = api_url
         self._data_struct_filter = data_struct_filter or {}
         self._data = OrderedDict()
+        # Ids in order of creation (None where an entity was deleted), and their positions, to start pages at an offset
+        self._ids = []
+        self._positions = {}
+        # field -> value -> ids of the entities with that value, in the order they got it
+        self._indexes = dict((key, {}) for key in index_keys or ())
+        # Guards self._data and self._indexes, so the store can be used by the (concurrent) bulk operations
+        self._lock = threading.RLock()
 
     def destroy(self):
         self.api_url = None
         self._data_struct_filter = None
         self._data = None
+        self._ids = None
+        self._positions = None
+        self._indexes = None
 
     def count(self):
         return len(self._data.keys())
@@ -54,63 +77,75 @@ class SimulatorDataStore(object):
     def create(self, data_struct, check_conflict_keys=None):
         assert 'id' not in data_struct
 
-        # Prevent conflicts
-        if check_conflict_keys:
-            errors = []
-            for key in check_conflict_keys:
-                assert key in data_struct
+        with self._lock:
+            # Prevent conflicts
+            if check_conflict_keys:
+                errors = []
+                for key in check_conflict_keys:
+                    assert key in data_struct
 
-                existing_value = self._get_by_field(key, data_struct[key])
-                if existing_value is not None:
-                    errors.append('%s already exists with value \'%s\'' % (key, existing_value[key]))
-            if errors:
-                raise ConflictError(', '.join(errors))
+                    existing_value = self._get_by_field(key, data_struct[key])
+                    if existing_value is not None:
+                        errors.append('%s already exists with value \'%s\'' % (key, existing_value[key]))
+                if errors:
+                    raise ConflictError(', '.join(errors))
 
-        id = str(uuid.uuid4())
-        data_struct['id'] = id
+            id = str(uuid.uuid4())
+            data_struct['id'] = id
 
-        self._data[id] = data_struct
-        return filter_api_struct(data_struct, self._data_struct_filter)
+            self._data[id] = data_struct
+            self._positions[id] = len(self._ids)
+            self._ids.append(id)
+            self._add_to_indexes(data_struct)
+            return filter_api_struct(data_struct, self._data_struct_filter)
 
     def update(self, value_or_id, key, data_struct_update):
         value_or_id = uuid_or_string(value_or_id)
 
-        if value_or_id in self._data:
-            self._data[value_or_id].update(data_struct_update)
-            return filter_api_struct(self._data[value_or_id], self._data_struct_filter)
-
-        if key is not None:
-            for id in self._data:
-                if self._data[id][key] == value_or_id:
-                    self._data[id].update(data_struct_update)
-                    return filter_api_struct(self._data[id], self._data_struct_filter)
+        with self._lock:
+            id = self._get_id(value_or_id, key)
+            if id is not None:
+                data_struct = self._data[id]
+                self._remove_from_indexes(data_struct)
+                data_struct.update(data_struct_update)
+                self._add_to_indexes(data_struct)
+                return filter_api_struct(data_struct, self._data_struct_filter)
 
     def retrieve(self, value_or_id, key):
         value_or_id = uuid_or_string(value_or_id)
 
-        if value_or_id in self._data:
-            return filter_api_struct(self._data[value_or_id], self._data_struct_filter)
-
-        if key is not None:
-            for id in self._data:
-                if self._data[id][key] == value_or_id:
-                    return filter_api_struct(self._data[id], self._data_struct_filter)
+        with self._lock:
+            id = self._get_id(value_or_id, key)
+            if id is not None:
+                return filter_api_struct(self._data[id], self._data_struct_filter)
 
     def list(self, size, offset, **filter_fields):
-        data_list = [filter_api_struct(data_struct, self._data_struct_filter)
-                     for data_struct in filter_dict_list(self._data.values(), **filter_fields)]
-
-        offset_index = 0
-        if offset is not None:
-            keys = list([item['id'] for item in self._data.values()])
-            offset_index = keys.index(uuid_or_string(offset))
-
-        sliced_data = data_list[offset_index:offset_index + size]
+        with self._lock:
+            start = 0
+            if offset is not None:
+                offset = uuid_or_string(offset)
+                if offset not in self._positions:
+                    raise ValueError('Unknown offset: %s' % offset)
+                start = self._positions[offset]
+
+            # Entities are only visited from the offset on, until the page and the first entity of the next page have
+            #   been found, so paging through a collection takes linear time
+            matches = []
+            for position in range(start, len(self._ids)):
+                id = self._ids[position]
+                if id is None:
+                    continue
+                data_struct = self._data[id]
+                if all(data_struct[key] == value for key, value in filter_fields.items()):
+                    matches.append(data_struct)
+                    if len(matches) > size:
+                        break
+
+            sliced_data = [filter_api_struct(data_struct, self._data_struct_filter) for data_struct in matches[:size]]
 
         next_url = None
-        next_index = offset_index + size
-        if next_index < len(data_list):
-            next_offset = data_list[next_index]['id']
+        if len(matches) > size:
+            next_offset = matches[size]['id']
             next_url = add_url_params(self.api_url, {
                 'size': size,
                 'offset': next_offset
@@ -129,19 +164,62 @@ class SimulatorDataStore(object):
     def delete(self, value_or_id, key):
         value_or_id = uuid_or_string(value_or_id)
 
-        if value_or_id in self._data:
-            del self._data[value_or_id]
+        with self._lock:
+            if value_or_id in self._data:
+                self._pop(value_or_id)
+
+            if key is not None:
+                id = self._get_id_by_field(key, value_or_id)
+                if id is not None:
+                    self._pop(id)
+
+    def _pop(self, id):
+        self._remove_from_indexes(self._data.pop(id))
+        self._ids[self._positions.pop(id)] = None
 
+        # Compact the ids once most of them are deleted, which keeps deletes constant time on average
+        if len(self._ids) > 2 * len(self._positions) + 32:
+            self._ids = list(self._data.keys())
+            self._positions = dict((id, position) for position, id in enumerate(self._ids))
+
+    def _get_id(self, value_or_id, key):
+        if value_or_id in self._data:
+            return value_or_id
         if key is not None:
-            for id in self._data:
-                if self._data[id][key] == value_or_id:
-                    del self._data[id]
-                    break
+            return self._get_id_by_field(key, value_or_id)
 
-    def _get_by_field(self, field, value):
-        for data_struct in self._data.values():
+    def _get_id_by_field(self, field, value):
+        if value is None:
+            return None
+
+        index = self._indexes.get(field)
+        if index is not None:
+            ids = index.get(value)
+            return ids[0] if ids else None
+
+        for id, data_struct in self._data.items():
             if data_struct[field] == value:
-                return data_struct
+                return id
+
+    def _get_by_field(self, field, value):
+        id = self._get_id_by_field(field, value)
+        if id is not None:
+            return self._data[id]
+
+    def _add_to_indexes(self, data_struct):
+        for field, index in self._indexes.items():
+            value = data_struct.get(field)
+            if value is not None:
+                index.setdefault(value, []).append(data_struct['id'])
+
+    def _remove_from_indexes(self, data_struct):
+        for field, index in self._indexes.items():
+            value = data_struct.get(field)
+            ids = index.get(value)
+            if ids:
+                ids.remove(data_struct['id'])
+                if not ids:
+                    del index[value]
 
 
 class APIPluginConfigurationAdminSimulator(APIPluginConfigurationAdminContract):
@@ -150,6 +228,7 @@ class APIPluginConfigurationAdminSimulator(APIPluginConfigurationAdminContract):
         self.api_name_or_id = api_name_or_id
         self.api_url = api_url
         self._data = OrderedDict()
+        self._lock = threading.RLock()
 
     def destroy(self):
         self.api_admin = None
@@ -158,6 +237,10 @@ class APIPluginConfigurationAdminSimulator(APIPluginConfigurationAdminContract):
         self._data = None
 
     def create(self, plugin_name, enabled=None, consumer_id=None, **fields):
+        with self._lock:
+            return self._create(plugin_name, enabled=enabled, consumer_id=consumer_id, **fields)
+
+    def _create(self, plugin_name, enabled=None, consumer_id=None, **fields):
         plugins = PluginAdminSimulator.PLUGINS
 
         if plugin_name not in plugins.keys():
@@ -200,6 +283,10 @@ class APIPluginConfigurationAdminSimulator(APIPluginConfigurationAdminContract):
         return self.create(plugin_name, enabled=enabled, consumer_id=consumer_id, **fields)
 
     def update(self, plugin_id, enabled=None, consumer_id=None, **fields):
+        with self._lock:
+            return self._update(plugin_id, enabled=enabled, consumer_id=consumer_id, **fields)
+
+    def _update(self, plugin_id, enabled=None, consumer_id=None, **fields):
         current_plugin_id = None
         current_plugin_name = None
 
@@ -233,7 +320,11 @@ class APIPluginConfigurationAdminSimulator(APIPluginConfigurationAdminContract):
 
         return self._data[current_plugin_name]
 
-    def list(self, size=100, offset=None, **filter_fields):
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
+        with self._lock:
+            return self._list(size=size, offset=offset, **filter_fields)
+
+    def _list(self, size=100, offset=None, **filter_fields):
         data_list = [data_struct for data_struct in filter_dict_list(self._data.values(), **filter_fields)]
 
         offset_index = 0
@@ -265,13 +356,14 @@ class APIPluginConfigurationAdminSimulator(APIPluginConfigurationAdminContract):
     def delete(self, plugin_id):
         plugin_id = uuid_or_string(plugin_id)
 
-        if plugin_id in self._data:
-            del self._data[plugin_id]
+        with self._lock:
+            if plugin_id in self._data:
+                del self._data[plugin_id]
 
-        for plugin_name in self._data:
-            if self._data[plugin_name]['id'] == plugin_id:
-                del self._data[plugin_name]
-                break
+            for plugin_name in self._data:
+                if self._data[plugin_name]['id'] == plugin_id:
+                    del self._data[plugin_name]
+                    break
 
     def retrieve(self, plugin_id):
         plugin_id = uuid_or_string(plugin_id)
@@ -283,7 +375,7 @@ class APIPluginConfigurationAdminSimulator(APIPluginConfigurationAdminContract):
             if self._data[plugin_name]['id'] == plugin_id:
                 return self._data[plugin_name]
 
-    def count(self):
+    def count(self, estimate=False):
         return len(self._data.keys())
 
 
@@ -294,7 +386,8 @@ class APIAdminSimulator(APIAdminContract):
             data_struct_filter={
                 'request_host': None,
                 'request_path': None
-            })
+            },
+            index_keys=('name', 'request_host'))
         self._plugin_admins = {}
 
     def destroy(self):
@@ -306,7 +399,7 @@ class APIAdminSimulator(APIAdminContract):
             del self._plugin_admins[key]
         self._plugin_admins = None
 
-    def count(self):
+    def count(self, estimate=False):
         return self._store.count()
 
     def create(self, upstream_url, name=None, request_host=None, request_path=None, strip_request_path=False,
@@ -360,7 +453,7 @@ class APIAdminSimulator(APIAdminContract):
     def retrieve(self, name_or_id):
         return self._store.retrieve(name_or_id, 'name')
 
-    def list(self, size=100, offset=None, **filter_fields):
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
         assert_dict_keys_in(filter_fields, ['id', 'name', 'request_host', 'upstream_url'], INVALID_FIELD_ERROR_TEMPLATE)
         return self._store.list(size, offset, **filter_fields)
 
@@ -392,7 +485,8 @@ class BasicAuthAdminSimulator(BasicAuthAdminContract):
     def __init__(self, consumer_admin, consumer_id, api_url):
         self.consumer_admin = consumer_admin
         self.consumer_id = consumer_id
-        self._store = SimulatorDataStore(api_url or 'http://localhost:8001/consumers/%s/basicauth' % self.consumer_id)
+        self._store = SimulatorDataStore(
+            api_url or 'http://localhost:8001/consumers/%s/basicauth' % self.consumer_id, index_keys=('username',))
 
     def destroy(self):
         self.consumer_admin = None
@@ -424,7 +518,7 @@ class BasicAuthAdminSimulator(BasicAuthAdminContract):
     def update(self, basic_auth_id, **fields):
         return self._store.update(basic_auth_id, None, fields)
 
-    def list(self, size=100, offset=None, **filter_fields):
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
         return self._store.list(size=size, offset=offset, **filter_fields)
 
     def delete(self, basic_auth_id):
@@ -433,7 +527,7 @@ class BasicAuthAdminSimulator(BasicAuthAdminContract):
     def retrieve(self, basic_auth_id):
         return self._store.retrieve(basic_auth_id, None)
 
-    def count(self):
+    def count(self, estimate=False):
         return self._store.count()
 
 
@@ -441,7 +535,8 @@ class KeyAuthAdminSimulator(KeyAuthAdminContract):
     def __init__(self, consumer_admin, consumer_id, api_url):
         self.consumer_admin = consumer_admin
         self.consumer_id = consumer_id
-        self._store = SimulatorDataStore(api_url or 'http://localhost:8001/consumers/%s/keyauth' % self.consumer_id)
+        self._store = SimulatorDataStore(
+            api_url or 'http://localhost:8001/consumers/%s/keyauth' % self.consumer_id, index_keys=('key',))
 
     def destroy(self):
         self.consumer_admin = None
@@ -469,7 +564,7 @@ class KeyAuthAdminSimulator(KeyAuthAdminContract):
     def update(self, key_auth_id, **fields):
         return self._store.update(key_auth_id, None, fields)
 
-    def list(self, size=100, offset=None, **filter_fields):
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
         return self._store.list(size=size, offset=offset, **filter_fields)
 
     def delete(self, key_auth_id):
@@ -478,7 +573,7 @@ class KeyAuthAdminSimulator(KeyAuthAdminContract):
     def retrieve(self, key_auth_id):
         return self._store.retrieve(key_auth_id, None)
 
-    def count(self):
+    def count(self, estimate=False):
         return self._store.count()
 
     def _generate_key(self):
@@ -527,7 +622,7 @@ class OAuth2AdminSimulator(OAuth2AdminContract):
     def update(self, oauth2_id, **fields):
         return self._store.update(oauth2_id, None, fields)
 
-    def list(self, size=100, offset=None, **filter_fields):
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
         return self._store.list(size=size, offset=offset, **filter_fields)
 
     def delete(self, oauth2_id):
@@ -536,7 +631,7 @@ class OAuth2AdminSimulator(OAuth2AdminContract):
     def retrieve(self, oauth2_id):
         return self._store.retrieve(oauth2_id, None)
 
-    def count(self):
+    def count(self, estimate=False):
         return self._store.count()
 
 
@@ -547,7 +642,8 @@ class ConsumerAdminSimulator(ConsumerAdminContract):
             data_struct_filter={
                 'custom_id': None,
                 'username': None
-            })
+            },
+            index_keys=('username', 'custom_id'))
         self._basic_auth_admins = {}
         self._key_auth_admins = {}
         self._oauth2_admins = {}
@@ -557,7 +653,7 @@ class ConsumerAdminSimulator(ConsumerAdminContract):
         self._store = None
 
         for related_admin in (self._basic_auth_admins, self._key_auth_admins, self._oauth2_admins):
-            for key in related_admin:
+            for key in list(related_admin):
                 related_admin[key].destroy()
                 del related_admin[key]
 
@@ -565,7 +661,7 @@ class ConsumerAdminSimulator(ConsumerAdminContract):
         self._key_auth_admins = None
         self._oauth2_admins = None
 
-    def count(self):
+    def count(self, estimate=False):
         return self._store.count()
 
     def create(self, username=None, custom_id=None):
@@ -594,7 +690,7 @@ class ConsumerAdminSimulator(ConsumerAdminContract):
     def retrieve(self, username_or_id):
         return self._store.retrieve(username_or_id, 'username')
 
-    def list(self, size=100, offset=None, **filter_fields):
+    def list(self, size=100, offset=None, stream=False, **filter_fields):
         return self._store.list(size, offset, **filter_fields)
 
     def delete(self, username_or_id):
@@ -716,11 +812,19 @@ class PluginAdminSimulator(PluginAdminContract):
 
 
 class KongAdminSimulator(KongAdminContract):
-    def __init__(self, api_url=None):
-        super(KongAdminSimulator, self).__init__(
-            apis=APIAdminSimulator(api_url=api_url),
-            consumers=ConsumerAdminSimulator(api_url=api_url),
-            plugins=PluginAdminSimulator())
+    """
+    :param profiler: When given, every call of a simulator method is profiled. The simulator has no transport, so all
+        of its time is attributed to dispatch, which makes it a baseline for the profile of a ``KongAdminClient``.
+    :type profiler: kong.profiling.Profiler
+    """
+    def __init__(self, api_url=None, profiler=None):
+        self.profiler = profiler
+        apis = APIAdminSimulator(api_url=api_url)
+        consumers = ConsumerAdminSimulator(api_url=api_url)
+        plugins = PluginAdminSimulator()
+        if profiler is not None:
+            apis, consumers, plugins = [ProfiledAdmin(admin, profiler) for admin in (apis, consumers, plugins)]
+        super(KongAdminSimulator, self).__init__(apis=apis, consumers=consumers, plugins=plugins)
 
     def close(self):
         self.apis.destroy()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import codecs
+import json
+from collections import deque
+
+# Amount of bytes read from the socket at once
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Amount of consumed characters after which the buffer is compacted
+_COMPACT_THRESHOLD = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+
+class StreamingPage(object):
+    """
+    Incrementally decodes a JSON object from an iterable of byte chunks. The elements of one of its array members (the
+      ``data`` of a page) are decoded one at a time, as soon as they have been received. All other members (like
+      ``next`` and ``total``) are decoded as a whole.
+
+    Behaves like the dictionary returned by a regular ``list`` call, but ``page['data']`` is an iterator that can only
+      be consumed once. Looking up a member that follows the array in the response reads (and buffers) the remainder of
+      the array first.
+
+    :param chunks: Iterable of byte strings, like ``response.iter_content()``
+    :param array_key: Name of the member whose elements are streamed
+    :param on_close: Called once the whole object has been decoded, or when decoding fails
+    """
+    def __init__(self, chunks, array_key='data', on_close=None):
+        self.array_key = array_key
+        self._chunks = iter(chunks)
+        self._on_close = on_close
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+        self._members = {}
+        self._pending = deque()
+        self._items = self._parse()
+        self._finished = False
+
+    @classmethod
+    def from_response(cls, response, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        :param response: Response of a request that was sent with ``stream=True``
+        :type response: requests.Response
+        :rtype: StreamingPage
+        """
+        return cls(response.iter_content(chunk_size=chunk_size), on_close=response.close)
+
+    def __getitem__(self, key):
+        if key == self.array_key:
+            return self._iter_items()
+        if key not in self._members:
+            self._read_until(key)
+        return self._members[key]
+
+    def __contains__(self, key):
+        if key == self.array_key:
+            return True
+        self._read_until(key)
+        return key in self._members
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def close(self):
+        """
+        Stops decoding, and releases the underlying response.
+        """
+        self._items.close()
+        self._release()
+
+    def _release(self):
+        self._finished = True
+        if self._on_close is not None:
+            self._on_close()
+            self._on_close = None
+
+    def _iter_items(self):
+        while True:
+            if self._pending:
+                yield self._pending.popleft()
+            elif self._finished:
+                return
+            else:
+                try:
+                    yield next(self._items)
+                except StopIteration:
+                    return
+
+    def _read_until(self, key):
+        while key not in self._members and not self._finished:
+            try:
+                self._pending.append(next(self._items))
+            except StopIteration:
+                return
+
+    def _parse(self):
+        try:
+            self._expect('{')
+            if self._skip_whitespace() == '}':
+                self._pos += 1
+            else:
+                while True:
+                    key = self._decode_value()
+                    self._expect(':')
+
+                    if key == self.array_key and self._skip_whitespace() == '[':
+                        self._pos += 1
+                        for item in self._parse_array():
+                            yield item
+                    else:
+                        self._members[key] = self._decode_value()
+
+                    if self._expect(',', '}') == '}':
+                        break
+        except Exception:
+            self._release()
+            raise
+
+        self._release()
+
+    def _parse_array(self):
+        if self._skip_whitespace() == ']':
+            self._pos += 1
+            return
+
+        while True:
+            yield self._decode_value()
+            self._compact()
+            if self._expect(',', ']') == ']':
+                return
+
+    def _fill(self):
+        """
+        Appends the next chunk to the buffer.
+
+        :return: False if there is no more data
+        """
+        while not self._eof:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._eof = True
+                self._buffer += self._text_decoder.decode(b'', final=True)
+                return False
+
+            text = self._text_decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        return False
+
+    def _compact(self):
+        if self._pos > _COMPACT_THRESHOLD:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+
+    def _skip_whitespace(self):
+        """
+        :return: The first character that is not whitespace, or None at the end of the data
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return None
+
+    def _expect(self, *characters):
+        character = self._skip_whitespace()
+        if character is None or character not in characters:
+            raise ValueError('Expected %s at position %d, found %r' % (' or '.join(characters), self._pos, character))
+        self._pos += 1
+        return character
+
+    def _decode_value(self):
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A number at the end of the buffer may continue in the next chunk
+            if end < len(self._buffer) or not self._fill():
+                self._pos = end
+                return value
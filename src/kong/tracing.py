@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function
+import functools
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+# Header carrying the trace context, see https://www.w3.org/TR/trace-context/
+TRACEPARENT_HEADER = 'traceparent'
+
+_random = random.SystemRandom()
+
+
+def _generate_id(bits):
+    return '%0*x' % (bits // 4, _random.getrandbits(bits))
+
+
+class Span(object):
+    """
+    A timed operation, like a call of a client method or a single HTTP request. Spans of the same trace share a
+      ``trace_id``, and refer to the span they are nested in through ``parent_id``.
+
+    :ivar attributes: Dictionary describing the operation, like its HTTP method and status code
+    :ivar error: The exception that ended the operation, if any
+    """
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'attributes', 'start_time', 'end_time', 'error')
+
+    def __init__(self, name, trace_id, parent_id=None, attributes=None, start_time=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _generate_id(64)
+        self.parent_id = parent_id
+        self.attributes = attributes or {}
+        self.start_time = start_time
+        self.end_time = None
+        self.error = None
+
+    @property
+    def duration(self):
+        """
+        :return: The amount of seconds the span took, or None if it has not finished yet
+        """
+        return None if self.end_time is None else self.end_time - self.start_time
+
+    @property
+    def traceparent(self):
+        """
+        :return: The value of a ``traceparent`` header that makes the receiver continue the trace below this span
+        """
+        return '00-%s-%s-01' % (self.trace_id, self.span_id)
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def __repr__(self):
+        return '<Span %s %s>' % (self.name, self.span_id)
+
+
+class Tracer(object):
+    """
+    Lightweight tracer that hands spans to callbacks, instead of to a tracing service. Spans are nested automatically
+      within a thread: a span started while another one is active becomes its child.
+
+        def report(span):
+            print('%s%s took %.3fs' % ('  ' * depth(span), span.name, span.duration))
+
+        tracer = Tracer(on_finish=report)
+        client = KongAdminClient('http://localhost:8001', tracer=tracer)
+        with tracer.span('onboard-consumer'):
+            consumer = client.consumers.create(username='john')
+            client.consumers.key_auth(consumer['id']).create()
+
+    :param on_start: Called with every span when it starts
+    :param on_finish: Called with every span when it finishes
+    :param propagate: Whether a ``traceparent`` header should be sent along with every request
+    :type propagate: bool
+    """
+    def __init__(self, on_start=None, on_finish=None, propagate=False, clock=time.time):
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.propagate = propagate
+        self._clock = clock
+        self._local = threading.local()
+
+    def _get_stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current_span(self):
+        """
+        :rtype: Span
+        :return: The innermost active span of the calling thread, if any
+        """
+        stack = self._get_stack()
+        return stack[-1] if stack else None
+
+    def start_span(self, name, parent=None, **attributes):
+        """
+        Starts a span, without making it the active span. Use ``span`` instead, unless the span has to be finished
+          from another place (or thread) than where it started.
+
+        :param parent: The parent of the span. Defaults to the active span of the calling thread.
+        :type parent: Span
+        :rtype: Span
+        """
+        parent = parent or self.current_span()
+        span = Span(name, parent.trace_id if parent is not None else _generate_id(128),
+                    parent_id=parent.span_id if parent is not None else None, attributes=attributes,
+                    start_time=self._clock())
+        if self.on_start is not None:
+            self.on_start(span)
+        return span
+
+    def finish_span(self, span, error=None):
+        span.end_time = self._clock()
+        span.error = error
+        if self.on_finish is not None:
+            self.on_finish(span)
+
+    @contextmanager
+    def span(self, name, parent=None, **attributes):
+        """
+        Context manager that starts a span, makes it the active span of the calling thread, and finishes it on exit.
+
+        :param parent: The parent of the span. Defaults to the active span of the calling thread.
+        :type parent: Span
+        """
+        span = self.start_span(name, parent=parent, **attributes)
+        stack = self._get_stack()
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            stack.pop()
+            self.finish_span(span, error=e)
+            raise
+        stack.pop()
+        self.finish_span(span)
+
+
+def traced(func):
+    """
+    Decorator for client methods, which wraps every call in a span named after the client class and the method (like
+      ``ConsumerAdminClient.create``) when the client has a tracer.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self.tracer is None:
+            return func(self, *args, **kwargs)
+        with self.tracer.span('%s.%s' % (self.__class__.__name__, func.__name__)):
+            return func(self, *args, **kwargs)
+    return wrapper
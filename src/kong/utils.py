@@ -1,12 +1,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals, print_function
+import re
 import time
 import uuid
 from json import dumps
 
 import six
 
-from .compat import urlparse, urlencode, unquote, parse_qs, parse_qsl, ParseResult, OrderedDict, utf8_or_str
+from .compat import urlparse, urljoin, urlencode, unquote, parse_qs, parse_qsl, ParseResult, OrderedDict, utf8_or_str
 
 
 def timestamp():
@@ -49,6 +50,13 @@ def add_url_params(url, params):
 
     Source: http://stackoverflow.com/a/25580545/591217
     """
+    # Fast path: without existing arguments (or anything else that would be altered by unquoting and parsing), the
+    # URL can be returned as is, followed by the encoded params
+    if _is_plain_url(url):
+        encoded_get_args = encode_url_params(params)
+        url = utf8_or_str(url)
+        return url + str('?') + encoded_get_args if encoded_get_args else url
+
     # Unquoting URL first so we don't loose existing args
     url = unquote(utf8_or_str(url))  # ``unquote`` operates on BYTES, not unicode strings...
 
@@ -64,33 +72,84 @@ def add_url_params(url, params):
     # Merging URL arguments dict with new params
     parsed_get_args.update(params)
 
+    # Converting URL argument to proper query string
+    encoded_get_args = encode_url_params(parsed_get_args)
+
+    # Creating new parsed result object based on provided with new
+    # URL arguments. Same thing happens inside of urlparse.
+    new_url = ParseResult(
+        parsed_url.scheme, parsed_url.netloc, parsed_url.path,
+        parsed_url.params, encoded_get_args, parsed_url.fragment
+    ).geturl()
+
+    return new_url
+
+
+def encode_url_params(params):
+    """
+    :param params: dict containing URL arguments
+    :return: Query string containing the arguments, sorted by name
+    """
+    if not params:
+        return str('')
+
     # Bool and Dict values should be converted to json-friendly values
     json_friendly_data = {}
-    for k, v in parsed_get_args.items():
+    for k, v in params.items():
         if isinstance(v, (bool, dict)):
             json_friendly_data[k] = dumps(v)
-    parsed_get_args.update(json_friendly_data)
 
-    parsed_get_args = sorted_ordered_dict(parsed_get_args)
+    if json_friendly_data:
+        params = dict(params)
+        params.update(json_friendly_data)
+    params = sorted_ordered_dict(params)
 
     # Encoding parsed args to given encoding to make sure ``urlencode`` does not try to "encode" the string himself
     # because he is clearly not able to do it correctly. (See the comments inside the function for the ins and outs)
-    parsed_get_args_encoded = OrderedDict(
+    params_encoded = OrderedDict(
         (k, utf8_or_str(v) if isinstance(v, six.text_type) else v)
-        for k, v in parsed_get_args.items()
+        for k, v in params.items()
     )
 
-    # Converting URL argument to proper query string
-    encoded_get_args = urlencode(parsed_get_args_encoded, doseq=True)
+    return urlencode(params_encoded, doseq=True)
 
-    # Creating new parsed result object based on provided with new
-    # URL arguments. Same thing happens inside of urlparse.
-    new_url = ParseResult(
-        parsed_url.scheme, parsed_url.netloc, parsed_url.path,
-        parsed_url.params, encoded_get_args, parsed_url.fragment
-    ).geturl()
 
-    return new_url
+# Printable ASCII URLs without characters that ``unquote`` or ``urlparse`` would interpret
+_PLAIN_URL_RE = re.compile(r'^https?://(?!/)(?:(?![%?#;\[\]])[!-~])*$')
+
+
+def _is_plain_url(url):
+    return isinstance(url, six.text_type) and _PLAIN_URL_RE.match(url) is not None
+
+
+# Path segments that ``urljoin`` would interpret when they occur in a relative URL
+_PLAIN_SEGMENT_RE = re.compile(r'^[^/%?#;:\[\]\s\x00-\x1f\x7f]+$')
+
+
+class URLBuilder(object):
+    """
+    Builds URLs relative to a base URL, exactly like joining them with ``urljoin`` and adding a trailing slash and
+      query parameters with ``add_url_params``. The directory that relative paths resolve against is computed once, so
+      for plain path segments (like names, ids and resource names) no URL has to be parsed at all.
+
+    :param base_url: The URL that paths are relative to, like the URL of the admin API
+    """
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self._prefix = urljoin(base_url, '_')[:-1]
+
+    def build(self, path, query_params=None):
+        """
+        :param path: Path segments
+        :type path: list
+        :param query_params: dict containing URL arguments
+        :rtype: six.text_type
+        """
+        if path and all(_PLAIN_SEGMENT_RE.match(segment) and segment not in ('.', '..') for segment in path):
+            url = self._prefix + '/'.join(path)
+        else:
+            url = urljoin(self.base_url, '/'.join(path))
+        return add_url_params(ensure_trailing_slash(url), query_params or {})
 
 
 def assert_dict_keys_in(d, allowed_keys, error_template=None):
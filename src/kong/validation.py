@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Validation of arguments and of responses, shared by the blocking client (:mod:`kong.client`) and the asyncio client
+(:mod:`kong.async_client`).
+"""
+from __future__ import unicode_literals, print_function
+
+import six
+
+from .compat import CONFLICT, INTERNAL_SERVER_ERROR
+from .exceptions import ConflictError, ServerError
+from .utils import assert_dict_keys_in, URLBuilder
+
+INVALID_FIELD_ERROR_TEMPLATE = '%r is not a valid field. Allowed fields: %r'
+
+# Fields that may be updated, or that collections may be filtered by
+API_UPDATE_FIELDS = ('name', 'request_host', 'request_path', 'strip_request_path', 'preserve_host')
+API_FILTER_FIELDS = ('id', 'name', 'request_host', 'request_path')
+PLUGIN_CONFIGURATION_FILTER_FIELDS = ('id', 'name', 'api_id', 'consumer_id')
+CONSUMER_UPDATE_FIELDS = ('username', 'custom_id')
+CONSUMER_FILTER_FIELDS = ('id', 'custom_id', 'username')
+BASIC_AUTH_UPDATE_FIELDS = ('username', 'password')
+BASIC_AUTH_FILTER_FIELDS = ('id', 'username')
+KEY_AUTH_UPDATE_FIELDS = ('key',)
+KEY_AUTH_FILTER_FIELDS = ('id', 'key')
+OAUTH2_UPDATE_FIELDS = ('name', 'redirect_uri', 'client_id', 'client_secret')
+OAUTH2_FILTER_FIELDS = ('id', 'name', 'redirect_url', 'client_id')
+
+
+def assert_valid_fields(fields, allowed_fields):
+    """
+    :param fields: Fields passed to an update or list method
+    :type fields: dict
+    :param allowed_fields: One of the ``*_FIELDS`` constants of this module
+    :raises AssertionError: If any of the fields is not allowed
+    """
+    assert_dict_keys_in(fields, allowed_fields, INVALID_FIELD_ERROR_TEMPLATE)
+
+
+def get_error_class(status_code, expected_status_codes, conflict=False):
+    """
+    Maps the status code of a response to the exception the clients raise for it.
+
+    :param status_code: Status code of the response
+    :param expected_status_codes: Status codes of a successful response
+    :type expected_status_codes: tuple
+    :param conflict: Whether a 409 response raises a ``ConflictError`` (for requests that create entities)
+    :type conflict: bool
+    :return: ``ConflictError``, ``ServerError`` or ``ValueError``, or None if the response is successful
+    """
+    if status_code in expected_status_codes:
+        return None
+    elif conflict and status_code == CONFLICT:
+        return ConflictError
+    elif status_code == INTERNAL_SERVER_ERROR:
+        return ServerError
+    return ValueError
+
+
+class URLBuilderMixin(object):
+    """
+    Builds the URLs of the admin API relative to ``self.api_url``.
+    """
+    _url_builder = None
+
+    @property
+    def url_builder(self):
+        if self._url_builder is None or self._url_builder.base_url != self.api_url:
+            self._url_builder = URLBuilder(self.api_url)
+        return self._url_builder
+
+    def build_url(self, path, query_params):
+        # WTF: Never use str, unless in some very specific cases, like in compatibility layers! Fixed for you.
+        return self.url_builder.build([six.text_type(p) for p in path], query_params)
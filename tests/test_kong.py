@@ -7,18 +7,55 @@ import collections
 import uuid
 import json
 import random
+import re
 import requests
 import logging
+import threading
+import time
+
+import six
+from six.moves.BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
 
 # To run the standalone test script
 if __name__ == '__main__':
     sys.path.append('../src/')
 
 from kong.exceptions import ConflictError
-from kong.simulator import KongAdminSimulator
+from kong.simulator import KongAdminSimulator, SimulatorDataStore
 from kong.client import KongAdminClient
-from kong.compat import TestCase, skipIf, run_unittests, OrderedDict, urlencode, HTTPConnection
-from kong.utils import uuid_or_string, add_url_params, sorted_ordered_dict
+from kong.compat import TestCase, skipIf, run_unittests, OrderedDict, urlencode, urljoin, HTTPConnection
+from kong.utils import uuid_or_string, add_url_params, sorted_ordered_dict, ensure_trailing_slash, URLBuilder, \
+    parse_query_parameters
+from kong.ratelimit import TokenBucket, RateLimiter
+from kong.concurrency import AdaptiveConcurrencyController, SingleFlight, run_concurrently, prefetch
+from kong.exceptions import ServerError, CircuitOpenError
+from kong.cache import EntityCache
+from kong.pagination import AdaptivePageSizer
+from kong.streaming import StreamingPage
+from kong.codec import JSONCodec, get_codec
+from kong.retry import RetryPolicy, RetryBudget, parse_retry_after
+from kong.circuitbreaker import CircuitBreaker, NodeCircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from kong.balancer import LoadBalancer, ROUND_ROBIN
+from kong.hedging import HedgingPolicy, LatencyTracker
+from kong.metrics import MetricsCollector, RequestMetrics, Histogram, describe_request, export_prometheus
+from kong.tracing import Tracer
+from kong.server import SimulatorServer, SimulatorHTTPAdapter, AdminAPIDispatcher
+from kong.bench import Benchmark, parse_mix, percentile, parse_thresholds, compare_results, main as run_bench, OK, \
+    REGRESSION, NEW, SIZE_DIFFERS
+from kong.validation import get_error_class, assert_valid_fields, API_FILTER_FIELDS
+from kong.profiling import Profiler, DISPATCH, TRANSPORT, DECODE, URL_BUILDING, HEADERS
+
+try:
+    import asyncio
+    from kong.async_client import AsyncKongAdminClient
+except (ImportError, SyntaxError):  # pragma: no cover
+    asyncio = None
+    AsyncKongAdminClient = None
+
+try:
+    from unittest import mock
+except ImportError:  # pragma: no cover
+    import mock
 
 from faker import Factory
 from faker.providers import BaseProvider
@@ -83,6 +120,17 @@ def kong_testserver_is_up():
         return False
 
 
+def assert_one_conflict(test_case, results, indexes):
+    """
+    Asserts that exactly one of the items at ``indexes`` (copies of the same item) failed with a conflict. The copies are
+      created concurrently, so either of them may be created first.
+    """
+    failed = [i for i, result in enumerate(results) if not result.succeeded]
+    test_case.assertEqual(len(failed), 1)
+    test_case.assertIn(failed[0], indexes)
+    test_case.assertIsInstance(results[failed[0]].error, ConflictError)
+
+
 class KongAdminTesting(object):
     """
     Important: Do not remove nesting!
@@ -305,6 +353,48 @@ class KongAdminTesting(object):
                 sorted([item['id'] for item in found]),
                 sorted([item['id'] for item in self.client.apis.list().get('data')]))
 
+        def test_iterate_with_prefetch(self):
+            amount = 7
+
+            for i in range(amount):
+                self.client.apis.create(upstream_url=fake.url(), name=fake.api_name(), request_host=fake.domain_name())
+
+            found = list(self.client.apis.iterate(window_size=2, prefetch=2))
+
+            self.assertEqual(
+                [item['id'] for item in found],
+                [item['id'] for item in self.client.apis.iterate(window_size=2)])
+            self.assertEqual(len(found), amount)
+
+        def test_iterate_with_page_sizer(self):
+            amount = 9
+
+            for i in range(amount):
+                self.client.apis.create(upstream_url=fake.url(), name=fake.api_name(), request_host=fake.domain_name())
+
+            page_sizer = AdaptivePageSizer(initial_size=1, min_size=1)
+            found = list(self.client.apis.iterate(page_sizer=page_sizer))
+
+            self.assertEqual(len(found), amount)
+            self.assertEqual(len(set(item['id'] for item in found)), amount)
+            self.assertGreater(page_sizer.size, 1)
+
+        def test_count_by_paging(self):
+            for i in range(3):
+                self.client.apis.create(upstream_url=fake.url(), name=fake.api_name(), request_host=fake.domain_name())
+
+            self.assertEqual(self.client.apis.count_by_paging(), 3)
+            self.assertEqual(self.client.apis.count_by_paging(estimate=True), 3)
+            self.assertEqual(self.client.apis.count(estimate=True), 3)
+
+        def test_iterate_streamed(self):
+            for i in range(4):
+                self.client.apis.create(upstream_url=fake.url(), name=fake.api_name(), request_host=fake.domain_name())
+
+            self.assertEqual(
+                [item['id'] for item in self.client.apis.iterate(window_size=3, stream=True)],
+                [item['id'] for item in self.client.apis.iterate(window_size=3)])
+
         def test_iterate_filtered(self):
             amount = 5
 
@@ -342,6 +432,39 @@ class KongAdminTesting(object):
             self.client.apis.delete(result2['name'])
             self.assertEqual(self.client.apis.count(), 0)
 
+        def test_create_many(self):
+            names = ['%s%s' % (fake.api_name(), i) for i in range(10)]
+
+            results = self.client.apis.create_many(
+                [{'upstream_url': fake.url(), 'name': name, 'request_host': '%s.%s' % (name.lower(), fake.domain_name())}
+                 for name in names] + [{'upstream_url': fake.url(), 'name': names[0], 'request_host': 'x.example.com'}],
+                max_workers=4)
+
+            self.assertEqual(len(results), 11)
+            assert_one_conflict(self, results, (0, 10))
+            self.assertEqual(sorted(result.result['name'] for result in results if result.succeeded), sorted(names))
+            self.assertEqual(self.client.apis.count(), 10)
+
+        def test_update_many(self):
+            apis = [self.client.apis.create(upstream_url=fake.url(), name='%s%s' % (fake.api_name(), i),
+                                            request_host='%s.%s' % (i, fake.domain_name())) for i in range(5)]
+            new_url = fake.url()
+
+            results = self.client.apis.update_many([(api['id'], {'upstream_url': new_url}) for api in apis])
+
+            self.assertTrue(all(result.succeeded for result in results))
+            for api in apis:
+                self.assertEqual(self.client.apis.retrieve(api['id'])['upstream_url'], new_url)
+
+        def test_delete_many(self):
+            apis = [self.client.apis.create(upstream_url=fake.url(), name='%s%s' % (fake.api_name(), i),
+                                            request_host='%s.%s' % (i, fake.domain_name())) for i in range(5)]
+
+            results = self.client.apis.delete_many([api['id'] for api in apis], max_workers=2)
+
+            self.assertTrue(all(result.succeeded for result in results))
+            self.assertEqual(self.client.apis.count(), 0)
+
         def test_create_global_plugin_configuration(self):
             api_name = fake.api_name()
 
@@ -767,7 +890,7 @@ class KongAdminTesting(object):
         def test_list(self):
             amount = 5
 
-            usernames = [fake.username() for i in range(amount)]
+            usernames = ['%s%d' % (fake.username(), i) for i in range(amount)]
             custom_ids = [fake.uuid4() for i in range(amount)]
 
             for i in range(amount):
@@ -829,6 +952,49 @@ class KongAdminTesting(object):
             self.client.consumers.delete(result2['username'])
             self.assertEqual(self.client.consumers.count(), 0)
 
+        def test_create_many(self):
+            items = [{'username': '%s%s' % (fake.username(), i), 'custom_id': fake.uuid4()} for i in range(20)]
+
+            results = self.client.consumers.create_many(items + [items[3]], max_workers=5)
+
+            self.assertEqual(len(results), 21)
+            self.assertEqual([result.item for result in results], items + [items[3]])
+
+            assert_one_conflict(self, results, (3, 20))
+
+            for result in results:
+                if result.succeeded:
+                    self.assertEqual(result.result['username'], result.item['username'])
+            self.assertEqual(self.client.consumers.count(), 20)
+
+        def test_create_many_with_controller(self):
+            controller = AdaptiveConcurrencyController(initial_limit=2, max_limit=8)
+            items = [{'username': '%s%s' % (fake.username(), i), 'custom_id': fake.uuid4()} for i in range(30)]
+
+            results = self.client.consumers.create_many(items, controller=controller)
+
+            self.assertTrue(all(result.succeeded for result in results))
+            self.assertGreater(controller.limit, 2)
+            self.assertEqual(self.client.consumers.count(), 30)
+
+        def test_delete_many(self):
+            consumers = [self.client.consumers.create(username='%s%s' % (fake.username(), i), custom_id=fake.uuid4())
+                         for i in range(5)]
+
+            results = self.client.consumers.delete_many([consumer['id'] for consumer in consumers])
+
+            self.assertTrue(all(result.succeeded for result in results))
+            self.assertEqual(self.client.consumers.count(), 0)
+
+        def test_key_auth_create_many(self):
+            consumer = self.client.consumers.create(username=fake.username(), custom_id=fake.uuid4())
+            key_auth = self.client.consumers.key_auth(consumer['id'])
+
+            results = key_auth.create_many([{'key': fake.md5()} for i in range(10)], max_workers=3)
+
+            self.assertTrue(all(result.succeeded for result in results))
+            self.assertEqual(key_auth.count(), 10)
+
         def test_basic_auth_create(self):
             result = self.client.consumers.create(username=fake.username(), custom_id=fake.uuid4())
 
@@ -1313,6 +1479,1549 @@ class UtilTestCase(TestCase):
         )
         self.assertEqual(result, expected_result)
 
+    def test_add_url_params_without_existing_params(self):
+        params = {'size': 100, 'offset': 'b2Zmc2V0', 'enabled': False}
+
+        self.assertEqual(add_url_params('http://localhost:8001/apis/', params),
+                         'http://localhost:8001/apis/?enabled=false&offset=b2Zmc2V0&size=100')
+        self.assertEqual(add_url_params('http://localhost:8001/apis/', {}), 'http://localhost:8001/apis/')
+        self.assertEqual(params['enabled'], False)
+
+    def test_add_url_params_unquotes_existing_url(self):
+        self.assertEqual(add_url_params('http://localhost:8001/consumers/john%20doe/', {'size': 1}),
+                         'http://localhost:8001/consumers/john doe/?size=1')
+
+    def test_url_builder(self):
+        base_urls = ['http://localhost:8001', 'http://localhost:8001/', 'https://kong.example.com/admin',
+                     'https://kong.example.com/admin/', 'http://localhost:8001/?x=1']
+        paths = [[], ['apis'], ['consumers', str(uuid.uuid4()), 'key-auth'], ['consumers', 'john doe'],
+                 ['apis', '..', 'consumers'], ['apis', 'name%2F'], ['consumers', 'caf\xe9'], ['http:', 'x']]
+        query_params = [{}, {'size': 10, 'offset': 'abc'}, {'enabled': True}]
+
+        for base_url in base_urls:
+            builder = URLBuilder(base_url)
+            for path in paths:
+                for params in query_params:
+                    expected = add_url_params(ensure_trailing_slash(urljoin(base_url, '/'.join(path))), params)
+                    self.assertEqual(builder.build(path, params), expected)
+
+    def test_get_error_class(self):
+        self.assertIsNone(get_error_class(201, (201, 200), conflict=True))
+        self.assertIs(get_error_class(409, (201,), conflict=True), ConflictError)
+        self.assertIs(get_error_class(409, (200,)), ValueError)
+        self.assertIs(get_error_class(500, (200,)), ServerError)
+        self.assertIs(get_error_class(404, (200,)), ValueError)
+        self.assertRaises(AssertionError, assert_valid_fields, {'unknown': 1}, API_FILTER_FIELDS)
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimiterTestCase(TestCase):
+    def test_burst(self):
+        bucket = TokenBucket(rate=10, capacity=3, clock=FakeClock())
+
+        self.assertEqual([bucket.reserve() for i in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        self.assertAlmostEqual(bucket.reserve(), 0.2)
+
+    def test_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+        bucket.reserve()
+        bucket.reserve()
+
+        clock.now += 0.1
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+
+        # Tokens never accumulate above the capacity
+        clock.now += 100
+        self.assertEqual([bucket.reserve() for i in range(2)], [0, 0])
+        self.assertGreater(bucket.reserve(), 0)
+
+    def test_concurrent_reservations(self):
+        bucket = TokenBucket(rate=100, capacity=1, clock=FakeClock())
+        delays = []
+
+        def _reserve():
+            for i in range(50):
+                delays.append(bucket.reserve())
+
+        threads = [threading.Thread(target=_reserve) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Every reservation gets its own, unique slot
+        self.assertEqual(len(delays), 200)
+        self.assertEqual(len(set(round(delay, 6) for delay in delays)), 200)
+        self.assertAlmostEqual(max(delays), 1.99)
+
+    def test_per_host_buckets(self):
+        limiter = RateLimiter(rate=1, burst=1, clock=FakeClock())
+
+        self.assertEqual(limiter.reserve('http://node1:8001/apis/'), 0)
+        self.assertEqual(limiter.reserve('http://node2:8001/apis/'), 0)
+        self.assertGreater(limiter.reserve('http://node1:8001/consumers/'), 0)
+
+
+class AdaptiveConcurrencyControllerTestCase(TestCase):
+    def test_additive_increase(self):
+        controller = AdaptiveConcurrencyController(initial_limit=2, max_limit=4, clock=FakeClock())
+
+        # Grows by roughly one per limit's worth of successful requests
+        for i in range(3):
+            controller.release(controller.acquire())
+        self.assertEqual(controller.limit, 3)
+
+        for i in range(100):
+            controller.release(controller.acquire())
+        self.assertEqual(controller.limit, 4)
+
+    def test_multiplicative_decrease(self):
+        clock = FakeClock()
+        controller = AdaptiveConcurrencyController(initial_limit=16, min_limit=2, clock=clock)
+
+        tokens = [controller.acquire() for i in range(4)]
+        clock.now += 1
+        controller.release(tokens[0], ServerError('Overloaded'))
+        self.assertEqual(controller.limit, 8)
+
+        # Requests that were already in flight during the decrease do not back off any further
+        for token in tokens[1:]:
+            controller.release(token, ServerError('Overloaded'))
+        self.assertEqual(controller.limit, 8)
+        self.assertEqual(controller.decreases, 1)
+
+        for i in range(5):
+            clock.now += 1
+            controller.release(controller.acquire(), ServerError('Overloaded'))
+        self.assertEqual(controller.limit, 2)
+
+    def test_ignores_non_overload_errors(self):
+        controller = AdaptiveConcurrencyController(initial_limit=4, clock=FakeClock())
+
+        controller.release(controller.acquire(), ConflictError('Already exists'))
+        self.assertEqual(controller.decreases, 0)
+        self.assertEqual(controller.failures, 0)
+
+    def test_slow_requests_decrease(self):
+        clock = FakeClock()
+        controller = AdaptiveConcurrencyController(initial_limit=16, min_limit=2, latency_threshold=0.5, clock=clock)
+
+        controller.release(controller.acquire())
+        self.assertEqual(controller.limit, 16)
+
+        tokens = [controller.acquire() for i in range(4)]
+        clock.now += 1
+        for token in tokens:
+            controller.release(token)
+        self.assertEqual(controller.limit, 8)
+        self.assertEqual(controller.decreases, 1)
+        self.assertEqual(controller.failures, 0)
+
+        for i in range(5):
+            token = controller.acquire()
+            clock.now += 1
+            controller.release(token)
+        self.assertEqual(controller.limit, 2)
+
+    def test_try_acquire(self):
+        controller = AdaptiveConcurrencyController(initial_limit=1, clock=FakeClock())
+
+        token = controller.try_acquire()
+        self.assertIsNotNone(token)
+        self.assertIsNone(controller.try_acquire())
+        controller.release(token)
+        self.assertIsNotNone(controller.try_acquire())
+
+    def test_run_concurrently_backs_off(self):
+        capacity = 3
+        lock = threading.Lock()
+        state = {'in_flight': 0, 'max_in_flight': 0}
+
+        def _overloadable(item):
+            with lock:
+                state['in_flight'] += 1
+                overloaded = state['in_flight'] > capacity
+            try:
+                time.sleep(0.001)
+                if overloaded:
+                    raise ServerError('Overloaded')
+                return item
+            finally:
+                with lock:
+                    state['in_flight'] -= 1
+
+        controller = AdaptiveConcurrencyController(initial_limit=32, max_limit=32)
+        results = run_concurrently(_overloadable, range(200), controller=controller)
+
+        self.assertEqual(len(results), 200)
+        self.assertGreater(controller.decreases, 0)
+        self.assertLess(controller.limit, 32)
+        self.assertEqual(controller.in_flight, 0)
+
+
+class FakeResponse(object):
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self.content = json.dumps(data).encode('utf-8') if data is not None else b''
+        self.headers = headers or {}
+        self.closed = False
+
+    def json(self):
+        return json.loads(self.content.decode('utf-8'))
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class AdaptivePageSizerTestCase(TestCase):
+    def setUp(self):
+        self.sizer = AdaptivePageSizer(initial_size=100, min_size=10, max_size=400, target_latency=1.0,
+                                       max_payload_bytes=100000, clock=FakeClock())
+
+    def page(self, size, item_size=10):
+        return [{'id': 'x' * item_size}] * size
+
+    def test_grows_on_fast_full_pages(self):
+        self.sizer.record(100, self.page(100), 0.1)
+        self.assertEqual(self.sizer.size, 200)
+        self.sizer.record(200, self.page(200), 0.1)
+        self.sizer.record(400, self.page(400), 0.1)
+        self.assertEqual(self.sizer.size, 400)
+
+    def test_does_not_grow_on_last_page(self):
+        self.sizer.record(100, self.page(20), 0.1)
+        self.assertEqual(self.sizer.size, 100)
+
+    def test_keeps_size_near_target_latency(self):
+        self.sizer.record(100, self.page(100), 0.8)
+        self.assertEqual(self.sizer.size, 100)
+
+    def test_shrinks_on_slow_pages(self):
+        self.sizer.record(100, self.page(100), 1.5)
+        self.assertEqual(self.sizer.size, 50)
+        for _ in range(5):
+            self.sizer.record(self.sizer.size, self.page(self.sizer.size), 1.5)
+        self.assertEqual(self.sizer.size, 10)
+
+    def test_shrinks_on_large_pages(self):
+        self.sizer.record(100, self.page(100, item_size=2000), 0.1)
+        self.assertEqual(self.sizer.size, 50)
+
+    def test_max_size_is_capped_by_kong(self):
+        self.assertEqual(AdaptivePageSizer(max_size=100000).max_size, 1000)
+
+
+class StreamingPageTestCase(TestCase):
+    def chunked(self, data, chunk_size):
+        content = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        return [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
+
+    def test_decodes_items_one_at_a_time(self):
+        data = [{'id': str(i), 'name': 'caf\xe9 %s' % i, 'values': [i, 1.5, None, True]} for i in range(20)]
+        received = []
+
+        def chunks():
+            for chunk in self.chunked({'data': data, 'next': None}, 7):
+                received.append(chunk)
+                yield chunk
+
+        page = StreamingPage(chunks())
+        items = page['data']
+
+        self.assertEqual(next(items), data[0])
+        self.assertLess(len(received), len(self.chunked({'data': data}, 7)) / 2)
+        self.assertEqual(list(items), data[1:])
+        self.assertIsNone(page.get('next'))
+
+    def test_members_in_any_order(self):
+        data = [{'id': str(i)} for i in range(5)]
+
+        for chunk_size in (1, 3, 1000):
+            chunks = self.chunked(OrderedDict([('total', 123456789), ('data', data), ('next', 'http://next')]),
+                                  chunk_size)
+
+            page = StreamingPage(chunks)
+            self.assertEqual(page['total'], 123456789)
+            self.assertEqual(page.get('next'), 'http://next')
+            self.assertEqual(list(page['data']), data)
+            self.assertIsNone(page.get('offset'))
+
+    def test_empty_array(self):
+        page = StreamingPage([b'{"data": [ ] }'])
+        self.assertEqual(list(page['data']), [])
+        self.assertNotIn('next', page)
+
+    def test_truncated_response(self):
+        closed = []
+        page = StreamingPage([b'{"data": [{"id": 1}, {"id"'], on_close=lambda: closed.append(True))
+
+        with self.assertRaises(ValueError):
+            list(page['data'])
+        self.assertEqual(closed, [True])
+
+    def test_closes_when_done(self):
+        closed = []
+        page = StreamingPage([b'{"data": [1, 2]}'], on_close=lambda: closed.append(True))
+
+        self.assertEqual(list(page['data']), [1, 2])
+        self.assertEqual(closed, [True])
+
+
+def orjson_is_installed():
+    try:
+        import orjson  # noqa
+    except ImportError:
+        return False
+    return True
+
+
+class CodecTestCase(TestCase):
+    document = {'id': str(uuid.uuid4()), 'username': 'caf\xe9', 'created_at': 1461276890000, 'enabled': True,
+                'config': {'minute': 20, 'ratio': 0.5, 'hosts': None}}
+
+    def test_stdlib_codec(self):
+        codec = get_codec()
+
+        self.assertIsInstance(codec, JSONCodec)
+        self.assertEqual(codec.loads(json.dumps(self.document).encode('utf-8')), self.document)
+        self.assertEqual(codec.loads(json.dumps(self.document)), self.document)
+
+    def test_fast_codec_falls_back_to_stdlib(self):
+        with mock.patch.dict(sys.modules, {'orjson': None, 'ujson': None}):
+            self.assertEqual(get_codec('fast').name, 'json')
+
+    @skipIf(not orjson_is_installed(), 'orjson is not installed')
+    def test_orjson_codec(self):
+        codec = get_codec('fast')
+
+        self.assertEqual(codec.name, 'orjson')
+        self.assertEqual(codec.loads(json.dumps(self.document).encode('utf-8')), self.document)
+        self.assertEqual(codec.loads(json.dumps(self.document, ensure_ascii=False).encode('utf-8')), self.document)
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            get_codec('yaml')
+
+    def test_codec_instance_is_used_as_is(self):
+        codec = JSONCodec()
+        self.assertIs(get_codec(codec), codec)
+
+    def test_client_decodes_with_codec(self):
+        codec = mock.Mock(wraps=JSONCodec())
+        codec.__class__ = JSONCodec
+        client = KongAdminClient(API_URL, codec=codec)
+
+        self.assertIs(client.consumers.codec, codec)
+        self.assertIs(client.consumers.oauth2('some-consumer').codec, codec)
+
+        with mock.patch.object(client.session, 'get', return_value=FakeResponse(200, self.document)):
+            self.assertEqual(client.consumers.retrieve('john'), self.document)
+        codec.loads.assert_called_once_with(json.dumps(self.document).encode('utf-8'))
+        client.close()
+
+
+class EntityCacheTestCase(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = EntityCache(max_size=2, ttl=10, clock=self.clock)
+
+    def test_get_by_id_and_alias(self):
+        entity = {'id': str(uuid.uuid4()), 'username': 'john'}
+        self.cache.put(entity, entity['username'])
+
+        self.assertEqual(self.cache.get(entity['id']), entity)
+        self.assertEqual(self.cache.get(uuid.UUID(entity['id'])), entity)
+        self.assertEqual(self.cache.get('john'), entity)
+        self.assertIsNone(self.cache.get('jane'))
+        self.assertEqual(self.cache.stats(), {'size': 1, 'hits': 3, 'misses': 1, 'evictions': 0})
+
+    def test_returns_copies(self):
+        self.cache.put({'id': '1', 'name': 'api'})
+        self.cache.get('1')['name'] = 'changed'
+
+        self.assertEqual(self.cache.get('1')['name'], 'api')
+
+    def test_ttl(self):
+        self.cache.put({'id': '1', 'name': 'api'}, 'api')
+
+        self.clock.now += 9
+        self.assertIsNotNone(self.cache.get('api'))
+        self.clock.now += 1
+        self.assertIsNone(self.cache.get('api'))
+        self.assertIsNone(self.cache.get('1'))
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_lru_eviction(self):
+        self.cache.put({'id': '1'}, 'one')
+        self.cache.put({'id': '2'}, 'two')
+        self.cache.get('one')
+        self.cache.put({'id': '3'}, 'three')
+
+        self.assertIsNotNone(self.cache.get('one'))
+        self.assertIsNone(self.cache.get('two'))
+        self.assertIsNotNone(self.cache.get('three'))
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_invalidate(self):
+        self.cache.put({'id': '1'}, 'one')
+        self.cache.put({'id': '2'}, 'two')
+
+        self.cache.invalidate('one', None, '2')
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNone(self.cache.get('1'))
+        self.assertIsNone(self.cache.get('two'))
+
+    def test_alias_moves_to_new_entity(self):
+        self.cache.put({'id': '1', 'username': 'john'}, 'john')
+        self.cache.put({'id': '2', 'username': 'john'}, 'john')
+
+        self.assertEqual(self.cache.get('john')['id'], '2')
+        self.assertIsNone(self.cache.get('1'))
+
+
+class ClientCacheTestCase(TestCase):
+    def setUp(self):
+        self.client = KongAdminClient(API_URL, cache_ttl=60)
+        self.consumer = {'id': str(uuid.uuid4()), 'username': 'john', 'created_at': 1}
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_retrieve_is_cached_by_id_and_username(self):
+        with mock.patch.object(self.client.session, 'get', return_value=FakeResponse(200, self.consumer)) as get:
+            self.assertEqual(self.client.consumers.retrieve('john'), self.consumer)
+            self.assertEqual(self.client.consumers.retrieve('john'), self.consumer)
+            self.assertEqual(self.client.consumers.retrieve(self.consumer['id']), self.consumer)
+
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(self.client.consumers.cache.stats()['hits'], 2)
+
+    def test_writes_invalidate(self):
+        updated = dict(self.consumer, username='jane')
+
+        with mock.patch.object(self.client.session, 'get', return_value=FakeResponse(200, self.consumer)) as get:
+            self.client.consumers.retrieve('john')
+
+            with mock.patch.object(self.client.session, 'patch', return_value=FakeResponse(200, updated)):
+                self.client.consumers.update('john', username='jane')
+            self.client.consumers.retrieve(self.consumer['id'])
+
+            with mock.patch.object(self.client.session, 'delete', return_value=FakeResponse(204)):
+                self.client.consumers.delete(self.consumer['id'])
+            self.client.consumers.retrieve(self.consumer['id'])
+
+        self.assertEqual(get.call_count, 3)
+
+    def test_delete_invalidates_after_response(self):
+        cache = self.client.consumers.cache
+
+        def delete(url, **kwargs):
+            # A concurrent retrieve caches the consumer while it is being deleted
+            cache.put(self.consumer, 'john')
+            return FakeResponse(204)
+
+        with mock.patch.object(self.client.session, 'delete', side_effect=delete):
+            self.client.consumers.delete('john')
+
+        self.assertIsNone(cache.get(self.consumer['id']))
+
+    def test_keys_are_coerced(self):
+        consumer = dict(self.consumer, id='5')
+
+        with mock.patch.object(self.client.session, 'get', return_value=FakeResponse(200, consumer)) as get:
+            self.assertEqual(self.client.consumers.retrieve(5), consumer)
+            self.assertEqual(self.client.consumers.retrieve(5), consumer)
+
+        self.assertEqual(get.call_count, 1)
+        self.client.consumers.cache.invalidate(5)
+        self.assertEqual(len(self.client.consumers.cache), 0)
+
+    def test_cache_is_opt_in(self):
+        client = KongAdminClient(API_URL)
+        self.assertIsNone(client.apis.cache)
+        self.assertIsNone(client.consumers.cache)
+        client.close()
+
+
+class ClientSessionTestCase(TestCase):
+    def setUp(self):
+        self.client = KongAdminClient(API_URL, pool_connections=2, pool_maxsize=25, pool_block=True)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_sub_clients_share_session(self):
+        session = self.client.session
+
+        self.assertIs(self.client.apis.session, session)
+        self.assertIs(self.client.consumers.session, session)
+        self.assertIs(self.client.plugins.session, session)
+        self.assertIs(self.client.apis.plugins('some-api').session, session)
+        self.assertIs(self.client.consumers.basic_auth('some-consumer').session, session)
+        self.assertIs(self.client.consumers.key_auth('some-consumer').session, session)
+        self.assertIs(self.client.consumers.oauth2('some-consumer').session, session)
+
+    def test_pool_configuration(self):
+        adapter = self.client.session.get_adapter(API_URL)
+
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 25)
+        self.assertTrue(adapter._pool_block)
+
+    def test_rate_limited_session(self):
+        client = KongAdminClient(API_URL, rate_limit=50, rate_limit_burst=5)
+        adapter = client.session.get_adapter(API_URL)
+
+        self.assertIs(adapter.rate_limiter, client.rate_limiter)
+        self.assertEqual(client.rate_limiter.rate, 50)
+        self.assertEqual(client.rate_limiter.burst, 5)
+        client.close()
+
+    def test_sub_client_does_not_close_shared_session(self):
+        key_auth = self.client.consumers.key_auth('some-consumer')
+        key_auth.destroy()
+
+        self.assertIsNotNone(self.client.session)
+        self.assertIs(self.client.consumers.session, self.client.session)
+
+
+class SingleFlightTestCase(TestCase):
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.calls = 0
+        self.started = threading.Event()
+        self.proceed = threading.Event()
+
+    def _slow_call(self):
+        self.calls += 1
+        self.started.set()
+        self.proceed.wait(5)
+        return {'calls': self.calls}
+
+    def _run_concurrent(self, key, amount):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.single_flight.do(key, self._slow_call)))
+                   for _ in range(amount)]
+
+        threads[0].start()
+        self.started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while self.single_flight.shared < amount - 1:
+            time.sleep(0.001)
+        self.proceed.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_calls_are_shared(self):
+        results = self._run_concurrent('key', 10)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [{'calls': 1}] * 10)
+        self.assertEqual(self.single_flight.stats(), {'calls': 1, 'shared': 9})
+
+    def test_completed_calls_are_not_cached(self):
+        self.proceed.set()
+        self.single_flight.do('key', self._slow_call)
+        self.single_flight.do('key', self._slow_call)
+        self.single_flight.do('other', self._slow_call)
+
+        self.assertEqual(self.calls, 3)
+
+    def test_errors_are_shared(self):
+        errors = []
+
+        def failing_call():
+            self._slow_call()
+            raise ServerError('overloaded')
+
+        def call():
+            try:
+                self.single_flight.do('key', failing_call)
+            except ServerError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        threads[0].start()
+        self.started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while self.single_flight.shared < 4:
+            time.sleep(0.001)
+        self.proceed.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(errors), 5)
+
+
+class PrefetchTestCase(TestCase):
+    def test_yields_all_items_in_order(self):
+        self.assertEqual(list(prefetch(iter(range(100)), depth=3)), list(range(100)))
+        self.assertEqual(list(prefetch([], depth=3)), [])
+
+    def test_buffers_at_most_depth_items(self):
+        produced = []
+
+        def produce():
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+        iterator = prefetch(produce(), depth=2)
+        self.assertEqual(next(iterator), 0)
+        time.sleep(0.05)
+
+        # One item consumed, two buffered and one blocked on the full buffer
+        self.assertEqual(len(produced), 4)
+        iterator.close()
+
+    def test_overlaps_production_and_consumption(self):
+        def produce():
+            for i in range(5):
+                time.sleep(0.02)
+                yield i
+
+        start = time.time()
+        for _ in prefetch(produce(), depth=1):
+            time.sleep(0.02)
+
+        # Serially this would take 0.2 seconds
+        self.assertLess(time.time() - start, 0.17)
+
+    def test_errors_are_raised_after_preceding_items(self):
+        def produce():
+            yield 1
+            yield 2
+            raise ServerError('overloaded')
+
+        found = []
+        with self.assertRaises(ServerError):
+            for item in prefetch(produce(), depth=5):
+                found.append(item)
+        self.assertEqual(found, [1, 2])
+
+    def test_close_stops_producer(self):
+        stopped = threading.Event()
+
+        def produce():
+            try:
+                i = 0
+                while True:
+                    yield i
+                    i += 1
+            finally:
+                stopped.set()
+
+        iterator = prefetch(produce(), depth=1)
+        next(iterator)
+        iterator.close()
+
+        self.assertTrue(stopped.wait(1))
+
+
+class ClientCountTestCase(TestCase):
+    def setUp(self):
+        self.client = KongAdminClient(API_URL)
+
+    def tearDown(self):
+        self.client.close()
+
+    def page(self, amount, next_offset=None, total=None):
+        result = {'data': [{'id': str(uuid.uuid4())} for _ in range(amount)]}
+        if next_offset is not None:
+            result['next'] = add_url_params(API_URL + '/consumers/', {'offset': next_offset})
+        if total is not None:
+            result['total'] = total
+        return FakeResponse(200, result)
+
+    def test_reads_total_from_single_entity_page(self):
+        with mock.patch.object(self.client.session, 'get', return_value=self.page(1, 'abc', total=2000000)) as get:
+            self.assertEqual(self.client.consumers.count(), 2000000)
+
+        self.assertEqual(get.call_count, 1)
+        self.assertIn('size=1', get.call_args[0][0])
+
+    def test_single_page_without_total(self):
+        with mock.patch.object(self.client.session, 'get', return_value=self.page(0)):
+            self.assertEqual(self.client.consumers.count(), 0)
+
+    def test_pages_through_without_total(self):
+        responses = [self.page(1, 'a'), self.page(1000, 'b'), self.page(1000, 'c'), self.page(5)]
+
+        with mock.patch.object(self.client.session, 'get', side_effect=responses) as get:
+            self.assertEqual(self.client.consumers.count(), 2005)
+
+        self.assertEqual(get.call_count, 4)
+        self.assertIn('size=1000', get.call_args_list[1][0][0])
+        self.assertIn('offset=b', get.call_args_list[2][0][0])
+
+    def test_estimate_stops_after_first_page(self):
+        responses = [self.page(1, 'a'), self.page(1000, 'b')]
+
+        with mock.patch.object(self.client.session, 'get', side_effect=responses) as get:
+            self.assertEqual(self.client.consumers.count(estimate=True), 1000)
+
+        self.assertEqual(get.call_count, 2)
+
+
+class ClientStreamingTestCase(TestCase):
+    def setUp(self):
+        self.client = KongAdminClient(API_URL, coalesce_reads=True)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_iterate_streamed(self):
+        consumers = [{'id': str(uuid.uuid4()), 'username': 'user%s' % i} for i in range(5)]
+        responses = [
+            FakeResponse(200, {'data': consumers[:3], 'next': add_url_params(API_URL + '/consumers/', {'offset': 'x'})}),
+            FakeResponse(200, {'data': consumers[3:]}),
+        ]
+
+        with mock.patch.object(self.client.session, 'get', side_effect=responses) as get:
+            self.assertEqual(list(self.client.consumers.iterate(window_size=3, stream=True)), consumers)
+
+        self.assertTrue(all(call[1]['stream'] for call in get.call_args_list))
+        self.assertTrue(all(response.closed for response in responses))
+        self.assertEqual(self.client.single_flight.stats()['calls'], 0)
+
+    def test_stream_requires_complete_pages(self):
+        with self.assertRaises(AssertionError):
+            list(self.client.consumers.iterate(stream=True, prefetch=2))
+
+
+class ClientCoalescingTestCase(TestCase):
+    def setUp(self):
+        self.client = KongAdminClient(API_URL, coalesce_reads=True)
+        self.consumer = {'id': str(uuid.uuid4()), 'username': 'john', 'created_at': 1}
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_concurrent_retrieves_share_one_request(self):
+        started = threading.Event()
+        proceed = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            started.set()
+            proceed.wait(5)
+            return FakeResponse(200, self.consumer)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.client.consumers.retrieve('john')))
+                   for _ in range(8)]
+
+        with mock.patch.object(self.client.session, 'get', side_effect=slow_get) as get:
+            threads[0].start()
+            started.wait(5)
+            for thread in threads[1:]:
+                thread.start()
+            while self.client.single_flight.shared < 7:
+                time.sleep(0.001)
+            proceed.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(results, [self.consumer] * 8)
+
+        # Every caller gets its own copy of the parsed result
+        results[0]['username'] = 'jane'
+        self.assertEqual(results[1]['username'], 'john')
+
+    def test_sub_clients_share_single_flight(self):
+        self.assertIs(self.client.apis.single_flight, self.client.single_flight)
+        self.assertIs(self.client.consumers.key_auth('some-consumer').single_flight, self.client.single_flight)
+        self.assertIs(self.client.apis.plugins('some-api').single_flight, self.client.single_flight)
+
+    def test_writes_are_not_coalesced(self):
+        with mock.patch.object(self.client.session, 'delete', return_value=FakeResponse(204)) as delete:
+            self.client.consumers.delete('john')
+            self.client.consumers.delete('john')
+
+        self.assertEqual(delete.call_count, 2)
+        self.assertEqual(self.client.single_flight.stats(), {'calls': 0, 'shared': 0})
+
+    def test_coalescing_is_opt_in(self):
+        client = KongAdminClient(API_URL)
+        self.assertIsNone(client.single_flight)
+        self.assertIsNone(client.consumers.single_flight)
+        client.close()
+
+
+class RetryPolicyTestCase(TestCase):
+    def setUp(self):
+        self.delays = []
+        self.policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=3.0, sleep=self.delays.append)
+
+    def call(self, method, *responses):
+        responses = list(responses)
+        return self.policy.call(method, lambda: responses.pop(0))
+
+    def test_backoff_uses_full_jitter(self):
+        for attempt, upper_bound in [(1, 1.0), (2, 2.0), (3, 3.0), (10, 3.0)]:
+            for _ in range(100):
+                self.assertTrue(0 <= self.policy.get_backoff(attempt) <= upper_bound)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('5'), 5.0)
+        self.assertEqual(parse_retry_after('-5'), 0.0)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:10 GMT', clock=lambda: 1445412480), 10.0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_retries_idempotent_requests(self):
+        failure, success = FakeResponse(500), FakeResponse(200)
+
+        self.assertIs(self.call('GET', failure, success), success)
+        self.assertTrue(failure.closed)
+        self.assertEqual(len(self.delays), 1)
+
+    def test_gives_up_after_max_attempts(self):
+        response = self.call('DELETE', FakeResponse(502), FakeResponse(502), FakeResponse(502))
+
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(self.policy.stats()['exhausted'], 1)
+        self.assertEqual(self.policy.stats()['retries'], 2)
+
+    def test_retries_non_idempotent_requests_only_when_rejected(self):
+        self.assertEqual(self.call('POST', FakeResponse(500), FakeResponse(201)).status_code, 500)
+        self.assertEqual(self.call('POST', FakeResponse(503), FakeResponse(201)).status_code, 201)
+        self.assertEqual(self.call('PATCH', FakeResponse(429), FakeResponse(200)).status_code, 200)
+
+    def test_respects_retry_after(self):
+        self.call('GET', FakeResponse(429, headers={'Retry-After': '2.5'}), FakeResponse(200))
+        self.assertEqual(self.delays, [2.5])
+
+        response = self.call('GET', FakeResponse(503, headers={'Retry-After': '3600'}), FakeResponse(200))
+        self.assertEqual(response.status_code, 503)
+
+    def test_retries_connection_errors(self):
+        def send():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise requests.exceptions.ConnectTimeout()
+            return FakeResponse(200)
+
+        attempts = []
+        self.assertEqual(self.policy.call('POST', send).status_code, 200)
+
+        attempts = []
+        self.assertEqual(self.policy.call('GET', send).status_code, 200)
+
+        def send_then_fail():
+            raise requests.exceptions.ReadTimeout()
+
+        self.assertRaises(requests.exceptions.ReadTimeout, self.policy.call, 'POST', send_then_fail)
+        self.assertEqual(self.policy.stats()['retries_by_reason'], {'ConnectTimeout': 2})
+
+    def test_budget_limits_retries(self):
+        clock = FakeClock()
+        self.policy.budget = RetryBudget(ratio=0.5, min_retries_per_second=0, capacity=1, clock=clock)
+
+        self.assertEqual(self.call('GET', FakeResponse(500), FakeResponse(200)).status_code, 200)
+        self.assertEqual(self.call('GET', FakeResponse(500), FakeResponse(200)).status_code, 500)
+        self.assertEqual(self.call('GET', FakeResponse(500), FakeResponse(200)).status_code, 200)
+        self.assertEqual(self.policy.stats()['budget_exhausted'], 1)
+
+
+class ClientRetryTestCase(TestCase):
+    def setUp(self):
+        self.client = KongAdminClient(API_URL, retry_policy=RetryPolicy(sleep=lambda delay: None))
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_retries_unavailable_responses(self):
+        consumer = {'id': str(uuid.uuid4()), 'username': 'john'}
+        responses = [FakeResponse(503), FakeResponse(200, consumer)]
+
+        with mock.patch.object(self.client.session, 'get', side_effect=responses) as get:
+            self.assertEqual(self.client.consumers.retrieve('john'), consumer)
+
+        self.assertEqual(get.call_count, 2)
+        self.assertIs(self.client.consumers.retry_policy, self.client.retry_policy)
+        self.assertEqual(self.client.retry_policy.stats()['retries_by_reason'], {'status:503': 1})
+
+    def test_does_not_retry_failed_creates(self):
+        with mock.patch.object(self.client.session, 'post', return_value=FakeResponse(500)) as post:
+            self.assertRaises(ServerError, self.client.consumers.create, username='john')
+
+        self.assertEqual(post.call_count, 1)
+
+
+class CircuitBreakerTestCase(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_rate_threshold=0.5, slow_call_rate_threshold=0.5, slow_call_duration=2.0,
+                                      window_size=4, minimum_calls=4, open_duration=10.0, half_open_calls=2,
+                                      clock=self.clock)
+
+    def record(self, *outcomes, **kwargs):
+        for failed in outcomes:
+            self.breaker.acquire()
+            self.breaker.release(kwargs.get('duration', 0.1), failed)
+
+    def test_opens_on_failure_rate(self):
+        self.record(True, True, True)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+        self.record(False)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertRaises(CircuitOpenError, self.breaker.acquire)
+        self.assertEqual(self.breaker.stats()['rejected'], 1)
+
+    def test_window_slides(self):
+        self.record(True, False, False, False, True, False, False, False, True)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.stats()['failure_rate'], 0.25)
+
+    def test_opens_on_slow_calls(self):
+        self.record(False, False, duration=1.0)
+        self.record(False, False, duration=2.0)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_half_open_closes_after_successful_trials(self):
+        self.record(True, True, True, True)
+        self.clock.now = 10.0
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+        self.breaker.acquire()
+        self.breaker.acquire()
+        self.assertRaises(CircuitOpenError, self.breaker.acquire)
+
+        self.breaker.release(0.1, False)
+        self.breaker.release(0.1, False)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_reopens_after_failed_trials(self):
+        self.record(True, True, True, True)
+        self.clock.now = 10.0
+        self.record(False, True)
+
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertEqual(self.breaker.stats()['times_opened'], 2)
+        self.clock.now = 19.0
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_late_calls_are_ignored_while_open(self):
+        self.breaker.acquire()
+        self.record(True, True, True, True)
+        self.breaker.release(0.1, False)
+
+        self.assertEqual(self.breaker.state, OPEN)
+
+
+class ClientCircuitBreakerTestCase(TestCase):
+    def setUp(self):
+        self.circuit_breaker = NodeCircuitBreaker(window_size=4, minimum_calls=4)
+        self.client = KongAdminClient(API_URL, retry_policy=RetryPolicy(max_attempts=1),
+                                      circuit_breaker=self.circuit_breaker)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_fails_fast_while_open(self):
+        with mock.patch.object(self.client.session, 'get', return_value=FakeResponse(500)) as get:
+            for _ in range(4):
+                self.assertRaises(ServerError, self.client.consumers.retrieve, 'john')
+            self.assertRaises(CircuitOpenError, self.client.apis.retrieve, 'mockbin')
+
+        self.assertEqual(get.call_count, 4)
+        self.assertEqual(self.circuit_breaker.get_breaker(API_URL).state, OPEN)
+
+    def test_circuits_are_per_node(self):
+        for _ in range(4):
+            self.assertRaises(requests.exceptions.ConnectionError, self.circuit_breaker.call, 'http://other-node:8001/',
+                              mock.Mock(side_effect=requests.exceptions.ConnectionError()))
+
+        self.assertEqual(self.circuit_breaker.stats()['other-node:8001']['state'], OPEN)
+        consumer = {'id': str(uuid.uuid4()), 'username': 'john'}
+        with mock.patch.object(self.client.session, 'get', return_value=FakeResponse(200, consumer)):
+            self.assertEqual(self.client.consumers.retrieve('john'), consumer)
+
+
+class LoadBalancerTestCase(TestCase):
+    URLS = ['http://node-1:8001', 'http://node-2:8001/', 'http://node-3:8001/admin/']
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.balancer = LoadBalancer(self.URLS, max_failures=2, ejection_duration=10.0, clock=self.clock)
+        self.node_1, self.node_2, self.node_3 = self.balancer.nodes
+
+    def test_reads_go_to_least_outstanding_node(self):
+        first, second, third = [self.balancer.choose('GET') for _ in range(3)]
+        self.assertEqual(set([first, second, third]), set(self.balancer.nodes))
+
+        self.balancer.release(second, failed=False)
+        self.assertIs(self.balancer.choose('GET'), second)
+
+    def test_round_robin(self):
+        balancer = LoadBalancer(self.URLS, strategy=ROUND_ROBIN)
+        chosen = [balancer.choose('GET').url for _ in range(6)]
+        self.assertEqual(chosen, self.URLS * 2)
+
+    def test_writes_go_to_preferred_node(self):
+        for method in ('POST', 'PUT', 'PATCH', 'DELETE'):
+            self.assertIs(self.balancer.choose(method), self.node_1)
+
+        self.node_1.healthy = False
+        self.assertIsNot(self.balancer.choose('POST'), self.node_1)
+
+    def test_ejects_failing_nodes(self):
+        self.balancer.release(self.balancer.choose('POST'), failed=True)
+        self.balancer.release(self.balancer.choose('POST'), failed=True)
+
+        self.assertEqual(self.node_1.ejections, 1)
+        self.assertNotIn(self.node_1, [self.balancer.choose('GET') for _ in range(10)])
+        self.assertIsNot(self.balancer.choose('POST'), self.node_1)
+
+        self.clock.now = 10.0
+        self.assertIs(self.balancer.choose('POST'), self.node_1)
+
+    def test_successes_reset_failures(self):
+        for failed in (True, False, True, False):
+            self.balancer.release(self.balancer.choose('POST'), failed=failed)
+        self.assertEqual(self.node_1.ejections, 0)
+
+    def test_uses_all_nodes_when_none_is_available(self):
+        for node in self.balancer.nodes:
+            node.healthy = False
+        self.assertIs(self.balancer.choose('POST'), self.node_1)
+        self.assertEqual(set(self.balancer.choose('GET') for _ in range(3)), set([self.node_2, self.node_3]))
+
+    def test_rewrite(self):
+        url = 'http://node-1:8001/consumers/john/?size=10'
+        self.assertEqual(self.balancer.rewrite(url, self.node_1), url)
+        self.assertEqual(self.balancer.rewrite(url, self.node_2), 'http://node-2:8001/consumers/john/?size=10')
+        self.assertEqual(self.balancer.rewrite(url, self.node_3), 'http://node-3:8001/admin/consumers/john/?size=10')
+        self.assertEqual(self.balancer.rewrite('http://elsewhere/', self.node_2), 'http://elsewhere/')
+
+    def test_check_health(self):
+        def probe(url):
+            if url == self.URLS[2]:
+                raise requests.exceptions.ConnectionError()
+            return url == self.URLS[0]
+
+        self.balancer.check_health(probe)
+        self.assertEqual([node.healthy for node in self.balancer.nodes], [True, False, False])
+        self.assertEqual(set(self.balancer.choose('GET') for _ in range(3)), set([self.node_1]))
+
+    def test_health_checks_run_in_background(self):
+        probed = threading.Event()
+
+        def probe(url):
+            probed.set()
+            return False
+
+        self.balancer.start_health_checks(probe, interval=60)
+        self.assertTrue(probed.wait(5))
+        self.balancer.stop_health_checks()
+        self.assertFalse(any(node.healthy for node in self.balancer.nodes))
+
+
+class ClientLoadBalancingTestCase(TestCase):
+    URLS = ['http://node-1:8001', 'http://node-2:8001']
+
+    def setUp(self):
+        self.client = KongAdminClient(self.URLS, load_balancing=ROUND_ROBIN, retry_policy=RetryPolicy(max_attempts=1))
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_spreads_reads_and_pins_writes(self):
+        consumer = {'id': str(uuid.uuid4()), 'username': 'john'}
+
+        with mock.patch.object(self.client.session, 'get', return_value=FakeResponse(200, consumer)) as get:
+            for _ in range(4):
+                self.client.consumers.retrieve('john')
+        with mock.patch.object(self.client.session, 'post', return_value=FakeResponse(201, consumer)) as post:
+            for _ in range(2):
+                self.client.consumers.create(username='john')
+
+        self.assertEqual([call[0][0] for call in get.call_args_list], [
+            'http://node-1:8001/consumers/john/', 'http://node-2:8001/consumers/john/'] * 2)
+        self.assertEqual([call[0][0] for call in post.call_args_list], ['http://node-1:8001/consumers/'] * 2)
+        self.assertEqual(self.client.balancer.stats()['http://node-2:8001']['requests'], 2)
+
+    def test_retries_go_to_another_node(self):
+        self.client.retry_policy = RetryPolicy(sleep=lambda delay: None)
+        self.client.consumers.retry_policy = self.client.retry_policy
+        consumer = {'id': str(uuid.uuid4()), 'username': 'john'}
+
+        with mock.patch.object(self.client.session, 'get', side_effect=[
+                requests.exceptions.ConnectionError(), FakeResponse(200, consumer)]) as get:
+            self.assertEqual(self.client.consumers.retrieve('john'), consumer)
+
+        self.assertNotEqual(get.call_args_list[0][0][0], get.call_args_list[1][0][0])
+        self.assertEqual(self.client.balancer.stats()['http://node-1:8001']['failures'], 1)
+
+    def test_probe_node(self):
+        with mock.patch.object(self.client.session, 'get', return_value=FakeResponse(200, {})) as get:
+            self.assertTrue(self.client.probe_node('http://node-2:8001/admin/'))
+        self.assertEqual(get.call_args[0][0], 'http://node-2:8001/admin/status')
+
+    def test_probe_node_with_path_prefix(self):
+        with mock.patch.object(self.client.session, 'get', return_value=FakeResponse(200, {})) as get:
+            self.assertTrue(self.client.probe_node('http://node-2:8001/admin'))
+            self.assertTrue(self.client.probe_node('http://node-2:8001'))
+        self.assertEqual([call[0][0] for call in get.call_args_list],
+                         ['http://node-2:8001/admin/status', 'http://node-2:8001/status'])
+
+
+class HedgingTestCase(TestCase):
+    def setUp(self):
+        self.policy = HedgingPolicy(max_delay=0.05)
+        self.release = threading.Event()
+        self.responses = []
+
+    def tearDown(self):
+        self.release.set()
+
+    def send(self, slow_attempts):
+        lock = threading.Lock()
+
+        def _send():
+            with lock:
+                attempt = len(self.responses)
+                response = FakeResponse(200, {'attempt': attempt})
+                self.responses.append(response)
+            if attempt in slow_attempts:
+                self.release.wait(5)
+            return response
+        return _send
+
+    def test_latency_percentiles(self):
+        tracker = LatencyTracker(window_size=100)
+        self.assertIsNone(tracker.percentile(50))
+
+        for latency in range(200):
+            tracker.record(latency)
+        self.assertEqual(len(tracker), 100)
+        self.assertEqual(tracker.percentile(50), 150)
+        self.assertEqual(tracker.percentile(99), 199)
+
+    def test_delay_follows_percentile(self):
+        policy = HedgingPolicy(percentile=90, min_delay=0.01, max_delay=1.0, min_samples=10)
+        self.assertEqual(policy.get_delay(), 1.0)
+
+        for latency in [0.1] * 9 + [0.5] * 7:
+            policy.latencies.record(latency)
+        self.assertEqual(policy.get_delay(), 0.5)
+
+    def test_fast_requests_are_not_hedged(self):
+        response = self.policy.call(self.send(slow_attempts=()))
+
+        self.assertEqual(response.json(), {'attempt': 0})
+        self.assertEqual(len(self.responses), 1)
+        self.assertEqual(self.policy.stats()['hedges'], 0)
+
+    def test_slow_requests_are_hedged(self):
+        response = self.policy.call(self.send(slow_attempts=(0,)))
+
+        self.assertEqual(response.json(), {'attempt': 1})
+        self.assertEqual(self.policy.stats()['hedge_wins'], 1)
+
+        # The losing request is closed once it completes
+        self.release.set()
+        for _ in range(100):
+            if self.responses[0].closed:
+                break
+            time.sleep(0.01)
+        self.assertTrue(self.responses[0].closed)
+        self.assertFalse(response.closed)
+
+    def test_falls_back_when_first_response_fails(self):
+        attempts = []
+
+        def send():
+            attempts.append(1)
+            if len(attempts) == 1:
+                time.sleep(0.1)
+                raise requests.exceptions.ConnectionError()
+            time.sleep(0.2)
+            return FakeResponse(200, {})
+
+        self.assertEqual(self.policy.call(send).status_code, 200)
+
+    def test_falls_back_when_first_response_is_retryable(self):
+        responses = [FakeResponse(503, {}), FakeResponse(200, {})]
+        attempts = iter(responses)
+        lock = threading.Lock()
+
+        def send():
+            with lock:
+                response = next(attempts)
+            time.sleep(0.1 if response.status_code == 503 else 0.2)
+            return response
+
+        self.assertEqual(self.policy.call(send).status_code, 200)
+        self.assertTrue(responses[0].closed)
+
+    def test_attempts_reuse_threads(self):
+        threads = []
+
+        def send():
+            threads.append(threading.current_thread())
+            return FakeResponse(200, {})
+
+        for _ in range(3):
+            self.policy.call(send)
+            time.sleep(0.01)  # Let the thread become idle
+        self.assertEqual(len(set(threads)), 1)
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_errors_are_raised(self):
+        self.assertRaises(requests.exceptions.ConnectionError, self.policy.call,
+                          mock.Mock(side_effect=requests.exceptions.ConnectionError()))
+
+    def test_budget_limits_hedges(self):
+        self.policy.budget = RetryBudget(ratio=0, min_retries_per_second=0, capacity=1)
+        self.policy.budget.withdraw()
+
+        threading.Timer(0.2, self.release.set).start()
+        self.assertEqual(self.policy.call(self.send(slow_attempts=(0,))).json(), {'attempt': 0})
+        self.assertEqual(self.policy.stats()['budget_exhausted'], 1)
+
+
+class ClientHedgingTestCase(TestCase):
+    def test_hedges_go_to_another_node(self):
+        client = KongAdminClient(['http://node-1:8001', 'http://node-2:8001'], hedging=HedgingPolicy(max_delay=0.05))
+        consumer = {'id': str(uuid.uuid4()), 'username': 'john'}
+        release = threading.Event()
+
+        def get(url, **kwargs):
+            if url.startswith('http://node-1:8001'):
+                release.wait(5)
+            return FakeResponse(200, dict(consumer, url=url))
+
+        try:
+            with mock.patch.object(client.session, 'get', side_effect=get), \
+                    mock.patch.object(client.session, 'post', return_value=FakeResponse(201, consumer)) as post:
+                self.assertEqual(client.consumers.retrieve('john')['url'], 'http://node-2:8001/consumers/john/')
+                client.consumers.create(username='john')
+        finally:
+            release.set()
+            client.close()
+
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(client.hedging.stats()['hedges'], 1)
+
+
+class MetricsTestCase(TestCase):
+    def test_describe_request(self):
+        self.assertEqual(describe_request('GET', API_URL + '/consumers/?size=10'), ('consumers', 'list'))
+        self.assertEqual(describe_request('GET', API_URL + '/consumers/john/'), ('consumers', 'retrieve'))
+        self.assertEqual(describe_request('POST', API_URL + '/consumers/john/key-auth/'), ('key-auth', 'create'))
+        self.assertEqual(describe_request('PATCH', API_URL + '/apis/mockbin/plugins/abc/'), ('plugins', 'update'))
+        self.assertEqual(describe_request('PUT', API_URL + '/apis/'), ('apis', 'create_or_update'))
+        self.assertEqual(describe_request('GET', API_URL + '/status/'), ('unknown', 'get'))
+
+    def test_histogram(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.cumulative_counts(), [(0.1, 2), (1.0, 3), (float('inf'), 4)])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 2.65)
+
+    def test_export_prometheus(self):
+        collector = MetricsCollector(buckets=(0.1, 1.0))
+        collector(RequestMetrics('consumers', 'create', 'POST', API_URL, status_code=201, latency=0.05,
+                                 request_bytes=20, response_bytes=100, retries=1, connection_reused=True))
+        collector(RequestMetrics('consumers', 'create', 'POST', API_URL, error='ConnectTimeout', latency=2.0))
+
+        lines = export_prometheus(collector).splitlines()
+        for line in [
+            '# TYPE kong_client_requests_total counter',
+            'kong_client_requests_total{operation="create",resource="consumers",status="201"} 1',
+            'kong_client_requests_total{operation="create",resource="consumers",status="ConnectTimeout"} 1',
+            '# TYPE kong_client_request_duration_seconds histogram',
+            'kong_client_request_duration_seconds_bucket{le="0.1",operation="create",resource="consumers"} 1',
+            'kong_client_request_duration_seconds_bucket{le="+Inf",operation="create",resource="consumers"} 2',
+            'kong_client_request_duration_seconds_sum{operation="create",resource="consumers"} 2.05',
+            'kong_client_request_duration_seconds_count{operation="create",resource="consumers"} 2',
+            'kong_client_request_bytes_total{operation="create",resource="consumers"} 20',
+            'kong_client_response_bytes_total{operation="create",resource="consumers"} 100',
+            'kong_client_retries_total{operation="create",resource="consumers"} 1',
+            'kong_client_connections_total{reused="true"} 1',
+        ]:
+            self.assertIn(line, lines)
+
+        collector.reset()
+        self.assertNotIn('kong_client_requests_total{', export_prometheus(collector))
+
+
+class ClientMetricsTestCase(TestCase):
+    def setUp(self):
+        self.reported = []
+        self.client = KongAdminClient(API_URL, request_hooks=[self.reported.append],
+                                      retry_policy=RetryPolicy(sleep=lambda delay: None))
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_reports_every_request(self):
+        consumer = {'id': str(uuid.uuid4()), 'username': 'john'}
+        with mock.patch.object(self.client.session, 'get', side_effect=[
+                FakeResponse(503), FakeResponse(200, consumer), FakeResponse(200, {'data': [consumer], 'total': 1})]):
+            self.client.consumers.retrieve('john')
+            self.client.consumers.count()
+        with mock.patch.object(self.client.session, 'post', side_effect=requests.exceptions.ReadTimeout()):
+            self.assertRaises(requests.exceptions.ReadTimeout, self.client.consumers.create, username='john')
+
+        retrieve, count, create = self.reported
+        self.assertEqual((retrieve.resource, retrieve.operation, retrieve.status_code, retrieve.retries),
+                         ('consumers', 'retrieve', 200, 1))
+        self.assertEqual(retrieve.response_bytes, len(json.dumps(consumer)))
+        self.assertEqual((count.operation, count.retries), ('count', 0))
+        self.assertEqual((create.operation, create.status_code, create.error), ('create', None, 'ReadTimeout'))
+
+    def test_measures_real_requests(self):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers['Content-Length']))
+                body = json.dumps({'id': str(uuid.uuid4()), 'username': 'john'}).encode('utf-8')
+                self.send_response(201)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        client = KongAdminClient('http://127.0.0.1:%d' % server.server_port, request_hooks=[self.reported.append],
+                                 timeout=5)
+        try:
+            client.consumers.create(username='john')
+            client.consumers.create(username='john')
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual([metrics.connection_reused for metrics in self.reported], [False, True])
+        self.assertEqual(self.reported[0].request_bytes, len('username=john'))
+        self.assertTrue(self.reported[0].response_bytes > 0)
+        self.assertTrue(self.reported[0].latency > 0)
+
+
+class TracerTestCase(TestCase):
+    def setUp(self):
+        self.started, self.finished = [], []
+        self.tracer = Tracer(on_start=self.started.append, on_finish=self.finished.append)
+
+    def test_spans_nest(self):
+        with self.tracer.span('outer', step=1) as outer:
+            self.assertIs(self.tracer.current_span(), outer)
+            with self.tracer.span('inner') as inner:
+                pass
+        self.assertIsNone(self.tracer.current_span())
+
+        self.assertEqual(self.started, [outer, inner])
+        self.assertEqual(self.finished, [inner, outer])
+        self.assertEqual(inner.trace_id, outer.trace_id)
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertIsNone(outer.parent_id)
+        self.assertEqual(outer.attributes, {'step': 1})
+        self.assertTrue(outer.duration >= inner.duration >= 0)
+
+    def test_errors_are_recorded(self):
+        def fail():
+            with self.tracer.span('failing'):
+                raise ValueError('boom')
+
+        self.assertRaises(ValueError, fail)
+        self.assertIsInstance(self.finished[0].error, ValueError)
+        self.assertIsNone(self.tracer.current_span())
+
+    def test_spans_are_thread_local(self):
+        with self.tracer.span('main') as main:
+            thread = threading.Thread(target=lambda: self.started.append(self.tracer.current_span()))
+            thread.start()
+            thread.join()
+
+            explicit = self.tracer.start_span('explicit', parent=main)
+        self.assertEqual(self.started[1:], [None, explicit])
+        self.assertEqual(explicit.parent_id, main.span_id)
+
+    def test_traceparent(self):
+        span = self.tracer.start_span('span')
+        self.assertTrue(re.match('^00-[0-9a-f]{32}-[0-9a-f]{16}-01$', span.traceparent))
+
+
+class ClientTracingTestCase(TestCase):
+    def setUp(self):
+        self.spans = []
+        self.tracer = Tracer(on_finish=self.spans.append, propagate=True)
+        self.client = KongAdminClient(API_URL, tracer=self.tracer, retry_policy=RetryPolicy(sleep=lambda delay: None))
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_workflow_spans(self):
+        consumer = {'id': str(uuid.uuid4()), 'username': 'john'}
+        key_auth = {'id': str(uuid.uuid4()), 'key': 'secret'}
+
+        with mock.patch.object(self.client.session, 'post', side_effect=[
+                FakeResponse(201, consumer), FakeResponse(503), FakeResponse(201, key_auth)]) as post:
+            with self.tracer.span('onboard') as workflow:
+                created = self.client.consumers.create(username='john')
+                self.client.consumers.key_auth(created['id']).create()
+
+        spans = dict((span.span_id, span) for span in self.spans)
+
+        def path(span):
+            names = []
+            while span is not None:
+                names.insert(0, span.name)
+                span = spans.get(span.parent_id)
+            return '/'.join(names)
+
+        self.assertEqual([path(span) for span in self.spans], [
+            'onboard/ConsumerAdminClient.create/kong.request/kong.attempt',
+            'onboard/ConsumerAdminClient.create/kong.request',
+            'onboard/ConsumerAdminClient.create/kong.decode',
+            'onboard/ConsumerAdminClient.create',
+            'onboard/KeyAuthAdminClient.create/kong.request/kong.attempt',
+            'onboard/KeyAuthAdminClient.create/kong.request/kong.attempt',
+            'onboard/KeyAuthAdminClient.create/kong.request',
+            'onboard/KeyAuthAdminClient.create/kong.decode',
+            'onboard/KeyAuthAdminClient.create',
+            'onboard',
+        ])
+        self.assertEqual(set(span.trace_id for span in self.spans), set([workflow.trace_id]))
+
+        attempts = [span for span in self.spans if span.name == 'kong.attempt']
+        self.assertEqual([span.attributes['status_code'] for span in attempts], [201, 503, 201])
+        self.assertEqual([span.attributes['attempt'] for span in attempts], [1, 1, 2])
+        self.assertEqual(self.spans[6].attributes['retries'], 1)
+
+        sent = [call[1]['headers']['traceparent'] for call in post.call_args_list]
+        self.assertEqual(sent, [span.traceparent for span in attempts])
+
+    def test_hedged_attempts_keep_their_parent(self):
+        self.client.hedging = self.client.consumers.hedging = HedgingPolicy(max_delay=0.05)
+        consumer = {'id': str(uuid.uuid4()), 'username': 'john'}
+        calls = []
+
+        def get(url, **kwargs):
+            calls.append(url)
+            if len(calls) == 1:
+                time.sleep(0.2)
+            return FakeResponse(200, consumer)
+
+        with mock.patch.object(self.client.session, 'get', side_effect=get):
+            self.client.consumers.retrieve('john')
+            time.sleep(0.3)
+
+        request = [span for span in self.spans if span.name == 'kong.request'][0]
+        attempts = [span for span in self.spans if span.name == 'kong.attempt']
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(set(span.parent_id for span in attempts), set([request.span_id]))
+
+
+class ProfilerTestCase(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.profiler = Profiler(clock=self.clock)
+
+    def test_dispatch_is_the_time_outside_phases(self):
+        with self.profiler.call('outer'):
+            self.clock.now += 1
+            with self.profiler.phase(TRANSPORT):
+                self.clock.now += 4
+            with self.profiler.call('inner'):
+                self.clock.now += 2
+                with self.profiler.phase(DECODE):
+                    self.clock.now += 3
+
+        stats = self.profiler.stats()
+        self.assertEqual(stats['calls']['outer'], {'calls': 1, 'total': 10.0, 'mean': 10.0})
+        self.assertEqual(stats['calls']['inner']['total'], 5.0)
+        self.assertEqual(stats['phases'][TRANSPORT]['total'], 4.0)
+        self.assertEqual(stats['phases'][DECODE]['total'], 3.0)
+        self.assertEqual(stats['phases'][DISPATCH], {'calls': 2, 'total': 3.0, 'mean': 1.5})
+
+    def test_report_ranks_phases(self):
+        with self.profiler.call('ConsumerAdminClient.create'):
+            with self.profiler.phase(URL_BUILDING):
+                self.clock.now += 1
+            with self.profiler.phase(TRANSPORT):
+                self.clock.now += 3
+
+        lines = self.profiler.report().splitlines()
+        self.assertEqual([line.split()[0] for line in lines[1:4]], [TRANSPORT, URL_BUILDING, DISPATCH])
+        self.assertTrue(lines[1].endswith('75.0%'))
+        self.assertTrue(lines[-1].startswith('ConsumerAdminClient.create'))
+
+        self.profiler.reset()
+        self.assertEqual(self.profiler.stats(), {'phases': {}, 'calls': {}})
+
+    def test_cprofile(self):
+        profiler = Profiler(cprofile=True)
+        with profiler.call('sorting'):
+            sorted(range(1000), key=lambda x: -x)
+        self.assertEqual(profiler.profiled_calls, 1)
+        self.assertIn('cProfile of 1 calls', profiler.report())
+
+
+class ClientProfilingTestCase(TestCase):
+    def test_client_phases(self):
+        profiler = Profiler()
+        client = KongAdminClient(API_URL, profiler=profiler)
+        consumer = {'id': str(uuid.uuid4()), 'username': 'john'}
+        try:
+            with mock.patch.object(client.session, 'get', side_effect=[
+                    FakeResponse(200, consumer), FakeResponse(200, {'data': [], 'total': 0})]):
+                client.consumers.retrieve('john')
+                client.consumers.key_auth('john').count()
+        finally:
+            client.close()
+
+        stats = profiler.stats()
+        self.assertEqual(set(stats['phases']), set([URL_BUILDING, HEADERS, TRANSPORT, DECODE, DISPATCH]))
+        self.assertEqual(stats['phases'][TRANSPORT]['calls'], 2)
+        self.assertEqual(sorted(stats['calls']), ['ConsumerAdminClient.retrieve', 'KeyAuthAdminClient.count'])
+
+    def test_simulator(self):
+        profiler = Profiler()
+        kong = KongAdminSimulator(profiler=profiler)
+        consumer = kong.consumers.create(username='john', custom_id='1')
+        kong.consumers.key_auth(consumer['id']).create()
+        stats = profiler.stats()
+        kong.close()
+
+        self.assertEqual(list(stats['phases']), [DISPATCH])
+        self.assertEqual(sorted(stats['calls']), [
+            'ConsumerAdminSimulator.create', 'ConsumerAdminSimulator.key_auth', 'KeyAuthAdminSimulator.create'])
+
 
 class SimulatorAPITestCase(KongAdminTesting.APITestCase):
     def on_create_client(self):
@@ -1324,6 +3033,311 @@ class SimulatorConsumerTestCase(KongAdminTesting.ConsumerTestCase):
         return KongAdminSimulator()
 
 
+class SimulatorDataStoreTestCase(TestCase):
+    def setUp(self):
+        self.store = SimulatorDataStore('http://localhost:8001/consumers/', index_keys=('username', 'custom_id'))
+
+    def create(self, username, custom_id=None):
+        return self.store.create({'username': username, 'custom_id': custom_id},
+                                 check_conflict_keys=('username', 'custom_id'))
+
+    def test_conflicts(self):
+        self.create('john', 'j')
+        self.assertRaises(ConflictError, self.create, 'john')
+        self.assertRaises(ConflictError, self.create, 'jane', 'j')
+
+        # Missing values do not conflict
+        self.create('jane')
+        self.create('jack')
+        self.assertEqual(self.store.count(), 3)
+
+    def test_indexes_follow_updates_and_deletes(self):
+        consumer = self.create('john', 'j')
+
+        self.assertEqual(self.store.update('john', 'username', {'username': 'jane'})['id'], consumer['id'])
+        self.assertIsNone(self.store.retrieve('john', 'username'))
+        self.assertEqual(self.store.retrieve('jane', 'username')['id'], consumer['id'])
+        self.create('john')
+
+        self.store.delete('jane', 'username')
+        self.assertIsNone(self.store.retrieve('jane', 'username'))
+        self.assertIsNone(self.store.retrieve(consumer['id'], None))
+        self.create('jane', 'j')
+        self.assertEqual([item['username'] for item in self.store.list(10, None)['data']], ['john', 'jane'])
+
+    def test_pages_visit_only_their_entities(self):
+        visited = []
+
+        class VisitCountingDict(OrderedDict):
+            def __getitem__(self, key):
+                visited.append(key)
+                return super(VisitCountingDict, self).__getitem__(key)
+
+            def __iter__(self):
+                for key in super(VisitCountingDict, self).__iter__():
+                    visited.append(key)
+                    yield key
+
+            def keys(self):
+                return list(self)
+
+            def values(self):
+                return [self[key] for key in list(self)]
+
+        for i in range(1000):
+            self.create('user%d' % i, 'c%d' % i)
+        for i in range(0, 1000, 3):
+            self.store.delete('user%d' % i, 'username')
+        self.store._data = VisitCountingDict(self.store._data)
+
+        usernames, offset, pages = [], None, 0
+        while True:
+            del visited[:]
+            page = self.store.list(10, offset)
+            self.assertLessEqual(len(visited), 11)
+            usernames.extend(item['username'] for item in page['data'])
+            pages += 1
+            if 'next' not in page:
+                break
+            offset = parse_query_parameters(page['next'])['offset'][0]
+
+        self.assertEqual(usernames, ['user%d' % i for i in range(1000) if i % 3])
+        self.assertEqual(pages, 67)
+
+    def test_list_filters_from_the_offset(self):
+        consumers = [self.create('user%d' % i, 'even' if i % 2 == 0 else 'c%d' % i) for i in range(2)]
+        consumers += [self.create('user%d' % i) for i in range(2, 6)]
+
+        page = self.store.list(2, consumers[1]['id'], custom_id=None)
+        self.assertEqual([item['username'] for item in page['data']], ['user2', 'user3'])
+        self.assertIn(consumers[4]['id'], page['next'])
+        self.assertRaises(ValueError, self.store.list, 2, str(uuid.uuid4()))
+
+
+class SimulatorAPIPluginConfigurationTestCase(TestCase):
+    PLUGIN_NAMES = ('basic-authentication', 'rate-limiting', 'cors', 'request-size-limiting', 'response-transformer')
+
+    def setUp(self):
+        self.simulator = KongAdminSimulator()
+        api = self.simulator.apis.create(upstream_url=fake.url(), name=fake.api_name(), request_host=fake.domain_name())
+        self.plugins = self.simulator.apis.plugins(api['id'])
+
+        class SlowDict(OrderedDict):
+            # Gives other threads the chance to change the plugin configurations while they are being iterated
+            def values(self):
+                for value in list(OrderedDict.values(self)):
+                    time.sleep(0.0001)
+                    yield value
+
+        self.plugins._data = SlowDict()
+
+    def test_concurrent_bulk_operations(self):
+        errors = []
+        done = threading.Event()
+
+        def list_plugins():
+            while not done.is_set():
+                try:
+                    self.plugins.list()
+                except Exception as e:
+                    errors.append(e)
+
+        def update_plugins(ids):
+            updates.extend(self.plugins.update_many([(id, {'enabled': False}) for id in ids] * 20, max_workers=5))
+
+        listers = [threading.Thread(target=list_plugins) for _ in range(2)]
+        for thread in listers:
+            thread.start()
+
+        try:
+            for _ in range(20):
+                results = self.plugins.create_many([{'plugin_name': name} for name in self.PLUGIN_NAMES],
+                                                   max_workers=5)
+                self.assertTrue(all(result.succeeded for result in results))
+                ids = [result.result['id'] for result in results]
+
+                # Updates racing the deletes either succeed or find the plugin configuration gone
+                updates = []
+                updater = threading.Thread(target=update_plugins, args=(ids,))
+                updater.start()
+                results = self.plugins.delete_many(ids, max_workers=5)
+                updater.join()
+
+                self.assertTrue(all(result.succeeded for result in results))
+                self.assertEqual(self.plugins.count(), 0)
+                self.assertEqual(len(updates), 100)
+                for result in updates:
+                    if not result.succeeded:
+                        self.assertIsInstance(result.error, ValueError)
+        finally:
+            done.set()
+            for thread in listers:
+                thread.join()
+
+        self.assertEqual(errors, [])
+
+
+class AdminAPIDispatcherTestCase(TestCase):
+    def setUp(self):
+        self.dispatcher = AdminAPIDispatcher()
+
+    def test_status_codes(self):
+        self.assertEqual(self.dispatcher.dispatch('GET', 'http://kong:8001/status')[0], 200)
+        self.assertEqual(self.dispatcher.dispatch('GET', 'http://kong:8001/unknown/')[0], 404)
+        self.assertEqual(self.dispatcher.dispatch('GET', 'http://kong:8001/consumers/john')[0], 404)
+        self.assertEqual(self.dispatcher.dispatch('DELETE', 'http://kong:8001/consumers/')[0], 405)
+        self.assertEqual(self.dispatcher.dispatch('POST', 'http://kong:8001/consumers/', body=b'username=john')[0], 201)
+        status_code, payload = self.dispatcher.dispatch('POST', 'http://kong:8001/consumers/', body=b'username=john')
+        self.assertEqual(status_code, 409)
+        self.assertIn('username', payload['message'])
+        self.assertEqual(self.dispatcher.dispatch('DELETE', 'http://kong:8001/consumers/john'), (204, None))
+
+    def test_pagination_links_point_to_the_request_host(self):
+        for index in range(3):
+            body = json.dumps({'username': 'u%d' % index, 'custom_id': '%d' % index})
+            self.dispatcher.dispatch('POST', 'http://kong:8001/consumers/', body=body, content_type='application/json')
+
+        status_code, page = self.dispatcher.dispatch('GET', 'http://kong:9999/consumers/?size=2')
+        self.assertEqual(len(page['data']), 2)
+        self.assertEqual(page['total'], 3)
+        self.assertTrue(page['next'].startswith('http://kong:9999/consumers/?'))
+
+        status_code, page = self.dispatcher.dispatch('GET', page['next'])
+        self.assertEqual([consumer['username'] for consumer in page['data']], ['u2'])
+        self.assertNotIn('next', page)
+
+    def test_plugin_configuration_values_are_parsed(self):
+        self.dispatcher.dispatch('POST', 'http://kong:8001/apis/', body=b'name=api&request_host=a.com&upstream_url=x')
+        status_code, result = self.dispatcher.dispatch(
+            'POST', 'http://kong:8001/apis/api/plugins/', body=b'name=rate-limiting&config.second=20&enabled=False')
+        self.assertEqual(status_code, 201)
+        self.assertEqual((result['enabled'], result['config']), (False, {'second': 20}))
+
+
+class BenchmarkTestCase(TestCase):
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('create=1, retrieve=4,list'), [('create', 1.0), ('retrieve', 4.0), ('list', 1.0)])
+        self.assertRaises(ValueError, parse_mix, 'explode=1')
+        self.assertRaises(ValueError, parse_mix, 'create=0')
+
+    def test_parse_thresholds(self):
+        self.assertEqual(parse_thresholds(None), {})
+        self.assertEqual(parse_thresholds(['scan_consumers=0.5', ' store_create =1']),
+                         {'scan_consumers': 0.5, 'store_create': 1.0})
+        for value in ('scan_consumers', '=0.5', 'scan_consumers=', 'scan_consumers=fast', 'scan_consumers=-0.1'):
+            self.assertRaises(ValueError, parse_thresholds, [value])
+
+    def test_compare_results(self):
+        results = {'at_threshold': {'seconds': 1.25}, 'above_threshold': {'seconds': 1.2501},
+                   'improved': {'seconds': 0.5}, 'unknown': {'seconds': 1.0}}
+        baseline = {'at_threshold': {'seconds': 1.0}, 'above_threshold': {'seconds': 1.0},
+                    'improved': {'seconds': 1.0}, 'removed': {'seconds': 1.0}}
+
+        rows = dict((row[0], row) for row in compare_results(results, baseline, 0.25))
+        self.assertEqual(sorted(rows), ['above_threshold', 'at_threshold', 'improved', 'unknown'])
+        self.assertEqual(rows['at_threshold'], ('at_threshold', 1.0, 1.25, 1.25, OK))
+        self.assertEqual(rows['above_threshold'][4], REGRESSION)
+        self.assertEqual(rows['improved'], ('improved', 1.0, 0.5, 0.5, OK))
+        self.assertEqual(rows['unknown'], ('unknown', None, 1.0, None, NEW))
+
+    def test_compare_results_with_specific_thresholds(self):
+        results = {'scan': {'seconds': 1.4, 'size': 10}, 'seed': {'seconds': 1.4, 'size': 10}}
+        baseline = {'scan': {'seconds': 1.0, 'size': 10}, 'seed': {'seconds': 1.0, 'size': 10}}
+
+        rows = compare_results(results, baseline, 0.25, {'scan': 0.5})
+        self.assertEqual([(row[0], row[4]) for row in rows], [('scan', OK), ('seed', REGRESSION)])
+
+        rows = compare_results(results, baseline, 0.5, {'seed': 0.1})
+        self.assertEqual([(row[0], row[4]) for row in rows], [('scan', OK), ('seed', REGRESSION)])
+
+        baseline['scan']['size'] = 20
+        self.assertEqual(compare_results(results, baseline, 0.5)[0], ('scan', 1.0, 1.4, None, SIZE_DIFFERS))
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual([percentile(values, p) for p in (50, 95, 99, 100)], [50, 95, 99, 100])
+        self.assertIsNone(percentile([], 50))
+
+    def test_run(self):
+        client = KongAdminClient('http://kong-simulator:8001')
+        adapter = SimulatorHTTPAdapter()
+        client.session.mount('http://kong-simulator:8001', adapter)
+
+        benchmark = Benchmark(client, concurrency=3, duration=None, max_operations=300, seed_entities=3,
+                              random_seed=1)
+        benchmark.setup()
+        results = benchmark.run()
+        benchmark.cleanup()
+
+        self.assertEqual(results['operations'], 300)
+        self.assertEqual(results['errors'], 0)
+        self.assertEqual(sum(summary['operations'] for summary in results['by_operation'].values()), 300)
+        self.assertEqual(set(key.split('.')[0] for key in results['by_operation']),
+                         set(['apis', 'consumers', 'key-auth', 'basic-auth', 'oauth2', 'plugins']))
+        self.assertTrue(results['latency']['p50'] <= results['latency']['p99'] <= results['latency']['max'])
+        self.assertEqual((adapter.simulator.apis.count(), adapter.simulator.consumers.count()), (0, 0))
+
+    def test_main_json(self):
+        with mock.patch('sys.stdout', new_callable=six.StringIO) as stdout:
+            run_bench(['--stand-in', 'adapter', '--resources', 'consumers', '--operations', '20', '--json', '-'])
+        results = json.loads(stdout.getvalue())
+        self.assertEqual(results['operations'], 20)
+        self.assertEqual(results['concurrency'], 4)
+
+
+class ServerTestMixin(object):
+    """
+    Runs the client test cases end-to-end against a local ``SimulatorServer``.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.server = SimulatorServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def on_create_client(self):
+        return KongAdminClient(self.server.url)
+
+
+class ServerAPITestCase(ServerTestMixin, KongAdminTesting.APITestCase):
+    pass
+
+
+class ServerConsumerTestCase(ServerTestMixin, KongAdminTesting.ConsumerTestCase):
+    pass
+
+
+class AdapterTestMixin(object):
+    """
+    Runs the client test cases against a ``SimulatorHTTPAdapter``, without sockets.
+    """
+    def on_create_client(self):
+        client = KongAdminClient('http://kong-simulator:8001')
+        client.session.mount('http://kong-simulator:8001', SimulatorHTTPAdapter())
+        return client
+
+
+class AdapterAPITestCase(AdapterTestMixin, KongAdminTesting.APITestCase):
+    pass
+
+
+class AdapterConsumerTestCase(AdapterTestMixin, KongAdminTesting.ConsumerTestCase):
+    def test_stream_and_metrics(self):
+        collector = MetricsCollector()
+        self.client.consumers.request_hooks.append(collector)
+        for index in range(3):
+            self.client.consumers.create(username='user%d' % index, custom_id='%d' % index)
+
+        found = list(self.client.consumers.iterate(window_size=2, stream=True))
+
+        self.assertEqual([consumer['username'] for consumer in found], ['user0', 'user1', 'user2'])
+        self.assertEqual(collector.requests[('consumers', 'create', 201)], 3)
+        self.assertEqual(collector.requests[('consumers', 'list', 200)], 2)
+        self.assertEqual(collector.connections, {})
+
+
 # class SimulatorPluginTestCase(KongAdminTesting.PluginTestCase):
 #     def on_create_client(self):
 #         return KongAdminSimulator()
@@ -1341,6 +3355,232 @@ class ClientConsumerTestCase(KongAdminTesting.ConsumerTestCase):
         return KongAdminClient(API_URL)
 
 
+class AsyncKongAdminTesting(object):
+    """
+    Test cases of the asyncio client, run against a live Kong test server and against a ``SimulatorServer``.
+
+    Important: Do not remove nesting!
+    """
+    class AsyncTestCase(TestCase):
+        def setUp(self):
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self.client = self.on_create_client()
+            seed_faker()
+
+        def tearDown(self):
+            self.run_async(self.client.close())
+            self.loop.close()
+            asyncio.set_event_loop(None)
+
+        def on_create_client(self):
+            return AsyncKongAdminClient(API_URL)
+
+        def run_async(self, coroutine):
+            return self.loop.run_until_complete(coroutine)
+
+        def collect(self, async_generator):
+            result = []
+            while True:
+                try:
+                    result.append(self.run_async(async_generator.__anext__()))
+                except StopAsyncIteration:
+                    return result
+
+    class APITestCase(AsyncTestCase):
+        def setUp(self):
+            super(AsyncKongAdminTesting.APITestCase, self).setUp()
+            self.assertEqual(self.run_async(self.client.apis.count()), 0)
+
+        def tearDown(self):
+            for api in self.collect(self.client.apis.iterate()):
+                self.run_async(self.client.apis.delete(api['id']))
+            self.assertEqual(self.run_async(self.client.apis.count()), 0)
+            super(AsyncKongAdminTesting.APITestCase, self).tearDown()
+
+        def create_api(self, i=0):
+            name = '%s%s' % (fake.api_name(), i)
+            return self.run_async(self.client.apis.create(
+                upstream_url=fake.url(), name=name, request_host='%s.%s' % (name.lower(), fake.domain_name())))
+
+        def test_create_and_conflict(self):
+            result = self.create_api()
+
+            self.assertIsNotNone(result['id'])
+            with self.assertRaises(ConflictError):
+                self.run_async(self.client.apis.create(
+                    upstream_url=fake.url(), name=result['name'], request_host=result['request_host']))
+            self.assertEqual(self.run_async(self.client.apis.count()), 1)
+
+        def test_update_and_retrieve(self):
+            result = self.create_api()
+            upstream_url = 'http://%s/' % fake.domain_name()
+
+            self.run_async(self.client.apis.update(result['name'], upstream_url, preserve_host=True))
+            retrieved = self.run_async(self.client.apis.retrieve(result['id']))
+
+            self.assertEqual(retrieved['upstream_url'], upstream_url)
+            self.assertTrue(retrieved['preserve_host'])
+            with self.assertRaises(AssertionError):
+                self.run_async(self.client.apis.update(result['id'], upstream_url, unknown='field'))
+
+        def test_retrieve_unknown(self):
+            with self.assertRaises(ValueError):
+                self.run_async(self.client.apis.retrieve(fake.uuid4()))
+
+        def test_list_and_delete(self):
+            apis = [self.create_api(i) for i in range(3)]
+
+            page = self.run_async(self.client.apis.list(size=2))
+            self.assertEqual(len(page['data']), 2)
+            found = self.run_async(self.client.apis.list(name=apis[1]['name']))
+            self.assertEqual([api['id'] for api in found['data']], [apis[1]['id']])
+
+            self.run_async(self.client.apis.delete(apis[0]['name']))
+            self.assertEqual(self.run_async(self.client.apis.count()), 2)
+
+        def test_list_does_not_stream(self):
+            api = self.create_api()
+            plugins = self.client.apis.plugins(api['id'])
+
+            for collection, expected in ((self.client.apis, [api['id']]), (plugins, [])):
+                page = self.run_async(collection.list(stream=False))
+                self.assertEqual([item['id'] for item in page['data']], expected)
+                with self.assertRaises(ValueError):
+                    self.run_async(collection.list(stream=True))
+
+        def test_plugin_configurations(self):
+            api = self.create_api()
+            plugins = self.client.apis.plugins(api['id'])
+
+            result = self.run_async(plugins.create('rate-limiting', second=20))
+            self.assertEqual(result['config']['second'], 20)
+
+            self.run_async(plugins.update(result['id'], second=25))
+            self.assertEqual(self.run_async(plugins.retrieve(result['id']))['config']['second'], 25)
+            self.assertEqual(self.run_async(plugins.count()), 1)
+
+            self.run_async(plugins.delete(result['id']))
+            self.assertEqual(self.run_async(plugins.count()), 0)
+
+    class ConsumerTestCase(AsyncTestCase):
+        def setUp(self):
+            super(AsyncKongAdminTesting.ConsumerTestCase, self).setUp()
+            self.assertEqual(self.run_async(self.client.consumers.count()), 0)
+
+        def tearDown(self):
+            for consumer in self.collect(self.client.consumers.iterate()):
+                self.run_async(self.client.consumers.delete(consumer['id']))
+            self.assertEqual(self.run_async(self.client.consumers.count()), 0)
+            super(AsyncKongAdminTesting.ConsumerTestCase, self).tearDown()
+
+        def test_create_concurrently(self):
+            usernames = ['%s%s' % (fake.username(), i) for i in range(20)]
+
+            results = self.run_async(asyncio.gather(*[
+                self.client.consumers.create(username=username) for username in usernames]))
+
+            self.assertEqual(sorted(result['username'] for result in results), sorted(usernames))
+            self.assertEqual(self.run_async(self.client.consumers.count()), len(usernames))
+
+        def test_create_many(self):
+            items = [{'username': '%s%s' % (fake.username(), i)} for i in range(20)]
+
+            results = self.run_async(self.client.consumers.create_many(items + [items[0]], max_workers=5))
+
+            assert_one_conflict(self, results, (0, 20))
+            self.assertEqual(self.run_async(self.client.consumers.count()), 20)
+
+        def test_create_conflict(self):
+            username = fake.username()
+            self.run_async(self.client.consumers.create(username=username))
+
+            with self.assertRaises(ConflictError):
+                self.run_async(self.client.consumers.create(username=username))
+
+        def test_retrieve_and_update(self):
+            result = self.run_async(self.client.consumers.create(username=fake.username()))
+            new_username = fake.username() + '_updated'
+
+            self.run_async(self.client.consumers.update(result['id'], username=new_username))
+            retrieved = self.run_async(self.client.consumers.retrieve(result['id']))
+
+            self.assertEqual(retrieved['id'], result['id'])
+            self.assertEqual(retrieved['username'], new_username)
+
+        def test_iterate(self):
+            for i in range(15):
+                self.run_async(self.client.consumers.create(username='%s%s' % (fake.username(), i)))
+
+            found = self.collect(self.client.consumers.iterate(window_size=4))
+
+            self.assertEqual(len(found), 15)
+            self.assertEqual(len(set(consumer['id'] for consumer in found)), 15)
+
+        def test_list_does_not_stream(self):
+            consumer = self.run_async(self.client.consumers.create(username=fake.username()))
+            consumers = self.client.consumers
+            collections = ((consumers, [consumer['id']]), (consumers.key_auth(consumer['id']), []),
+                           (consumers.basic_auth(consumer['id']), []), (consumers.oauth2(consumer['id']), []))
+
+            for collection, expected in collections:
+                page = self.run_async(collection.list(stream=False))
+                self.assertEqual([item['id'] for item in page['data']], expected)
+                with self.assertRaises(ValueError):
+                    self.run_async(collection.list(stream=True))
+
+        def test_key_auth_create(self):
+            consumer = self.run_async(self.client.consumers.create(username=fake.username()))
+            key_auth = self.client.consumers.key_auth(consumer['id'])
+
+            result = self.run_async(key_auth.create())
+
+            self.assertIsNotNone(result['key'])
+            self.assertEqual(self.run_async(key_auth.count()), 1)
+
+        def test_basic_auth_and_oauth2(self):
+            consumer = self.run_async(self.client.consumers.create(username=fake.username()))
+            basic_auth = self.client.consumers.basic_auth(consumer['username'])
+            oauth2 = self.client.consumers.oauth2(consumer['id'])
+
+            credentials = self.run_async(basic_auth.create(username=fake.username(), password='secret'))
+            self.run_async(basic_auth.update(credentials['id'], password='other'))
+            application = self.run_async(oauth2.create(name=fake.oauth2_app_name(), redirect_uri=fake.url()))
+
+            self.assertEqual(self.run_async(basic_auth.retrieve(credentials['id']))['id'], credentials['id'])
+            self.assertEqual([app['id'] for app in self.collect(oauth2.iterate())], [application['id']])
+
+            self.run_async(oauth2.delete(application['id']))
+            self.assertEqual(self.run_async(oauth2.count()), 0)
+
+
+@skipIf(AsyncKongAdminClient is None, 'asyncio/aiohttp is not available')
+@skipIf(kong_testserver_is_up() is False, 'Kong testserver is down')
+class AsyncClientAPITestCase(AsyncKongAdminTesting.APITestCase):
+    pass
+
+
+@skipIf(AsyncKongAdminClient is None, 'asyncio/aiohttp is not available')
+@skipIf(kong_testserver_is_up() is False, 'Kong testserver is down')
+class AsyncClientConsumerTestCase(AsyncKongAdminTesting.ConsumerTestCase):
+    pass
+
+
+class AsyncServerTestMixin(ServerTestMixin):
+    def on_create_client(self):
+        return AsyncKongAdminClient(self.server.url)
+
+
+@skipIf(AsyncKongAdminClient is None, 'asyncio/aiohttp is not available')
+class AsyncServerAPITestCase(AsyncServerTestMixin, AsyncKongAdminTesting.APITestCase):
+    pass
+
+
+@skipIf(AsyncKongAdminClient is None, 'asyncio/aiohttp is not available')
+class AsyncServerConsumerTestCase(AsyncServerTestMixin, AsyncKongAdminTesting.ConsumerTestCase):
+    pass
+
+
 # @skipIf(kong_testserver_is_up() is False, 'Kong testserver is down')
 # class ClientPluginTestCase(KongAdminTesting.PluginTestCase):
 #     def on_create_client(self):